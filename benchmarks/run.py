@@ -0,0 +1,224 @@
+"""
+다운로드, 추출, 렌더링 벤치마크
+
+합성 PDF를 로컬 HTTP 서버로 서비스하고 PDFDownloader.download, extract_text, save_as_text,
+extract_report_data, ReportGenerator.generate를 각각, 그리고 전체 흐름으로 측정한다.
+결과는 JSON으로 저장하고 기준 결과와 비교해 임계값 이상 느려진 항목이 있으면 종료 코드 1을 반환한다.
+
+사용법 (프로젝트 루트에서):
+    python -m benchmarks.run --output baseline.json
+    python -m benchmarks.run --baseline baseline.json --threshold 0.2
+"""
+import io
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import statistics
+import tempfile
+from contextlib import redirect_stdout
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import pdfplumber
+
+from src import metrics
+from src.pdf_downloader import PDFDownloader
+from src.report_generator import ReportGenerator
+from src.report_parser import extract_report_data
+
+from .server import serve_directory
+from .synthetic_pdf import write_pdf
+
+# 케이스별 합성 PDF 설정
+CASES = {
+    'small': {'pages': 4, 'tables_per_page': 1},
+    'medium': {'pages': 24, 'tables_per_page': 2},
+    'large': {'pages': 96, 'tables_per_page': 3},
+    'text_only': {'pages': 48, 'tables_per_page': 0},
+}
+DEFAULT_CASES = ('small', 'medium', 'text_only')
+
+
+def measure(func: Callable[[], object], repeat: int, setup: Callable[[], None] = None) -> Dict:
+    """
+    함수를 repeat번 실행해 소요 시간 측정 (파이프라인 출력은 버림)
+
+    Args:
+        func: 측정할 함수
+        repeat: 반복 횟수
+        setup: 매 실행 전에 호출할 준비 함수 (측정 시간에서 제외)
+
+    Returns:
+        {'median', 'min', 'runs'} (초)
+    """
+    runs = []
+    for _ in range(repeat):
+        if setup:
+            with redirect_stdout(io.StringIO()):
+                setup()
+        with redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            func()
+            runs.append(time.perf_counter() - start)
+    return {'median': statistics.median(runs), 'min': min(runs), 'runs': runs}
+
+
+def run_case(name: str, base_url: str, work_dir: Path, repeat: int, workers: int) -> Dict[str, Dict]:
+    """
+    한 케이스의 단계별/전체 측정
+
+    Args:
+        name: 케이스 이름 (서버 디렉토리의 <name>.pdf)
+        base_url: 로컬 서버 URL
+        work_dir: 다운로드/출력 작업 디렉토리
+        repeat: 반복 횟수
+        workers: 추출 프로세스 수
+
+    Returns:
+        {작업 이름: 측정 결과}
+    """
+    url = f"{base_url}/{name}.pdf"
+    case_dir = work_dir / name
+    download_dir = case_dir / "download"
+    output_dir = case_dir / "output"
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    def fresh_download_dir():
+        shutil.rmtree(download_dir, ignore_errors=True)
+
+    downloader = PDFDownloader(download_dir, workers=workers)
+    results = {}
+
+    def download():
+        # 매번 빈 디렉토리를 만들어 조건부 요청 없이 전체를 받음
+        PDFDownloader(download_dir, session=downloader.session).download(url)
+
+    results['download'] = measure(download, repeat, setup=fresh_download_dir)
+
+    with redirect_stdout(io.StringIO()):
+        pdf_path = downloader.download(url)
+    results['download_304'] = measure(lambda: downloader.download(url), repeat)
+
+    holder = {}
+
+    def extract():
+        holder['pages_data'] = downloader.extract_text(pdf_path)
+
+    results['extract_text'] = measure(extract, repeat)
+    pages_data = holder['pages_data']
+
+    txt_path = case_dir / f"{name}.txt"
+    results['save_as_text'] = measure(lambda: downloader.save_as_text(pages_data, txt_path), repeat)
+
+    results['report_data'] = measure(lambda: extract_report_data(pages_data, limit=0), repeat)
+    report_data = extract_report_data(pages_data, limit=0)
+
+    generator = ReportGenerator(output_dir=output_dir)
+    results['generate'] = measure(lambda: generator.generate(report_data, pdf_path.name, f"{name}.html"), repeat)
+
+    def end_to_end():
+        pipeline = PDFDownloader(download_dir, workers=workers, session=downloader.session)
+        path = pipeline.download(url)
+        data = extract_report_data(pipeline.extract_and_save(path))
+        generator.generate(data, path.name, f"{name}_e2e.html")
+
+    results['end_to_end'] = measure(end_to_end, repeat, setup=fresh_download_dir)
+    return results
+
+
+def compare(results: Dict, baseline: Dict, threshold: float, min_delta: float = 0.0) -> List[str]:
+    """
+    기준 결과와 중앙값 비교
+
+    Args:
+        results: 현재 결과
+        baseline: 기준 결과
+        threshold: 허용 비율 (0.2면 20% 이상 느려지면 회귀)
+        min_delta: 이보다 적게 느려진 항목은 측정 오차로 보고 무시 (초)
+
+    Returns:
+        회귀 항목 설명 리스트
+    """
+    regressions = []
+    print(f"\n{'케이스':<12}{'작업':<14}{'기준(초)':>10}{'현재(초)':>10}{'비율':>8}")
+    for case, operations in results['cases'].items():
+        for operation, current in operations.items():
+            base = baseline.get('cases', {}).get(case, {}).get(operation)
+            if not base:
+                continue
+            ratio = current['median'] / base['median'] if base['median'] else 1.0
+            slower = ratio > 1 + threshold and current['median'] - base['median'] >= min_delta
+            flag = " <-- 회귀" if slower else ""
+            print(f"{case:<12}{operation:<14}{base['median']:>10.4f}{current['median']:>10.4f}{ratio:>8.2f}{flag}")
+            if flag:
+                regressions.append(f"{case}/{operation}: {base['median']:.4f}초 -> {current['median']:.4f}초 "
+                                   f"({ratio:.2f}배)")
+    return regressions
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="AI Report - 성능 벤치마크")
+    parser.add_argument("--cases", nargs="+", choices=list(CASES), default=list(DEFAULT_CASES),
+                        help="실행할 케이스")
+    parser.add_argument("--repeat", type=int, default=3, help="작업별 반복 횟수 (중앙값 사용)")
+    parser.add_argument("--workers", type=int, default=1, help="PDF 추출 프로세스 수")
+    parser.add_argument("--output", type=str, default=None, help="결과 JSON 저장 경로")
+    parser.add_argument("--baseline", type=str, default=None, help="비교할 기준 결과 JSON")
+    parser.add_argument("--threshold", type=float, default=0.2, help="회귀로 판단할 느려진 비율")
+    parser.add_argument("--min-delta", type=float, default=0.005,
+                        help="이보다 적게 느려진 항목은 무시 (초, 1ms 미만 작업의 측정 오차 방지)")
+    parser.add_argument("--profile", action="store_true", help="단계별 계측 결과를 함께 기록")
+    args = parser.parse_args(argv)
+
+    collector = metrics.enable_metrics() if args.profile else None
+    results = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'pdfplumber': pdfplumber.__version__,
+            'repeat': args.repeat,
+            'workers': args.workers,
+        },
+        'cases': {},
+    }
+
+    with tempfile.TemporaryDirectory(prefix="aireport-bench-") as tmp:
+        tmp = Path(tmp)
+        serve_dir = tmp / "serve"
+        serve_dir.mkdir()
+        for name in args.cases:
+            write_pdf(serve_dir / f"{name}.pdf", **CASES[name])
+
+        with serve_directory(serve_dir) as base_url:
+            for name in args.cases:
+                print(f"[*] 케이스 {name}: {CASES[name]}")
+                results['cases'][name] = run_case(name, base_url, tmp / "work", args.repeat, args.workers)
+                for operation, result in results['cases'][name].items():
+                    print(f"    {operation:<14} 중앙값 {result['median']:.4f}초 (최소 {result['min']:.4f}초)")
+
+    if collector is not None:
+        results['metrics'] = collector.snapshot()
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, ensure_ascii=False, indent=2), encoding='utf-8')
+        print(f"[OK] 결과 저장: {args.output}")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding='utf-8'))
+        regressions = compare(results, baseline, args.threshold, args.min_delta)
+        if regressions:
+            print(f"\n[FAIL] 성능 회귀 {len(regressions)}건 (허용 {args.threshold:.0%})")
+            for regression in regressions:
+                print(f"  - {regression}")
+            return 1
+        print(f"\n[OK] 성능 회귀 없음 (허용 {args.threshold:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,41 @@
+"""
+벤치마크용 로컬 HTTP 서버
+
+디렉토리를 백그라운드 스레드에서 서비스한다. Last-Modified / If-Modified-Since(304)를 지원하므로
+PDFDownloader의 조건부 요청 경로도 실제 사이트 없이 측정할 수 있다.
+"""
+import threading
+from contextlib import contextmanager
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Iterator
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    """요청 로그를 출력하지 않는 정적 파일 핸들러"""
+
+    def log_message(self, format, *args):
+        pass
+
+
+@contextmanager
+def serve_directory(directory: Path) -> Iterator[str]:
+    """
+    디렉토리를 임의 포트의 로컬 HTTP 서버로 서비스
+
+    Args:
+        directory: 서비스할 디렉토리
+
+    Yields:
+        기본 URL (예: "http://127.0.0.1:54321")
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), partial(QuietHandler, directory=str(directory)))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
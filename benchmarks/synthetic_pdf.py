@@ -0,0 +1,136 @@
+"""
+벤치마크용 합성 PDF 생성
+
+외부 라이브러리 없이 본문 텍스트와 선으로 그린 표를 가진 PDF를 만든다.
+같은 인자로 만들면 항상 같은 바이트가 나오므로 실행 간 결과를 비교할 수 있다.
+"""
+import zlib
+import random
+from pathlib import Path
+from typing import List
+
+PAGE_WIDTH = 595
+PAGE_HEIGHT = 842
+MARGIN = 50
+ROW_HEIGHT = 14
+TEXT_LINES = 18
+TABLE_AREA_TOP = 520
+TABLE_HEADER = ["Name", "PER", "PBR", "OP 3M", "Target 1M", "Dividend"]
+
+WORDS = ("market", "rates", "earnings", "value", "growth", "momentum", "quant", "weekly", "index", "sector",
+         "dividend", "forecast", "revision", "portfolio", "strategy", "spread", "yield", "volatility")
+
+
+def _escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def _text_block(rng: random.Random, page_num: int) -> List[str]:
+    """페이지 상단 본문 (제목 + 문단)"""
+    ops = ["BT", "/F1 14 Tf", f"{MARGIN} {PAGE_HEIGHT - MARGIN} Td", "16 TL",
+           f"({_escape(f'Synthetic Quant Weekly - page {page_num}')}) Tj", "/F1 9 Tf", "12 TL"]
+    for _ in range(TEXT_LINES):
+        line = " ".join(rng.choice(WORDS) for _ in range(10))
+        ops.append(f"T* ({_escape(line)}) Tj")
+    ops.append("ET")
+    return ops
+
+
+def _table(rng: random.Random, top: float, rows: int, first_id: int) -> List[str]:
+    """선으로 테두리를 그린 표 (머리글 + rows행)"""
+    cols = len(TABLE_HEADER)
+    col_width = (PAGE_WIDTH - 2 * MARGIN) / cols
+    bottom = top - (rows + 1) * ROW_HEIGHT
+    ops = ["0.5 w"]
+
+    for r in range(rows + 2):
+        y = top - r * ROW_HEIGHT
+        ops.append(f"{MARGIN} {y:.2f} m {PAGE_WIDTH - MARGIN} {y:.2f} l S")
+    for c in range(cols + 1):
+        x = MARGIN + c * col_width
+        ops.append(f"{x:.2f} {top:.2f} m {x:.2f} {bottom:.2f} l S")
+
+    cells = [TABLE_HEADER]
+    for r in range(rows):
+        op_3m = rng.uniform(-30, 60)
+        cells.append([
+            f"STK{first_id + r:05d}",
+            f"{rng.uniform(3, 40):.1f}",
+            f"{rng.uniform(0.2, 4):.2f}",
+            f"({abs(op_3m):.1f})" if op_3m < 0 else f"{op_3m:.1f}",
+            f"{rng.uniform(-20, 40):.1f}",
+            f"{rng.randint(0, 9000):,}",
+        ])
+
+    ops.extend(["BT", "/F1 8 Tf"])
+    for r, row in enumerate(cells):
+        y = top - (r + 1) * ROW_HEIGHT + 4
+        for c, cell in enumerate(row):
+            ops.append(f"1 0 0 1 {MARGIN + c * col_width + 3:.2f} {y:.2f} Tm ({_escape(cell)}) Tj")
+    ops.append("ET")
+    return ops
+
+
+def build_pdf(pages: int, tables_per_page: int = 1, rows: int = 12, seed: int = 0) -> bytes:
+    """
+    합성 PDF 바이트 생성
+
+    Args:
+        pages: 페이지 수
+        tables_per_page: 페이지당 표 수 (0이면 본문만)
+        rows: 표당 최대 행 수 (페이지에 들어가지 않으면 줄어듦)
+        seed: 난수 시드
+
+    Returns:
+        PDF 파일 바이트
+    """
+    rng = random.Random(seed)
+    if tables_per_page:
+        fit = int((TABLE_AREA_TOP - MARGIN) / tables_per_page / ROW_HEIGHT) - 2
+        rows = max(1, min(rows, fit))
+
+    # 객체 번호: 1 카탈로그, 2 페이지 트리, 3 글꼴, 이후 페이지마다 (페이지, 내용 스트림)
+    objects = [b"", b"", b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    page_refs = []
+    stock_id = 0
+    for page_num in range(1, pages + 1):
+        ops = _text_block(rng, page_num)
+        top = TABLE_AREA_TOP
+        for _ in range(tables_per_page):
+            ops.extend(_table(rng, top, rows, stock_id))
+            stock_id += rows
+            top -= (rows + 2) * ROW_HEIGHT
+
+        stream = zlib.compress("\n".join(ops).encode("latin-1"))
+        page_obj = len(objects) + 1
+        page_refs.append(f"{page_obj} 0 R")
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {PAGE_WIDTH} {PAGE_HEIGHT}] "
+                       f"/Resources << /Font << /F1 3 0 R >> >> /Contents {page_obj + 1} 0 R >>".encode())
+        objects.append(f"<< /Length {len(stream)} /Filter /FlateDecode >>\nstream\n".encode()
+                       + stream + b"\nendstream")
+
+    objects[0] = b"<< /Type /Catalog /Pages 2 0 R >>"
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(page_refs)}] /Count {pages} >>".encode()
+
+    out = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n".encode() + body + b"\nendobj\n"
+
+    xref_offset = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    out += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode()
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n".encode()
+    return bytes(out)
+
+
+def write_pdf(path: Path, pages: int, tables_per_page: int = 1, rows: int = 12, seed: int = 0) -> Path:
+    """
+    합성 PDF를 파일로 저장
+
+    Returns:
+        저장된 파일 경로
+    """
+    path.write_bytes(build_pdf(pages, tables_per_page, rows, seed))
+    return path
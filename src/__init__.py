@@ -1,10 +1,39 @@
 """
 AI Report - 인터랙티브 금융 보고서 생성기
+
+하위 모듈은 처음 사용할 때 불러온다 (pdfplumber, requests, jinja2를 import 시점에 불러오지 않음).
 """
+import importlib
 
-from .pdf_downloader import PDFDownloader, download_report
-from .report_generator import ReportGenerator, generate_hanaw_report
 from . import config
 
 __version__ = "0.1.0"
-__all__ = ["PDFDownloader", "download_report", "ReportGenerator", "generate_hanaw_report", "config"]
+
+# 공개 이름 -> 정의된 하위 모듈
+_LAZY_ATTRS = {
+    "PDFDownloader": ".pdf_downloader",
+    "download_report": ".pdf_downloader",
+    "ReportGenerator": ".report_generator",
+    "generate_hanaw_report": ".report_generator",
+    "ingest_reports": ".batch_ingest",
+    "SearchIndex": ".search_index",
+    "extract_report_data": ".report_parser",
+    "HistoryStore": ".history_store",
+}
+
+__all__ = ["PDFDownloader", "download_report", "ReportGenerator", "generate_hanaw_report", "ingest_reports",
+           "SearchIndex", "extract_report_data", "HistoryStore", "config"]
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    # 다음 접근부터는 모듈 속성으로 바로 조회
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRS))
@@ -0,0 +1,58 @@
+"""
+AI Report 명령행 진입점
+
+    python -m src report [옵션]   보고서 다운로드, 파싱, HTML 생성
+    python -m src ingest [옵션]   여러 보고서 일괄 수집
+    python -m src jobs [옵션]     재개 가능한 수집 작업 대기열
+    python -m src search [옵션]   보고서 전문 검색
+    python -m src history [옵션]  종목 지표 시계열 조회
+    python -m src export [옵션]   추출 결과 내보내기 (jsonl, csv, columnar)
+    python -m src serve [옵션]    로컬 보고서 서버 (HTTP API)
+
+하위 명령에 필요한 모듈만 불러오므로 search처럼 인덱스만 읽는 명령은
+pdfplumber, requests, jinja2를 불러오지 않고 바로 시작한다.
+"""
+import sys
+import importlib
+from typing import List
+
+# 하위 명령 -> (모듈, 설명)
+COMMANDS = {
+    "report": (".report_generator", "보고서 다운로드, 파싱, HTML 생성 (--render-batch로 일괄 생성)"),
+    "ingest": (".batch_ingest", "여러 보고서 일괄 수집"),
+    "jobs": (".job_queue", "재개 가능한 수집 작업 대기열 (중단/취소된 수집을 멈춘 곳부터 이어서 실행)"),
+    "search": (".search_index", "보고서 전문 검색"),
+    "history": (".history_store", "종목 지표 시계열 조회"),
+    "export": (".exporters", "추출 결과 내보내기 (텍스트, JSONL, 표별 CSV, 열 단위 바이너리)"),
+    "serve": (".report_server", "로컬 보고서 서버 (작업자를 띄워 둔 채 HTTP로 보고서 생성/제공)"),
+}
+
+
+def print_usage():
+    print("사용법: python -m src <명령> [옵션]\n")
+    print("명령:")
+    for command, (_, description) in COMMANDS.items():
+        print(f"  {command:<8}{description}")
+    print("\n명령별 옵션: python -m src <명령> --help")
+
+
+def main(argv: List[str] = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] in ("-h", "--help"):
+        print_usage()
+        return 0
+
+    command, args = argv[0], argv[1:]
+    if command not in COMMANDS:
+        print(f"[ERROR] 알 수 없는 명령: {command}\n")
+        print_usage()
+        return 2
+
+    # 하위 명령 도움말에 표시될 프로그램 이름
+    sys.argv[0] = f"python -m src {command}"
+    module = importlib.import_module(COMMANDS[command][0], __package__)
+    return module.main(args) or 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
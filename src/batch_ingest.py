@@ -0,0 +1,254 @@
+"""
+여러 보고서 URL 일괄 수집 모듈
+
+하나의 keep-alive 세션 풀로 여러 PDF를 동시에 다운로드하고,
+크기가 제한된 대기열을 통해 파싱 작업자에게 넘긴다.
+"""
+import time
+import queue
+import random
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List
+from urllib.parse import urlsplit
+
+import requests
+
+from . import metrics
+from .config import (DATA_DIR, USE_EXTRACT_CACHE, USE_SEARCH_INDEX, USE_DEDUPE, DOWNLOAD_RETRIES, DOWNLOAD_BACKOFF, BATCH_CONCURRENCY,
+                     BATCH_PER_HOST, BATCH_EXTRACT_WORKERS, BATCH_QUEUE_SIZE)
+from .dedupe import DedupeIndex
+from .extract_cache import ExtractionCache
+from .http_session import create_session
+from .ocr import create_ocr_pool
+from .pdf_downloader import PDFDownloader
+from .search_index import SearchIndex
+
+# 재시도할 HTTP 상태 코드
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+def read_url_file(path: Path) -> List[str]:
+    """
+    URL 목록 파일 읽기 (한 줄에 하나, 빈 줄과 '#' 주석 무시)
+
+    Args:
+        path: URL 목록 파일 경로
+
+    Returns:
+        URL 리스트
+    """
+    urls = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                urls.append(line)
+    return urls
+
+
+class BatchIngestor:
+    """여러 보고서 URL 동시 다운로드 및 파싱"""
+
+    def __init__(self, output_dir: Path = None, concurrency: int = None, per_host: int = None,
+                 extract_workers: int = None, queue_size: int = None, retries: int = None,
+                 backoff: float = None, workers: int = None, use_cache: bool = None, mode: str = None,
+                 pages: str = None, use_index: bool = None, skip_duplicates: bool = None):
+        self.concurrency = concurrency or BATCH_CONCURRENCY
+        self.per_host = per_host or BATCH_PER_HOST
+        self.extract_workers = extract_workers or BATCH_EXTRACT_WORKERS
+        self.queue_size = queue_size or BATCH_QUEUE_SIZE
+        self.retries = retries if retries is not None else DOWNLOAD_RETRIES
+        self.backoff = backoff if backoff is not None else DOWNLOAD_BACKOFF
+        if use_cache is None:
+            use_cache = USE_EXTRACT_CACHE
+        if use_index is None:
+            use_index = USE_SEARCH_INDEX
+        self.skip_duplicates = USE_DEDUPE if skip_duplicates is None else skip_duplicates
+
+        self.session = create_session(max(self.concurrency, self.per_host))
+        self.downloader = PDFDownloader(output_dir or DATA_DIR, workers=workers,
+                                        cache=ExtractionCache() if use_cache else None,
+                                        session=self.session, mode=mode, pages=pages,
+                                        search_index=SearchIndex() if use_index else None,
+                                        ocr=create_ocr_pool(),
+                                        dedupe=DedupeIndex() if self.skip_duplicates else None)
+        self._host_slots = {}
+        self._host_lock = threading.Lock()
+
+    def ingest(self, urls: List[str]) -> List[Dict]:
+        """
+        URL 목록을 다운로드하고 파싱
+
+        Args:
+            urls: PDF URL 리스트
+
+        Returns:
+            입력 순서대로 URL별 결과 (같은 URL이 여러 번 있으면 처음 한 번만)
+            ({'url', 'pdf_path', 'pages_data', 'duplicate_of', 'attempts', 'error'}, 실패 시 error에 메시지,
+            이미 파싱한 보고서와 같으면 pages_data 없이 duplicate_of에 원본 파일명)
+        """
+        unique = list(dict.fromkeys(urls))
+        if len(unique) < len(urls):
+            print(f"[*] 중복 URL {len(urls) - len(unique)}건 제외")
+        urls = unique
+
+        results = [{'url': url, 'pdf_path': None, 'pages_data': None, 'duplicate_of': None, 'attempts': 0,
+                    'error': None}
+                   for url in urls]
+        work_queue = queue.Queue(maxsize=self.queue_size)
+
+        extractors = [threading.Thread(target=self._extract_worker, args=(work_queue, results), daemon=True)
+                      for _ in range(self.extract_workers)]
+        for thread in extractors:
+            thread.start()
+
+        print(f"[*] 일괄 수집 시작: {len(urls)}건 (동시 {self.concurrency}, 호스트당 {self.per_host})")
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            for index in range(len(urls)):
+                executor.submit(self._download_task, index, work_queue, results)
+
+        # 다운로드가 모두 끝나면 파싱 작업자 종료 신호
+        for _ in extractors:
+            work_queue.put(None)
+        for thread in extractors:
+            thread.join()
+
+        failed = sum(1 for result in results if result['error'])
+        duplicates = sum(1 for result in results if result['duplicate_of'])
+        print(f"[OK] 일괄 수집 완료: 성공 {len(results) - failed}건 (중복 {duplicates}건), 실패 {failed}건")
+        return results
+
+    def _download_task(self, index: int, work_queue: queue.Queue, results: List[Dict]):
+        """단일 URL 다운로드 (재시도 포함) 후 파싱 대기열에 추가"""
+        result = results[index]
+        try:
+            with self._host_slot(result['url']):
+                result['pdf_path'] = self._download_with_retry(result)
+        except Exception as e:
+            result['error'] = f"다운로드 실패: {e}"
+            print(f"[ERROR] {result['url']}: {result['error']}")
+            return
+
+        # 대기열이 가득 차 있으면 파싱이 따라올 때까지 대기
+        work_queue.put(index)
+
+    def _download_with_retry(self, result: Dict) -> Path:
+        """일시적 오류는 지수 백오프로 재시도"""
+        while True:
+            result['attempts'] += 1
+            try:
+                return self.downloader.download(result['url'])
+            except requests.RequestException as e:
+                if not _is_retryable(e) or result['attempts'] > self.retries:
+                    raise
+                delay = self.backoff * (2 ** (result['attempts'] - 1)) * random.uniform(0.5, 1.5)
+                print(f"[*] 재시도 {result['attempts']}/{self.retries} ({delay:.1f}초 후): {result['url']}")
+                time.sleep(delay)
+
+    def _extract_worker(self, work_queue: queue.Queue, results: List[Dict]):
+        """대기열에서 다운로드된 PDF를 꺼내 파싱"""
+        while True:
+            index = work_queue.get()
+            if index is None:
+                return
+            result = results[index]
+            try:
+                # 다른 URL로 이미 받아 파싱한 보고서이면 파싱 생략
+                original = self.downloader.find_duplicate(result['pdf_path'])
+                if original is not None:
+                    result['duplicate_of'] = original['name']
+                    print(f"[*] 중복 보고서 ({'동일' if original['match'] == 'exact' else '유사'}), 파싱 생략: "
+                          f"{result['pdf_path'].name} -> {original['name']}")
+                    continue
+                result['pages_data'] = self.downloader.extract_and_save(result['pdf_path'])
+            except Exception as e:
+                result['error'] = f"파싱 실패: {e}"
+                print(f"[ERROR] {result['url']}: {result['error']}")
+
+    def _host_slot(self, url: str) -> threading.BoundedSemaphore:
+        """호스트별 동시 연결 수 제한용 세마포어"""
+        host = urlsplit(url).netloc
+        with self._host_lock:
+            if host not in self._host_slots:
+                self._host_slots[host] = threading.BoundedSemaphore(self.per_host)
+            return self._host_slots[host]
+
+
+def _is_retryable(error: requests.RequestException) -> bool:
+    """연결 오류, 타임아웃, 429/5xx 응답만 재시도 대상"""
+    if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+        return True
+    response = getattr(error, 'response', None)
+    return response is not None and response.status_code in RETRY_STATUS_CODES
+
+
+def ingest_reports(urls: List[str], output_dir: Path = None, **kwargs) -> List[Dict]:
+    """
+    보고서 일괄 다운로드 및 파싱 헬퍼 함수
+
+    Args:
+        urls: PDF URL 리스트
+        output_dir: 저장 디렉토리
+        **kwargs: BatchIngestor 옵션 (concurrency, per_host, retries 등)
+
+    Returns:
+        URL별 결과 리스트
+    """
+    return BatchIngestor(output_dir, **kwargs).ingest(urls)
+
+
+def main(argv: List[str] = None):
+    """일괄 수집 명령 (python -m src ingest)"""
+    parser = argparse.ArgumentParser(description="AI Report - 보고서 일괄 수집")
+    parser.add_argument("urls", nargs="*", help="PDF URL 목록")
+    parser.add_argument("--url-file", type=str, help="URL 목록 파일 (한 줄에 하나)")
+    parser.add_argument("--concurrency", type=int, default=None, help="동시 다운로드 수")
+    parser.add_argument("--per-host", type=int, default=None, help="호스트당 동시 연결 수")
+    parser.add_argument("--extract-workers", type=int, default=None, help="파싱 작업자 수")
+    parser.add_argument("--retries", type=int, default=None, help="재시도 횟수")
+    parser.add_argument("--workers", type=int, default=None, help="PDF 병렬 추출 프로세스 수")
+    parser.add_argument("--no-cache", action="store_true", help="추출 캐시를 사용하지 않고 항상 다시 파싱")
+    parser.add_argument("--mode", choices=["full", "text", "tables"], default=None,
+                        help="PDF 추출 모드 (full: 텍스트+표, text: 텍스트만, tables: 표만)")
+    parser.add_argument("--pages", type=str, default=None, help="추출할 페이지 범위 (예: 1-3,10)")
+    parser.add_argument("--no-index", action="store_true", help="전문 검색 인덱스에 추가하지 않음")
+    parser.add_argument("--keep-duplicates", action="store_true",
+                        help="이미 파싱한 보고서와 내용이 같거나 거의 같아도 다시 파싱")
+    parser.add_argument("--profile", nargs="?", const="", default=None, metavar="FILE",
+                        help="단계별 시간/메모리 요약 출력 (FILE을 주면 .json 또는 .prom 형식으로 저장)")
+
+    args = parser.parse_args(argv)
+    collector = metrics.enable_metrics() if args.profile is not None else None
+
+    urls = list(args.urls)
+    if args.url_file:
+        urls.extend(read_url_file(Path(args.url_file)))
+    if not urls:
+        parser.error("URL 또는 --url-file을 지정하세요")
+
+    results = ingest_reports(urls, concurrency=args.concurrency, per_host=args.per_host,
+                             extract_workers=args.extract_workers, retries=args.retries,
+                             workers=args.workers, use_cache=False if args.no_cache else None,
+                             mode=args.mode, pages=args.pages, use_index=False if args.no_index else None,
+                             skip_duplicates=False if args.keep_duplicates else None)
+
+    for result in results:
+        if result['error']:
+            print(f"[FAIL] {result['url']}: {result['error']}")
+        elif result['duplicate_of']:
+            print(f"[OK] {result['url']} -> {result['pdf_path']} (중복: {result['duplicate_of']})")
+        else:
+            print(f"[OK] {result['url']} -> {result['pdf_path']} ({len(result['pages_data'])} 페이지)")
+
+    if collector is not None:
+        print(f"\n[*] 단계별 계측 결과")
+        print(collector.format_table())
+        if args.profile:
+            collector.save(Path(args.profile))
+
+
+if __name__ == "__main__":
+    main()
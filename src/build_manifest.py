@@ -0,0 +1,98 @@
+"""
+증분 빌드 매니페스트 모듈
+
+OUTPUT_DIR/.build_manifest.json에 출력 HTML별 입력(PDF, report_data, 템플릿, 추출 설정) 해시를 기록하여
+다시 실행할 때 입력이 바뀌지 않은 보고서는 파싱/렌더링을 건너뛴다.
+"""
+import os
+import json
+import hashlib
+from pathlib import Path
+from typing import Dict, Optional
+
+from .config import OUTPUT_DIR
+
+MANIFEST_FILENAME = ".build_manifest.json"
+
+
+def hash_data(data) -> str:
+    """
+    JSON 직렬화 가능한 데이터의 SHA-256 해시 (키 순서 무관)
+
+    Args:
+        data: report_data, 추출 설정 등
+
+    Returns:
+        16진수 해시 문자열
+    """
+    encoded = json.dumps(data, sort_keys=True, ensure_ascii=False, default=str).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class BuildManifest:
+    """출력 HTML별 입력 해시 기록"""
+
+    def __init__(self, output_dir: Path = None):
+        self.output_dir = output_dir or OUTPUT_DIR
+        self.path = self.output_dir / MANIFEST_FILENAME
+        self.entries = self._load()
+        self._recorded = set()
+
+    def get(self, output_filename: str) -> Optional[Dict]:
+        """
+        출력 파일의 마지막 빌드 기록
+
+        Args:
+            output_filename: 출력 HTML 파일명
+
+        Returns:
+            입력 해시 dict (기록이 없으면 None)
+        """
+        return self.entries.get(output_filename)
+
+    def is_fresh(self, output_filename: str, inputs: Dict[str, str]) -> bool:
+        """
+        출력 파일이 최신인지 확인 (파일이 있고 모든 입력 해시가 같으면 최신)
+
+        Args:
+            output_filename: 출력 HTML 파일명
+            inputs: 입력 이름별 해시 ({'pdf', 'report_data', 'template', ...})
+
+        Returns:
+            다시 생성할 필요가 없으면 True
+        """
+        return self.entries.get(output_filename) == inputs and (self.output_dir / output_filename).exists()
+
+    def record(self, output_filename: str, inputs: Dict[str, str]):
+        """
+        빌드 결과 기록 (save() 호출 시 파일에 반영)
+
+        Args:
+            output_filename: 출력 HTML 파일명
+            inputs: 입력 이름별 해시
+        """
+        self.entries[output_filename] = dict(inputs)
+        self._recorded.add(output_filename)
+
+    def save(self):
+        """
+        매니페스트 파일 저장 (임시 파일에 쓴 뒤 교체)
+
+        그 사이 다른 프로세스(보고서 서버 작업자 등)가 기록한 항목을 잃지 않도록
+        파일을 다시 읽고 이 객체에서 기록한 항목만 덮어쓴다.
+        """
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        entries = self._load()
+        entries.update({name: self.entries[name] for name in self._recorded})
+        self.entries = entries
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, ensure_ascii=False, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+    def _load(self) -> Dict[str, Dict]:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
@@ -13,10 +13,88 @@ TEMPLATE_DIR = PROJECT_ROOT / "templates"
 
 # SSL 우회 설정 (회사 환경)
 USE_SSL_BYPASS = True
-SSL_BYPASS_PATH = "D:\\projects"
+SSL_BYPASS_PATH = "D:\\projects"  # utils/ssl_bypass.py가 있는 경로 (없으면 우회하지 않음)
+SSL_VERIFY = True  # SSL 인증서 검증 (False면 생략, 문자열이면 CA 번들 경로)
 
 # PDF 다운로드 설정
 DOWNLOAD_TIMEOUT = 60
+DOWNLOAD_CHUNK_SIZE = 256 * 1024  # 스트리밍 다운로드 청크 크기 (bytes)
+DOWNLOAD_RETRIES = 3  # 일시적 오류(연결 실패, 5xx, 429) 재시도 횟수
+DOWNLOAD_BACKOFF = 1.0  # 재시도 대기 기본값 (초, 시도마다 2배)
+
+# 일괄 수집 설정
+BATCH_CONCURRENCY = 8  # 동시 다운로드 수
+BATCH_PER_HOST = 4  # 호스트당 동시 연결 수
+BATCH_EXTRACT_WORKERS = 2  # 다운로드된 PDF를 파싱하는 작업자 수
+BATCH_QUEUE_SIZE = 4  # 다운로드와 파싱 사이 대기열 크기 (가득 차면 다운로드 대기)
+
+# 작업 대기열 설정 (python -m src jobs: 중단되거나 취소된 수집을 멈춘 곳부터 이어서 실행)
+JOB_QUEUE_PATH = DATA_DIR / "jobs.sqlite3"
+JOB_WORKERS = 4  # URL/페이지 청크 작업을 처리하는 스레드 수
+JOB_EXTRACT_WORKERS = 2  # 페이지 청크를 추출하는 프로세스 수
+JOB_CHUNK_PAGES = 16  # 페이지 청크 크기 (청크마다 추출 결과를 체크포인트로 저장)
+JOB_LEASE_SECONDS = 300  # 작업 임대 시간 (작업자가 멈추면 만료 후 다른 작업자가 가져감)
+JOB_MAX_ATTEMPTS = 3  # 이 횟수만큼 실패하면 dead 상태로 보류 (--retry-dead로 재시도)
+JOB_RETRY_BACKOFF = 5.0  # 재시도 대기 시간 기본값 (초, 실패할 때마다 2배)
+JOB_POLL_INTERVAL = 1.0  # 처리할 작업이 없을 때 대기열 확인 간격 (초)
+
+# PDF 파싱 설정
+EXTRACT_WORKERS = 1  # 1이면 단일 프로세스, 2 이상이면 프로세스 풀로 페이지 범위를 나눠 병렬 추출
+EXTRACT_MODE = "full"  # full: 텍스트+표, text: 텍스트만, tables: 표만
+EXTRACT_PROGRESS_EVERY = 10  # N페이지마다 진행 상황 출력 (0이면 출력 안 함)
+TABLE_MIN_RULING_OBJECTS = 1  # 선/사각형/곡선 객체가 이보다 적은 페이지는 표 추출 생략 (0이면 항상 추출)
+USE_MMAP = True  # PDF를 읽기 전용 mmap으로 열어 해시/파싱 (추출 프로세스끼리 페이지 캐시 공유)
+TABLE_FORMAT = "columnar"  # columnar: 열 단위 ColumnarTable (메모리 절약, 숫자 열 미리 변환), list: 행 리스트
+
+# 추출 결과 캐시 설정 (PDF 내용 해시 기준)
+USE_EXTRACT_CACHE = True
+CACHE_DIR = DATA_DIR / ".cache"
+EXTRACT_CACHE_DIR = CACHE_DIR / "extract"
+EXTRACT_CACHE_MAX_BYTES = 512 * 1024 * 1024  # 초과 시 가장 오래 사용하지 않은 항목부터 삭제
+
+# 추출 결과 내보내기 설정 (텍스트 파일은 항상 기록)
+EXPORT_FORMATS = ("text", "jsonl")  # text, jsonl(페이지당 JSON 한 줄), csv(표마다 CSV), columnar(열 단위 바이너리)
+EXPORT_COMPRESSION = None  # jsonl/csv/columnar 압축: None, "gzip", "zstd" (zstandard 없으면 gzip)
+EXPORT_COMPRESSION_LEVEL = {"gzip": 6, "zstd": 3}
+EXPORT_CHUNK_SIZE = 1024 * 1024  # 이 글자 수만큼 모았다가 한 번에 인코딩/기록
+
+# 이미지 페이지 OCR 설정 (pytesseract와 tesseract가 설치된 경우에만 사용)
+USE_OCR = True
+OCR_WORKERS = 2  # OCR 전용 프로세스 수 (텍스트 추출 작업자와 별도)
+OCR_LANG = "kor+eng"
+OCR_RESOLUTION = 200  # 페이지 렌더링 해상도 (DPI)
+OCR_MIN_CHARS = 20  # 추출한 글자가 이보다 적은 이미지 페이지만 OCR
+OCR_CACHE_DIR = CACHE_DIR / "ocr"  # 페이지 이미지 해시별 OCR 결과
+OCR_MAX_PENDING = 32  # OCR 결과를 기다리며 쌓아 둘 최대 페이지 수 (넘으면 추출도 OCR을 기다림)
+
+# 전문 검색 인덱스 설정 (파싱한 보고서를 자동으로 색인)
+USE_SEARCH_INDEX = True
+SEARCH_INDEX_PATH = DATA_DIR / "search_index.sqlite3"
+
+# 중복 보고서 탐지 설정 (같은 내용을 다른 URL/파일명으로 다시 올린 보고서는 일괄 수집에서 파싱 생략)
+USE_DEDUPE = True
+DEDUPE_INDEX_PATH = DATA_DIR / "dedupe.sqlite3"
+DEDUPE_SIMHASH_PAGES = 2  # 앞쪽 N페이지 텍스트로 유사 중복(SimHash) 판단
+DEDUPE_SIMHASH_DISTANCE = 3  # 해밍 거리가 이 이하이면 같은 보고서로 판단 (0~3)
+DEDUPE_MIN_CHARS = 200  # 앞쪽 페이지 글자가 이보다 적으면 (스캔본 등) 유사 중복 판단 생략
+
+# 보고서 간 시계열 저장소 설정 (보고서를 생성할 때 종목 지표를 날짜별로 누적)
+USE_HISTORY_STORE = True
+HISTORY_STORE_PATH = DATA_DIR / "history.sqlite3"
 
 # 보고서 설정
 DEFAULT_CHART_HEIGHT = 400
+TEMPLATE_CACHE_DIR = CACHE_DIR / "templates"  # 컴파일된 템플릿 바이트코드 캐시
+TOP_STOCKS_LIMIT = 10  # PDF 표에서 추출할 추천 종목 최대 개수 (0이면 전체)
+CHART_JS_URL = "https://cdn.jsdelivr.net/npm/chart.js"  # 차트 탭을 처음 열 때 불러옴
+CHART_JS_VENDOR_PATH = PROJECT_ROOT / "vendor" / "chart.umd.min.js"  # 있으면 CDN 대신 사용 (오프라인 열람)
+REPORT_DATA_INLINE_MAX_ROWS = 200  # 추천 종목이 이보다 많으면 데이터를 별도 <보고서>.data.js로 저장
+STOCK_TABLE_VIRTUAL_MIN_ROWS = 200  # 추천 종목이 이보다 많으면 표를 브라우저에서 보이는 행만 렌더링 (정렬/필터 포함)
+
+# 로컬 보고서 서버 설정 (python -m src serve)
+SERVE_HOST = "127.0.0.1"  # 팀에서 공유하려면 0.0.0.0
+SERVE_PORT = 8000
+SERVE_WORKERS = 2  # 보고서 생성 작업자 프로세스 수 (pdfplumber와 템플릿을 미리 불러 둠)
+SERVE_MAX_UPLOAD_BYTES = 100 * 1024 * 1024  # 업로드 PDF 최대 크기
+SERVE_MIN_UPLOAD_RATE = 64 * 1024  # 요청 본문 최소 전송 속도 (bytes/초, 이보다 느리면 408로 끊음)
+SERVE_UPLOAD_DIR = DATA_DIR / "uploads"  # 업로드 PDF 저장 위치 (내용 해시로 저장, URL로 받은 PDF와 분리)
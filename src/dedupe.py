@@ -0,0 +1,193 @@
+"""
+중복 보고서 탐지 모듈
+
+증권사 사이트는 같은 PDF를 다른 URL, 다른 파일명으로 다시 올린다.
+다운로드하면서 계산한 SHA-256으로 완전히 같은 파일을 찾고,
+앞쪽 페이지 텍스트의 64비트 SimHash로 표지 문구나 메타데이터만 다른 재게시본을 찾는다.
+
+SimHash는 16비트씩 네 구간으로 나눠 색인한다. 해밍 거리가 3 이하인 두 값은 적어도 한 구간이 같으므로
+구간이 같은 후보만 꺼내 거리를 계산한다.
+"""
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Optional
+
+from .config import DEDUPE_INDEX_PATH, DEDUPE_SIMHASH_DISTANCE, DEDUPE_MIN_CHARS
+from .search_index import normalize_text
+
+SIMHASH_BITS = 64
+SIMHASH_BANDS = 4
+SHINGLE_SIZE = 4
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    sha256 TEXT PRIMARY KEY,
+    name TEXT NOT NULL,  -- 데이터 디렉토리의 PDF 파일명
+    url TEXT,
+    size INTEGER,
+    simhash INTEGER,  -- 부호 있는 64비트로 저장
+    band0 INTEGER,
+    band1 INTEGER,
+    band2 INTEGER,
+    band3 INTEGER,
+    duplicate_of TEXT,  -- 유사 중복으로 판단된 경우 원본 파일명
+    added_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS documents_band0 ON documents(band0);
+CREATE INDEX IF NOT EXISTS documents_band1 ON documents(band1);
+CREATE INDEX IF NOT EXISTS documents_band2 ON documents(band2);
+CREATE INDEX IF NOT EXISTS documents_band3 ON documents(band3);
+"""
+
+
+def simhash(text: str) -> Optional[int]:
+    """
+    텍스트의 64비트 SimHash
+
+    정규화한 텍스트(공백 제거)의 글자 4-gram을 등장 횟수로 가중한다.
+    한국어는 조사와 띄어쓰기 차이가 많아 단어 대신 글자 n-gram을 사용한다.
+
+    Args:
+        text: 원문 텍스트
+
+    Returns:
+        0 이상 2^64 미만의 정수 (텍스트가 DEDUPE_MIN_CHARS보다 짧으면 None)
+    """
+    text = normalize_text(text).replace(' ', '')
+    if len(text) < DEDUPE_MIN_CHARS:
+        return None
+
+    shingles = Counter(text[i:i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1))
+    weights = [0] * SIMHASH_BITS
+    for shingle, count in shingles.items():
+        value = int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'little')
+        for bit in range(SIMHASH_BITS):
+            if value >> bit & 1:
+                weights[bit] += count
+            else:
+                weights[bit] -= count
+
+    fingerprint = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """두 SimHash의 다른 비트 수"""
+    return bin(a ^ b).count('1')
+
+
+def _signed(value: int) -> int:
+    """SQLite INTEGER(부호 있는 64비트)에 저장할 수 있게 변환"""
+    return value - (1 << SIMHASH_BITS) if value >= 1 << (SIMHASH_BITS - 1) else value
+
+
+def _bands(value: int):
+    return [(value >> (16 * i)) & 0xFFFF for i in range(SIMHASH_BANDS)]
+
+
+class DedupeIndex:
+    """SQLite 기반 보고서 해시/SimHash 색인"""
+
+    def __init__(self, path: Path = None):
+        self.path = path or DEDUPE_INDEX_PATH
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # 일괄 수집의 파싱 작업자 스레드가 함께 사용하므로 잠금으로 직렬화
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+
+    def close(self):
+        """데이터베이스 연결 종료"""
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def add(self, name: str, sha256: str, url: str = None, size: int = None, fingerprint: int = None,
+            duplicate_of: str = None):
+        """
+        보고서 등록 (같은 해시가 있으면 파일명/URL은 유지하고 SimHash만 채움)
+
+        Args:
+            name: PDF 파일명
+            sha256: PDF 내용 해시
+            url: 원본 URL
+            size: 파일 크기
+            fingerprint: 앞쪽 페이지 텍스트의 simhash() (None이면 유사 중복 탐지에서 제외)
+            duplicate_of: 유사 중복인 경우 원본 파일명
+        """
+        bands = _bands(fingerprint) if fingerprint is not None else [None] * SIMHASH_BANDS
+        signed = _signed(fingerprint) if fingerprint is not None else None
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO documents (sha256, name, url, size, duplicate_of, added_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (sha256, name, url, size, duplicate_of, time.time()))
+            if fingerprint is not None:
+                self._conn.execute(
+                    "UPDATE documents SET simhash = ?, band0 = ?, band1 = ?, band2 = ?, band3 = ? "
+                    "WHERE sha256 = ? AND simhash IS NULL",
+                    (signed, *bands, sha256))
+
+    def remove(self, sha256: str):
+        """보고서 등록 해제"""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM documents WHERE sha256 = ?", (sha256,))
+
+    def find_exact(self, sha256: str) -> Optional[Dict]:
+        """
+        같은 내용의 보고서 조회
+
+        Returns:
+            {'sha256', 'name', 'url', 'size', 'duplicate_of', ...} (없으면 None)
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM documents WHERE sha256 = ?", (sha256,)).fetchone()
+        return dict(row) if row else None
+
+    def find_near(self, fingerprint: int, max_distance: int = None, exclude_sha256: str = None) -> Optional[Dict]:
+        """
+        SimHash가 가장 가까운 원본 보고서 조회 (유사 중복으로 등록된 보고서는 제외)
+
+        Args:
+            fingerprint: simhash() 결과
+            max_distance: 최대 해밍 거리 (None이면 설정값, 구간 색인 특성상 3까지)
+            exclude_sha256: 제외할 보고서 해시 (자기 자신)
+
+        Returns:
+            보고서 정보와 'distance' (없으면 None)
+        """
+        max_distance = DEDUPE_SIMHASH_DISTANCE if max_distance is None else max_distance
+        bands = _bands(fingerprint)
+        where = " OR ".join(f"band{i} = ?" for i in range(SIMHASH_BANDS))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT * FROM documents WHERE ({where}) AND duplicate_of IS NULL", bands).fetchall()
+
+        best = None
+        for row in rows:
+            if row['sha256'] == exclude_sha256:
+                continue
+            distance = hamming_distance(fingerprint, row['simhash'] & ((1 << SIMHASH_BITS) - 1))
+            if distance <= max_distance and (best is None or distance < best['distance']):
+                best = dict(row, distance=distance)
+        return best
+
+    def stats(self) -> Dict[str, int]:
+        """등록된 보고서 수와 유사 중복 수"""
+        with self._lock:
+            total, duplicates = self._conn.execute(
+                "SELECT COUNT(*), COUNT(duplicate_of) FROM documents").fetchone()
+        return {'documents': total, 'near_duplicates': duplicates}
@@ -0,0 +1,411 @@
+"""
+추출 결과 내보내기 모듈
+
+추출한 페이지 데이터를 한 번 순회하면서 여러 형식으로 동시에 기록한다.
+
+    text      사람이 읽는 텍스트 파일 (<PDF 이름>.txt, 검색 인덱스와 보고서 생성이 읽는 형식)
+    jsonl     페이지당 JSON 한 줄 (<PDF 이름>.pages.jsonl)
+    csv       표마다 CSV 파일 하나 (<PDF 이름>.tables/p0001_t1.csv)
+    columnar  페이지 텍스트와 표를 열 단위로 담은 바이너리 (<PDF 이름>.columnar, read_columnar()로 읽음)
+
+출력은 페이지 단위로 문자열을 모았다가 EXPORT_CHUNK_SIZE마다 한 번에 인코딩해 기록하고,
+jsonl/csv/columnar는 gzip 또는 zstd(zstandard 설치 시)로 압축할 수 있다.
+"""
+import io
+import csv
+import argparse
+import gzip
+import json
+import struct
+from array import array
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterable, List, Optional, Sequence
+
+from .config import EXPORT_FORMATS, EXPORT_COMPRESSION, EXPORT_CHUNK_SIZE, EXPORT_COMPRESSION_LEVEL
+from . import metrics
+from .table_store import ColumnarTable, to_columnar, le_bytes, read_array
+
+# 형식 이름 -> 파일 이름 접미사 (text는 항상 압축하지 않음)
+FORMAT_SUFFIXES = {
+    'text': '.txt',
+    'jsonl': '.pages.jsonl',
+    'csv': '.tables',
+    'columnar': '.columnar',
+}
+COMPRESSION_SUFFIXES = {None: '', 'gzip': '.gz', 'zstd': '.zst'}
+
+# columnar 파일: 매직, ... 표 블록 ..., 꼬리말, 꼬리말 길이(uint64), 매직
+COLUMNAR_MAGIC = b'CTBX'
+_FOOTER_SIZE = struct.Struct('<Q')
+
+_warned_zstd = False
+
+
+def parse_formats(spec) -> List[str]:
+    """
+    형식 목록 정리 ("text,jsonl" 문자열 또는 리스트)
+
+    Raises:
+        ValueError: 지원하지 않는 형식이 있는 경우
+    """
+    if isinstance(spec, str):
+        spec = spec.split(',')
+    formats = []
+    for name in spec:
+        name = name.strip().lower()
+        if not name:
+            continue
+        if name not in FORMAT_SUFFIXES:
+            raise ValueError(f"지원하지 않는 내보내기 형식: {name} (가능: {', '.join(FORMAT_SUFFIXES)})")
+        if name not in formats:
+            formats.append(name)
+    return formats
+
+
+def resolve_compression(compression: Optional[str]) -> Optional[str]:
+    """
+    압축 방식 확인 (zstandard가 없으면 gzip으로 대체)
+
+    Raises:
+        ValueError: 지원하지 않는 압축 방식인 경우
+    """
+    global _warned_zstd
+    if compression in (None, '', 'none'):
+        return None
+    if compression not in COMPRESSION_SUFFIXES:
+        raise ValueError(f"지원하지 않는 압축 방식: {compression} (가능: none, gzip, zstd)")
+    if compression == 'zstd':
+        try:
+            import zstandard  # noqa: F401
+        except ImportError:
+            if not _warned_zstd:
+                print("[*] zstandard가 없어 gzip으로 압축")
+                _warned_zstd = True
+            return 'gzip'
+    return compression
+
+
+def export_path(base_path: Path, fmt: str, compression: Optional[str] = None) -> Path:
+    """
+    형식별 출력 경로
+
+    Args:
+        base_path: 확장자를 뺀 기준 경로 (예: data/report)
+        fmt: 내보내기 형식
+        compression: 압축 방식 (csv는 디렉토리 안의 파일마다 적용)
+    """
+    suffix = FORMAT_SUFFIXES[fmt]
+    if fmt not in ('text', 'csv'):
+        suffix += COMPRESSION_SUFFIXES[compression]
+    return base_path.with_name(base_path.name + suffix)
+
+
+def open_binary(path: Path, compression: Optional[str] = None, mode: str = 'wb') -> BinaryIO:
+    """압축 방식에 맞춰 바이너리 파일 열기 ('wb' 또는 'rb')"""
+    if compression == 'gzip':
+        return gzip.open(path, mode, compresslevel=EXPORT_COMPRESSION_LEVEL['gzip'])
+    if compression == 'zstd':
+        import zstandard
+        raw = open(path, mode)
+        if mode == 'rb':
+            return zstandard.ZstdDecompressor().stream_reader(raw, closefd=True)
+        return zstandard.ZstdCompressor(level=EXPORT_COMPRESSION_LEVEL['zstd']).stream_writer(raw, closefd=True)
+    return open(path, mode)
+
+
+def _detect_compression(path: Path) -> Optional[str]:
+    for name, suffix in COMPRESSION_SUFFIXES.items():
+        if suffix and path.name.endswith(suffix):
+            return name
+    return None
+
+
+class ChunkWriter:
+    """문자열 조각을 모았다가 chunk_size 글자마다 한 번에 UTF-8로 인코딩해 기록"""
+
+    def __init__(self, path: Path, compression: Optional[str] = None, chunk_size: int = None):
+        self.path = path
+        self.chunk_size = chunk_size or EXPORT_CHUNK_SIZE
+        self._file = open_binary(path, compression)
+        self._parts = []
+        self._pending = 0
+        self.bytes_written = 0
+
+    def write(self, text: str):
+        self._parts.append(text)
+        self._pending += len(text)
+        if self._pending >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        if self._parts:
+            data = ''.join(self._parts).encode('utf-8')
+            self._file.write(data)
+            self.bytes_written += len(data)
+            self._parts = []
+            self._pending = 0
+
+    def close(self):
+        self.flush()
+        self._file.close()
+
+
+def table_rows(table) -> List[List[Optional[str]]]:
+    """표를 행 리스트로 (ColumnarTable 또는 pdfplumber 행 리스트)"""
+    return table.to_rows() if isinstance(table, ColumnarTable) else [list(row) for row in table]
+
+
+def format_text_page(page_data: Dict) -> str:
+    """텍스트 파일의 한 페이지 (페이지 머리말, 본문, 표, 구분선)"""
+    parts = [f"\n[페이지 {page_data['page_num']}]\n", "-" * 80, "\n", page_data['text'], "\n"]
+
+    tables = page_data['tables']
+    if tables:
+        parts.append(f"\n[표 {len(tables)}개 발견]\n")
+        for j, table in enumerate(tables, 1):
+            parts.append(f"\n<표 {j}>\n")
+            if isinstance(table, ColumnarTable):
+                lines = list(table.text_rows())
+            else:
+                lines = [" | ".join([str(cell) if cell else "" for cell in row]) for row in table]
+            if lines:
+                parts.append("\n".join(lines))
+                parts.append("\n")
+
+    parts.append("=" * 80 + "\n")
+    return ''.join(parts)
+
+
+class TextExporter:
+    """사람이 읽는 텍스트 파일 (기존 save_as_text 형식, 압축하지 않음)"""
+
+    def __init__(self, path: Path, total_pages: int, compression: Optional[str] = None):
+        self.path = path
+        self._out = ChunkWriter(path)
+        self._out.write(f"총 페이지 수: {total_pages}\n" + "=" * 80 + "\n")
+
+    def write_page(self, page_data: Dict):
+        self._out.write(format_text_page(page_data))
+
+    def close(self) -> int:
+        self._out.close()
+        return self._out.bytes_written
+
+
+class JsonlExporter:
+    """페이지당 JSON 한 줄: {"page_num", "text", "tables": [[행...]...], "ocr"(OCR 페이지만)}"""
+
+    def __init__(self, path: Path, total_pages: int, compression: Optional[str] = None):
+        self.path = path
+        self._out = ChunkWriter(path, compression)
+
+    def write_page(self, page_data: Dict):
+        record = {
+            'page_num': page_data['page_num'],
+            'text': page_data['text'],
+            'tables': [table_rows(table) for table in page_data['tables']],
+        }
+        if page_data.get('ocr'):
+            record['ocr'] = True
+        self._out.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def close(self) -> int:
+        self._out.close()
+        return self._out.bytes_written
+
+
+class CsvExporter:
+    """표마다 CSV 파일 하나 (<디렉토리>/p<페이지>_t<번호>.csv, 이전 실행의 CSV는 삭제)"""
+
+    def __init__(self, path: Path, total_pages: int, compression: Optional[str] = None):
+        self.path = path
+        self.compression = compression
+        self.bytes_written = 0
+        path.mkdir(parents=True, exist_ok=True)
+        for old in path.glob('p*_t*.csv*'):
+            old.unlink()
+
+    def write_page(self, page_data: Dict):
+        for j, table in enumerate(page_data['tables'], 1):
+            buffer = io.StringIO()
+            csv.writer(buffer, lineterminator='\n').writerows(table_rows(table))
+            data = buffer.getvalue().encode('utf-8')
+            name = f"p{page_data['page_num']:04d}_t{j}.csv" + COMPRESSION_SUFFIXES[self.compression]
+            with open_binary(self.path / name, self.compression) as f:
+                f.write(data)
+            self.bytes_written += len(data)
+
+    def close(self) -> int:
+        return self.bytes_written
+
+
+class ColumnarExporter:
+    """
+    열 단위 바이너리 (Parquet처럼 본문 뒤에 꼬리말을 두는 구조)
+
+    표는 나오는 순서대로 ColumnarTable.to_bytes() 블록으로 기록하고,
+    페이지 번호/OCR 여부/텍스트 열과 표 위치 목록은 닫을 때 꼬리말로 기록한다.
+    """
+
+    def __init__(self, path: Path, total_pages: int, compression: Optional[str] = None):
+        self.path = path
+        self._file = open_binary(path, compression)
+        self._file.write(COLUMNAR_MAGIC)
+        self._offset = len(COLUMNAR_MAGIC)
+        self._pages = array('I')
+        self._ocr = array('B')
+        self._texts = []
+        # 표 위치: 페이지 번호, 페이지 안 번호, 파일 오프셋, 길이
+        self._table_pages = array('I')
+        self._table_indexes = array('I')
+        self._table_offsets = array('Q')
+        self._table_lengths = array('I')
+
+    def write_page(self, page_data: Dict):
+        self._pages.append(page_data['page_num'])
+        self._ocr.append(int(bool(page_data.get('ocr'))))
+        self._texts.append(page_data['text'])
+
+        blobs = [table.to_bytes() for table in to_columnar(page_data['tables'])]
+        for j, blob in enumerate(blobs, 1):
+            self._table_pages.append(page_data['page_num'])
+            self._table_indexes.append(j)
+            self._table_offsets.append(self._offset)
+            self._table_lengths.append(len(blob))
+            self._offset += len(blob)
+        if blobs:
+            self._file.write(b''.join(blobs))
+
+    def close(self) -> int:
+        texts = [text.encode('utf-8') for text in self._texts]
+        footer = [
+            struct.pack('<II', len(self._pages), len(self._table_pages)),
+            le_bytes(self._pages),
+            le_bytes(self._ocr),
+            le_bytes(array('I', [len(text) for text in texts])),
+            b''.join(texts),
+            le_bytes(self._table_pages),
+            le_bytes(self._table_indexes),
+            le_bytes(self._table_offsets),
+            le_bytes(self._table_lengths),
+        ]
+        footer = b''.join(footer)
+        self._file.write(footer + _FOOTER_SIZE.pack(len(footer)) + COLUMNAR_MAGIC)
+        self._file.close()
+        return self._offset + len(footer) + _FOOTER_SIZE.size + len(COLUMNAR_MAGIC)
+
+
+EXPORTERS = {
+    'text': TextExporter,
+    'jsonl': JsonlExporter,
+    'csv': CsvExporter,
+    'columnar': ColumnarExporter,
+}
+
+
+def export_pages(pages_data: Iterable[Dict], base_path: Path, formats: Sequence[str] = None,
+                 compression: str = None, total_pages: int = None) -> Dict[str, Path]:
+    """
+    페이지 데이터를 한 번 순회하면서 여러 형식으로 기록
+
+    Args:
+        pages_data: 페이지별 데이터 (리스트 또는 iter_pages 이터레이터)
+        base_path: 확장자를 뺀 기준 경로 (예: data/report -> data/report.txt, data/report.pages.jsonl)
+        formats: 내보내기 형식 목록 (None이면 설정값)
+        compression: jsonl/csv/columnar 압축 방식 (None, 'gzip', 'zstd', 기본값은 설정값)
+        total_pages: 총 페이지 수 (이터레이터를 넘길 때 필요, None이면 len(pages_data))
+
+    Returns:
+        형식 -> 출력 경로
+    """
+    formats = parse_formats(EXPORT_FORMATS if formats is None else formats)
+    compression = resolve_compression(EXPORT_COMPRESSION if compression is None else compression)
+    if total_pages is None:
+        total_pages = len(pages_data)
+
+    paths = {fmt: export_path(base_path, fmt, compression) for fmt in formats}
+    with metrics.stage('export') as counters:
+        exporters = []
+        try:
+            for fmt in formats:
+                exporters.append(EXPORTERS[fmt](paths[fmt], total_pages, None if fmt == 'text' else compression))
+            for page_data in pages_data:
+                for exporter in exporters:
+                    exporter.write_page(page_data)
+                counters['items'] += 1
+        finally:
+            for exporter in exporters:
+                counters['bytes'] += exporter.close()
+    return paths
+
+
+def read_columnar(path: Path) -> Dict:
+    """
+    columnar 파일 읽기
+
+    Args:
+        path: .columnar 파일 경로 (.gz/.zst는 압축을 풀어 읽음)
+
+    Returns:
+        {'page_num': array('I'), 'ocr': array('B'), 'text': [str], 'tables': [(페이지 번호, 번호, ColumnarTable)]}
+
+    Raises:
+        ValueError: 형식이 맞지 않는 경우
+    """
+    with open_binary(path, _detect_compression(path), 'rb') as f:
+        view = memoryview(f.read())
+    if bytes(view[:4]) != COLUMNAR_MAGIC or bytes(view[-4:]) != COLUMNAR_MAGIC:
+        raise ValueError(f"columnar 형식이 아님: {path}")
+    (footer_size,) = _FOOTER_SIZE.unpack_from(view, len(view) - 4 - _FOOTER_SIZE.size)
+    offset = len(view) - 4 - _FOOTER_SIZE.size - footer_size
+
+    npages, ntables = struct.unpack_from('<II', view, offset)
+    offset += 8
+    pages, offset = read_array('I', view, offset, npages)
+    ocr, offset = read_array('B', view, offset, npages)
+    lengths, offset = read_array('I', view, offset, npages)
+    texts = []
+    for length in lengths:
+        texts.append(str(view[offset:offset + length], 'utf-8'))
+        offset += length
+    table_pages, offset = read_array('I', view, offset, ntables)
+    table_indexes, offset = read_array('I', view, offset, ntables)
+    table_offsets, offset = read_array('Q', view, offset, ntables)
+    table_lengths, offset = read_array('I', view, offset, ntables)
+
+    tables = [(page, index, ColumnarTable.from_bytes(view[start:start + length]))
+              for page, index, start, length in zip(table_pages, table_indexes, table_offsets, table_lengths)]
+    return {'page_num': pages, 'ocr': ocr, 'text': texts, 'tables': tables}
+
+
+def main(argv: List[str] = None):
+    """추출 결과 내보내기 명령 (python -m src export)"""
+    parser = argparse.ArgumentParser(description="AI Report - 추출 결과 내보내기")
+    parser.add_argument("pdfs", nargs="+", help="PDF 파일 경로")
+    parser.add_argument("--format", default=",".join(EXPORT_FORMATS),
+                        help=f"내보내기 형식 (쉼표로 구분, 가능: {', '.join(FORMAT_SUFFIXES)})")
+    parser.add_argument("--compress", choices=["none", "gzip", "zstd"], default=EXPORT_COMPRESSION or "none",
+                        help="jsonl/csv/columnar 압축 방식")
+    parser.add_argument("--workers", type=int, default=None, help="PDF 병렬 추출 프로세스 수")
+    parser.add_argument("--no-cache", action="store_true", help="추출 캐시를 사용하지 않고 항상 다시 파싱")
+
+    args = parser.parse_args(argv)
+    formats = parse_formats(args.format)
+
+    # 추출 캐시가 있으면 PDF를 다시 파싱하지 않음
+    from .extract_cache import ExtractionCache
+    from .ocr import create_ocr_pool
+    from .pdf_downloader import PDFDownloader
+
+    for pdf in args.pdfs:
+        pdf_path = Path(pdf)
+        downloader = PDFDownloader(pdf_path.parent, workers=args.workers,
+                                   cache=None if args.no_cache else ExtractionCache(), ocr=create_ocr_pool())
+        pages_data, _ = downloader.extract_cached(pdf_path)
+        paths = export_pages(pages_data, pdf_path.with_suffix(''), formats, args.compress)
+        for fmt, path in paths.items():
+            print(f"[OK] {fmt}: {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+PDF 추출 결과 캐시 모듈
+
+PDF 바이트의 SHA-256, pdfplumber 버전, 추출 설정을 키로 pages_data를 저장한다.
+"""
+import os
+import json
+import mmap
+import zlib
+import pickle
+import hashlib
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .config import EXTRACT_CACHE_DIR, EXTRACT_CACHE_MAX_BYTES
+from .file_io import open_mapped
+
+CACHE_SUFFIX = ".bin"
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def file_sha256(path: Path) -> str:
+    """
+    파일 내용의 SHA-256 해시 계산
+
+    Args:
+        path: 파일 경로
+
+    Returns:
+        16진수 해시 문자열
+    """
+    digest = hashlib.sha256()
+    with open_mapped(path) as buffer:
+        if isinstance(buffer, mmap.mmap):
+            # 매핑된 페이지를 바로 해시 (읽기 버퍼 복사 없음)
+            digest.update(buffer)
+        else:
+            for chunk in iter(lambda: buffer.read(HASH_CHUNK_SIZE), b''):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ExtractionCache:
+    """크기 제한이 있는 LRU 추출 결과 캐시"""
+
+    def __init__(self, cache_dir: Path = None, max_bytes: int = None):
+        self.cache_dir = cache_dir or EXTRACT_CACHE_DIR
+        self.max_bytes = max_bytes if max_bytes is not None else EXTRACT_CACHE_MAX_BYTES
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def make_key(self, pdf_path: Path, settings: Dict = None, sha256: str = None) -> str:
+        """
+        캐시 키 생성
+
+        Args:
+            pdf_path: PDF 파일 경로
+            settings: 추출 결과에 영향을 주는 설정
+            sha256: PDF 해시 (None이면 계산)
+
+        Returns:
+            캐시 키
+        """
+        import pdfplumber
+
+        key_source = json.dumps({
+            'pdf_sha256': sha256 or file_sha256(pdf_path),
+            'pdfplumber': pdfplumber.__version__,
+            'settings': settings or {},
+        }, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(key_source.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[List[Dict]]:
+        """
+        캐시에서 pages_data 조회
+
+        Args:
+            key: 캐시 키
+
+        Returns:
+            페이지별 데이터 (없거나 손상되었으면 None)
+        """
+        entry_path = self._entry_path(key)
+        try:
+            with open(entry_path, 'rb') as f:
+                pages_data = pickle.loads(zlib.decompress(f.read()))
+        except FileNotFoundError:
+            return None
+        except (zlib.error, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            # 손상된 항목이나 더 이상 없는 클래스/모듈을 참조하는 이전 버전 항목은 캐시 미스로 처리
+            entry_path.unlink(missing_ok=True)
+            return None
+
+        # 최근 사용 시각 갱신 (LRU)
+        os.utime(entry_path)
+        return pages_data
+
+    def put(self, key: str, pages_data: List[Dict]):
+        """
+        pages_data를 캐시에 저장하고 용량 초과분 정리
+
+        Args:
+            key: 캐시 키
+            pages_data: 페이지별 데이터
+        """
+        payload = zlib.compress(pickle.dumps(pages_data, protocol=pickle.HIGHEST_PROTOCOL))
+        entry_path = self._entry_path(key)
+        # 같은 키를 여러 스레드/프로세스가 동시에 기록해도 임시 파일이 겹치지 않도록 고유한 이름 사용
+        fd, tmp_name = tempfile.mkstemp(prefix=f"{key}.", suffix=".tmp", dir=self.cache_dir)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(payload)
+            os.replace(tmp_name, entry_path)
+        except BaseException:
+            os.unlink(tmp_name)
+            raise
+
+        self._evict()
+
+    def clear(self):
+        """캐시 전체 삭제"""
+        for entry_path in self.cache_dir.glob(f"*{CACHE_SUFFIX}"):
+            entry_path.unlink(missing_ok=True)
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}{CACHE_SUFFIX}"
+
+    def _evict(self):
+        """최근 사용 시각이 오래된 항목부터 삭제하여 max_bytes 이하로 유지"""
+        entries = []
+        for entry_path in self.cache_dir.glob(f"*{CACHE_SUFFIX}"):
+            try:
+                stat = entry_path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry_path))
+
+        total_bytes = sum(size for _, size, _ in entries)
+        for _, size, entry_path in sorted(entries):
+            if total_bytes <= self.max_bytes:
+                break
+            entry_path.unlink(missing_ok=True)
+            total_bytes -= size
@@ -0,0 +1,155 @@
+"""
+대용량 파일 입출력 모듈
+
+PDF를 읽기 전용 mmap으로 열어 사용자 공간 버퍼 복사 없이 페이지 캐시를 직접 읽고,
+같은 파일을 여는 추출 프로세스들이 물리 메모리를 공유하도록 한다.
+파일 복제는 reflink(FICLONE) -> copy_file_range -> sendfile -> 일반 복사 순으로 시도하여
+가능하면 데이터를 사용자 공간으로 옮기지 않는다.
+"""
+import os
+import mmap
+import shutil
+from contextlib import contextmanager
+from pathlib import Path
+from typing import BinaryIO, Iterator, Union
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+from .config import USE_MMAP
+
+# Linux ioctl FICLONE (_IOW(0x94, 9, int)): Btrfs, XFS, OCFS2 등에서 블록을 공유하는 복제
+FICLONE = 0x40049409
+COPY_CHUNK_SIZE = 64 * 1024 * 1024
+
+
+@contextmanager
+def open_mapped(path: Path, use_mmap: bool = None) -> Iterator[Union[mmap.mmap, BinaryIO]]:
+    """
+    파일을 읽기 전용 mmap으로 열기
+
+    mmap은 read/seek/tell을 지원하므로 pdfplumber, hashlib에 파일 객체 대신 넘길 수 있다.
+    빈 파일이거나 mmap을 사용할 수 없으면 일반 파일 객체를 반환한다.
+
+    Args:
+        path: 파일 경로
+        use_mmap: mmap 사용 여부 (None이면 설정값)
+
+    Yields:
+        mmap 또는 파일 객체
+    """
+    use_mmap = USE_MMAP if use_mmap is None else use_mmap
+    with open(path, 'rb') as f:
+        buffer = None
+        if use_mmap:
+            try:
+                buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError):
+                # 빈 파일, 특수 파일 등
+                buffer = None
+        if buffer is None:
+            yield f
+            return
+        try:
+            yield buffer
+        finally:
+            buffer.close()
+
+
+@contextmanager
+def file_lock(lock_path: Path) -> Iterator[None]:
+    """
+    다른 프로세스와 공유하는 배타적 파일 잠금 (fcntl이 없으면 잠그지 않음)
+
+    Args:
+        lock_path: 잠금 파일 경로 (없으면 생성)
+    """
+    if fcntl is None:
+        yield
+        return
+    with open(lock_path, 'a') as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def clone_file(src: Path, dst: Path) -> str:
+    """
+    파일 복제 (메타데이터 포함, shutil.copy2 대체)
+
+    Args:
+        src: 원본 파일
+        dst: 대상 파일 (존재하면 덮어씀)
+
+    Returns:
+        사용한 방식 ('reflink', 'copy_file_range', 'sendfile', 'copy')
+    """
+    method = None
+    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        size = os.fstat(fsrc.fileno()).st_size
+        for name, func in (('reflink', _reflink), ('copy_file_range', _copy_file_range), ('sendfile', _sendfile)):
+            try:
+                if func(fsrc.fileno(), fdst.fileno(), size):
+                    method = name
+                    break
+            except OSError:
+                # 지원하지 않는 파일시스템 또는 파일 종류
+                pass
+            # 부분 기록을 되돌리고 다음 방식 시도
+            fdst.seek(0)
+            fdst.truncate()
+        if method is None:
+            fsrc.seek(0)
+            shutil.copyfileobj(fsrc, fdst, COPY_CHUNK_SIZE)
+            method = 'copy'
+    shutil.copystat(src, dst)
+    return method
+
+
+def link_or_clone(src: Path, dst: Path) -> str:
+    """
+    하드링크를 만들고, 다른 파일시스템이거나 지원하지 않으면 clone_file로 복제
+
+    Returns:
+        사용한 방식 ('hardlink' 또는 clone_file의 반환값)
+    """
+    try:
+        os.link(src, dst)
+        return 'hardlink'
+    except OSError:
+        return clone_file(src, dst)
+
+
+def _reflink(src_fd: int, dst_fd: int, size: int) -> bool:
+    if fcntl is None or not hasattr(fcntl, 'ioctl') or not size:
+        return False
+    fcntl.ioctl(dst_fd, FICLONE, src_fd)
+    return True
+
+
+def _copy_file_range(src_fd: int, dst_fd: int, size: int) -> bool:
+    if not hasattr(os, 'copy_file_range'):
+        return False
+    copied = 0
+    while copied < size:
+        sent = os.copy_file_range(src_fd, dst_fd, min(COPY_CHUNK_SIZE, size - copied), copied, copied)
+        if not sent:
+            break
+        copied += sent
+    return copied == size
+
+
+def _sendfile(src_fd: int, dst_fd: int, size: int) -> bool:
+    if not hasattr(os, 'sendfile'):
+        return False
+    copied = 0
+    while copied < size:
+        sent = os.sendfile(dst_fd, src_fd, copied, min(COPY_CHUNK_SIZE, size - copied))
+        if not sent:
+            break
+        copied += sent
+    return copied == size
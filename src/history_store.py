@@ -0,0 +1,346 @@
+"""
+보고서 간 시계열 저장소 모듈
+
+보고서마다 추출한 종목 지표(PER, PBR, OP 3M 변화, 배당수익률, 목표가 1M 변화)와 MSCI 편입/편출 예상을
+보고서 날짜, 종목명으로 색인해 SQLite 파일에 누적한다. 주간 보고서를 다시 파싱하지 않고
+종목별 지표 추이와 여러 종목의 주간 비교를 바로 조회할 수 있다.
+
+시계열은 숫자 열을 array('d')로 반환하며 값이 없는 주는 NaN이다 (numpy.asarray로 복사 없이 변환 가능).
+"""
+import re
+import json
+import math
+import sqlite3
+import argparse
+from array import array
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from .config import DATA_DIR, HISTORY_STORE_PATH
+from .build_manifest import hash_data
+
+# 저장하는 종목 지표 (report_data['top_stocks']의 키)
+STOCK_METRICS = ("per", "pbr", "op_3m", "dividend", "target_1m")
+
+DATE_PATTERN = re.compile(r'(\d{4})\s*[.\-/년]\s*(\d{1,2})\s*[.\-/월]\s*(\d{1,2})')
+# 날짜가 본문에서 추출되지 않은 경우 파일명의 YYMMDD (예: EDIT_Quant_Weekly_260121.pdf)
+FILENAME_DATE_PATTERN = re.compile(r'(?<!\d)(\d{2})(\d{2})(\d{2})(?!\d)')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS reports (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    report_date TEXT NOT NULL,  -- YYYY-MM-DD
+    title TEXT,
+    url TEXT,
+    data_hash TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS reports_date ON reports(report_date);
+CREATE TABLE IF NOT EXISTS stock_metrics (
+    stock TEXT NOT NULL,
+    report_date TEXT NOT NULL,
+    report_id INTEGER NOT NULL REFERENCES reports(id),
+    per REAL,
+    pbr REAL,
+    op_3m REAL,
+    dividend REAL,
+    target_1m REAL,
+    PRIMARY KEY (stock, report_date, report_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS stock_metrics_date ON stock_metrics(report_date);
+CREATE TABLE IF NOT EXISTS msci_entries (
+    stock TEXT NOT NULL,
+    report_date TEXT NOT NULL,
+    report_id INTEGER NOT NULL REFERENCES reports(id),
+    kind TEXT NOT NULL,  -- new: 편입 예상, removal: 편출 예상
+    probability TEXT,
+    PRIMARY KEY (stock, report_date, report_id, kind)
+) WITHOUT ROWID;
+"""
+
+
+def normalize_date(report_data: Dict, name: str = "") -> str:
+    """
+    보고서 날짜를 YYYY-MM-DD로 변환 (본문 날짜가 없으면 파일명의 YYMMDD 사용)
+
+    Args:
+        report_data: 보고서 데이터
+        name: 보고서 파일명
+
+    Returns:
+        날짜 문자열 (알 수 없으면 빈 문자열)
+    """
+    match = DATE_PATTERN.search(str(report_data.get('date') or ''))
+    if match:
+        year, month, day = match.groups()
+    else:
+        match = FILENAME_DATE_PATTERN.search(name)
+        if not match:
+            return ""
+        year, month, day = f"20{match.group(1)}", match.group(2), match.group(3)
+    if not (1 <= int(month) <= 12 and 1 <= int(day) <= 31):
+        return ""
+    return f"{int(year):04d}-{int(month):02d}-{int(day):02d}"
+
+
+def _to_float(value) -> Optional[float]:
+    if value is None or value == '':
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class HistoryStore:
+    """종목 지표/MSCI 예상의 보고서 날짜별 저장소"""
+
+    def __init__(self, path: Path = None):
+        self.path = path or HISTORY_STORE_PATH
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+
+    def close(self):
+        """데이터베이스 연결 종료"""
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def add_report(self, name: str, report_data: Dict, url: str = None) -> bool:
+        """
+        보고서의 종목 지표와 MSCI 예상 추가 (같은 보고서가 같은 내용으로 있으면 생략, 바뀌었으면 교체)
+
+        Args:
+            name: 보고서 이름 (PDF 파일명)
+            report_data: 보고서 데이터
+            url: 원본 URL
+
+        Returns:
+            새로 저장했으면 True
+        """
+        report_date = normalize_date(report_data, name)
+        if not report_date:
+            print(f"[WARN] 보고서 날짜를 알 수 없어 시계열에 저장하지 않음: {name}")
+            return False
+
+        data_hash = hash_data(report_data)
+        stock_rows = []
+        for stock in report_data.get('top_stocks', []):
+            if stock.get('name'):
+                stock_rows.append((stock['name'], report_date)
+                                  + tuple(_to_float(stock.get(metric)) for metric in STOCK_METRICS))
+        msci = report_data.get('msci_review') or {}
+        msci_rows = [(entry['name'], report_date, kind, entry.get('probability'))
+                     for kind, key in (('new', 'new_entries'), ('removal', 'removals'))
+                     for entry in msci.get(key, []) if entry.get('name')]
+
+        with self._conn:
+            row = self._conn.execute("SELECT id, data_hash FROM reports WHERE name = ?", (name,)).fetchone()
+            if row and row[1] == data_hash:
+                return False
+            if row:
+                self._delete_report(row[0])
+
+            report_id = self._conn.execute(
+                "INSERT INTO reports (name, report_date, title, url, data_hash) VALUES (?, ?, ?, ?, ?)",
+                (name, report_date, report_data.get('title'), url, data_hash)).lastrowid
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO stock_metrics (stock, report_date, report_id, {', '.join(STOCK_METRICS)}) "
+                f"VALUES (?, ?, {report_id}, {', '.join('?' * len(STOCK_METRICS))})",
+                stock_rows)
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO msci_entries (stock, report_date, report_id, kind, probability) "
+                f"VALUES (?, ?, {report_id}, ?, ?)",
+                msci_rows)
+        return True
+
+    def remove_report(self, name: str):
+        """보고서와 그 보고서의 지표 삭제"""
+        with self._conn:
+            row = self._conn.execute("SELECT id FROM reports WHERE name = ?", (name,)).fetchone()
+            if row:
+                self._delete_report(row[0])
+
+    def _delete_report(self, report_id: int):
+        self._conn.execute("DELETE FROM stock_metrics WHERE report_id = ?", (report_id,))
+        self._conn.execute("DELETE FROM msci_entries WHERE report_id = ?", (report_id,))
+        self._conn.execute("DELETE FROM reports WHERE id = ?", (report_id,))
+
+    def series(self, stock: str, metrics: Sequence[str] = STOCK_METRICS, start: str = None,
+               end: str = None) -> Dict:
+        """
+        종목 하나의 지표 시계열
+
+        Args:
+            stock: 종목명
+            metrics: 조회할 지표 (STOCK_METRICS 중)
+            start: 시작 날짜 (YYYY-MM-DD, 포함)
+            end: 끝 날짜 (YYYY-MM-DD, 포함)
+
+        Returns:
+            {'stock', 'dates', 'reports', 지표: array('d')} (날짜순, 값이 없으면 NaN)
+        """
+        metrics = _check_metrics(metrics)
+        where, params = _date_range("m.report_date", start, end)
+        rows = self._conn.execute(
+            f"SELECT m.report_date, r.name, {', '.join('m.' + metric for metric in metrics)} "
+            f"FROM stock_metrics m JOIN reports r ON r.id = m.report_id "
+            f"WHERE m.stock = ?{where} ORDER BY m.report_date, m.report_id",
+            (stock, *params)).fetchall()
+
+        result = {'stock': stock, 'dates': [row[0] for row in rows], 'reports': [row[1] for row in rows]}
+        for i, metric in enumerate(metrics, 2):
+            result[metric] = array('d', (math.nan if row[i] is None else row[i] for row in rows))
+        return result
+
+    def panel(self, metric: str, stocks: Sequence[str] = None, start: str = None, end: str = None) -> Dict:
+        """
+        여러 종목의 한 지표를 보고서 날짜에 맞춰 정렬한 표 (주간 비교용)
+
+        같은 날짜에 보고서가 여러 개면 나중에 저장한 보고서의 값을 사용한다.
+
+        Args:
+            metric: 지표 (STOCK_METRICS 중)
+            stocks: 종목명 리스트 (None이면 기간 안의 모든 종목)
+            start: 시작 날짜 (YYYY-MM-DD, 포함)
+            end: 끝 날짜 (YYYY-MM-DD, 포함)
+
+        Returns:
+            {'metric', 'dates', 'stocks', 'values': {종목명: array('d')}} (dates 순서, 값이 없으면 NaN)
+        """
+        _check_metrics([metric])
+        date_where, date_params = _date_range("report_date", start, end)
+        where, params = date_where, list(date_params)
+        if stocks is not None:
+            stocks = list(dict.fromkeys(stocks))
+            where += f" AND stock IN ({', '.join('?' * len(stocks))})"
+            params += stocks
+        dates = [row[0] for row in self._conn.execute(
+            f"SELECT DISTINCT report_date FROM reports WHERE 1 = 1{date_where} ORDER BY report_date", date_params)]
+        rows = self._conn.execute(
+            f"SELECT stock, report_date, {metric} FROM stock_metrics WHERE 1 = 1{where} "
+            f"ORDER BY report_date, report_id", params).fetchall()
+
+        position = {date: i for i, date in enumerate(dates)}
+        names = stocks if stocks is not None else sorted({row[0] for row in rows})
+        values = {name: array('d', [math.nan]) * len(dates) for name in names}
+        for name, date, value in rows:
+            if value is not None:
+                values[name][position[date]] = value
+        return {'metric': metric, 'dates': dates, 'stocks': names, 'values': values}
+
+    def msci_history(self, stock: str) -> List[Dict]:
+        """
+        종목의 MSCI 편입/편출 예상 이력
+
+        Returns:
+            [{'date', 'report', 'kind', 'probability'}] (날짜순)
+        """
+        rows = self._conn.execute(
+            "SELECT e.report_date, r.name, e.kind, e.probability FROM msci_entries e "
+            "JOIN reports r ON r.id = e.report_id WHERE e.stock = ? ORDER BY e.report_date, e.report_id",
+            (stock,)).fetchall()
+        return [{'date': date, 'report': report, 'kind': kind, 'probability': probability}
+                for date, report, kind, probability in rows]
+
+    def stocks(self) -> List[str]:
+        """저장된 종목명 (가나다순)"""
+        return [row[0] for row in self._conn.execute("SELECT DISTINCT stock FROM stock_metrics ORDER BY stock")]
+
+    def stats(self) -> Dict[str, object]:
+        """저장된 보고서 수, 종목 수, 기간"""
+        reports, first, last = self._conn.execute(
+            "SELECT COUNT(*), MIN(report_date), MAX(report_date) FROM reports").fetchone()
+        stocks = self._conn.execute("SELECT COUNT(DISTINCT stock) FROM stock_metrics").fetchone()[0]
+        return {'reports': reports, 'stocks': stocks, 'first_date': first, 'last_date': last}
+
+
+def _check_metrics(metrics: Sequence[str]) -> List[str]:
+    unknown = [metric for metric in metrics if metric not in STOCK_METRICS]
+    if unknown:
+        raise ValueError(f"지원하지 않는 지표: {', '.join(unknown)} (가능: {', '.join(STOCK_METRICS)})")
+    return list(metrics)
+
+
+def _date_range(column: str, start: Optional[str], end: Optional[str]):
+    """기간 조건 SQL 조각과 파라미터"""
+    where, params = "", []
+    if start:
+        where += f" AND {column} >= ?"
+        params.append(start)
+    if end:
+        where += f" AND {column} <= ?"
+        params.append(end)
+    return where, params
+
+
+def import_data_dir(store: HistoryStore, data_dir: Path = None) -> int:
+    """
+    데이터 디렉토리의 보고서 데이터 파일(<PDF 이름>.report.json)을 모두 저장 (PDF를 다시 파싱하지 않음)
+
+    Args:
+        store: 시계열 저장소
+        data_dir: 데이터 디렉토리
+
+    Returns:
+        새로 저장한 보고서 수
+    """
+    data_dir = data_dir or DATA_DIR
+    added = 0
+    for json_path in sorted(data_dir.glob("*.report.json")):
+        with open(json_path, 'r', encoding='utf-8') as f:
+            report_data = json.load(f)
+        name = json_path.name[:-len(".report.json")] + ".pdf"
+        added += store.add_report(name, report_data)
+    return added
+
+
+def _format_value(value: float) -> str:
+    return "-" if math.isnan(value) else f"{value:g}"
+
+
+def main(argv: List[str] = None):
+    """시계열 조회 명령 (python -m src history)"""
+    parser = argparse.ArgumentParser(description="AI Report - 종목 지표 시계열")
+    parser.add_argument("stocks", nargs="*", help="종목명 (하나면 전체 지표, 여러 개면 --metric 비교)")
+    parser.add_argument("--metric", choices=STOCK_METRICS, default="per", help="여러 종목 비교 시 지표")
+    parser.add_argument("--from", dest="start", default=None, help="시작 날짜 (YYYY-MM-DD)")
+    parser.add_argument("--to", dest="end", default=None, help="끝 날짜 (YYYY-MM-DD)")
+    parser.add_argument("--import-dir", action="store_true",
+                        help="데이터 디렉토리의 기존 .report.json을 저장 (PDF를 다시 파싱하지 않음)")
+
+    args = parser.parse_args(argv)
+
+    with HistoryStore() as store:
+        if args.import_dir:
+            print(f"[OK] 새로 저장한 보고서: {import_data_dir(store)}건")
+
+        if len(args.stocks) == 1:
+            data = store.series(args.stocks[0], start=args.start, end=args.end)
+            print(f"{'날짜':<12}" + "".join(f"{metric:>10}" for metric in STOCK_METRICS))
+            for i, date in enumerate(data['dates']):
+                print(f"{date:<12}" + "".join(f"{_format_value(data[metric][i]):>10}" for metric in STOCK_METRICS))
+            for entry in store.msci_history(args.stocks[0]):
+                kind = "편입" if entry['kind'] == 'new' else "편출"
+                print(f"[*] {entry['date']} MSCI {kind} 예상 ({entry['probability']})")
+            print(f"[OK] {len(data['dates'])}건")
+        elif args.stocks:
+            data = store.panel(args.metric, args.stocks, start=args.start, end=args.end)
+            print(f"{args.metric:<12}" + "".join(f"{name:>12}" for name in data['stocks']))
+            for i, date in enumerate(data['dates']):
+                print(f"{date:<12}" + "".join(f"{_format_value(data['values'][name][i]):>12}"
+                                              for name in data['stocks']))
+        elif not args.import_dir:
+            stats = store.stats()
+            print(f"[*] 보고서 {stats['reports']}건, 종목 {stats['stocks']}개 "
+                  f"({stats['first_date'] or '-'} ~ {stats['last_date'] or '-'})")
+
+
+if __name__ == "__main__":
+    main()
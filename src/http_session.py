@@ -0,0 +1,60 @@
+"""
+HTTP 세션 생성 모듈
+
+연결 풀과 SSL 검증 설정을 가진 requests 세션을 만든다.
+회사 환경의 SSL 우회 모듈은 import 시점이 아니라 세션을 만들 때 설정에 따라 불러온다.
+"""
+import os
+import sys
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .config import BATCH_CONCURRENCY, SSL_VERIFY, USE_SSL_BYPASS, SSL_BYPASS_PATH
+
+_ssl_bypass_loaded = False
+
+
+def create_session(pool_size: int = BATCH_CONCURRENCY, verify=None) -> requests.Session:
+    """
+    연결을 재사용하는 requests 세션 생성
+
+    Args:
+        pool_size: 호스트당 유지할 최대 연결 수
+        verify: SSL 인증서 검증 (True/False 또는 CA 번들 경로, None이면 설정값)
+
+    Returns:
+        HTTP/HTTPS 어댑터가 설정된 세션
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.verify = SSL_VERIFY if verify is None else verify
+
+    if USE_SSL_BYPASS:
+        load_ssl_bypass()
+    return session
+
+
+def load_ssl_bypass() -> bool:
+    """
+    회사 환경 SSL 우회 모듈(SSL_BYPASS_PATH/utils/ssl_bypass.py) 로드
+
+    경로가 없는 환경(Linux 작업 서버 등)에서는 아무 것도 하지 않는다.
+
+    Returns:
+        우회 모듈이 로드되었으면 True
+    """
+    global _ssl_bypass_loaded
+    if _ssl_bypass_loaded:
+        return True
+    if not os.path.isdir(SSL_BYPASS_PATH):
+        return False
+
+    if SSL_BYPASS_PATH not in sys.path:
+        sys.path.append(SSL_BYPASS_PATH)
+    import utils.ssl_bypass  # noqa: F401
+
+    _ssl_bypass_loaded = True
+    return True
@@ -0,0 +1,756 @@
+"""
+재개 가능한 수집 작업 대기열 모듈
+
+URL마다 report 작업, 큰 PDF는 페이지 범위마다 chunk 작업을 SQLite 파일에 기록한다.
+작업자는 작업을 일정 시간 임대(lease)하고, 추출을 마친 청크는 결과를 체크포인트로 저장한다.
+실행이 중단되거나 취소되어도 다시 실행하면 끝난 청크는 건너뛰고 남은 작업부터 처리한다.
+
+    report  다운로드(.part 이어받기) -> 중복/캐시 확인 -> 청크 작업 생성 -> 청크가 모두 끝나면 조립 후 저장
+    chunk   페이지 범위 추출 -> 체크포인트 저장 -> 마지막 청크면 report 작업을 다시 대기 상태로
+
+실패한 작업은 지수 백오프로 재시도하고, JOB_MAX_ATTEMPTS번 실패하면 dead 상태로 보류한다.
+"""
+import os
+import json
+import time
+import zlib
+import pickle
+import socket
+import sqlite3
+import argparse
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import requests
+
+from .config import (DATA_DIR, JOB_QUEUE_PATH, JOB_WORKERS, JOB_EXTRACT_WORKERS, JOB_CHUNK_PAGES,
+                     JOB_LEASE_SECONDS, JOB_MAX_ATTEMPTS, JOB_RETRY_BACKOFF, JOB_POLL_INTERVAL,
+                     USE_EXTRACT_CACHE, USE_SEARCH_INDEX, USE_DEDUPE)
+from . import metrics
+from .batch_ingest import _is_retryable, read_url_file
+from .build_manifest import hash_data
+from .dedupe import DedupeIndex
+from .extract_cache import ExtractionCache
+from .ocr import create_ocr_pool
+from .pdf_downloader import PDFDownloader, pdf_sha256, _extract_page_range, _record_extract_metrics
+from .search_index import SearchIndex
+
+# 작업 상태
+PENDING, LEASED, WAITING, DONE, DEAD = 'pending', 'leased', 'waiting', 'done', 'dead'
+JOB_STATUSES = (PENDING, LEASED, WAITING, DONE, DEAD)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,  -- report: URL 하나, chunk: 페이지 범위 추출
+    key TEXT NOT NULL UNIQUE,  -- report는 URL, chunk는 <report id>:<PDF/설정 해시>:<페이지 범위>
+    parent_id INTEGER REFERENCES jobs(id),
+    payload TEXT NOT NULL,  -- JSON
+    status TEXT NOT NULL,  -- pending, leased, waiting(청크 대기), done, dead
+    attempts INTEGER NOT NULL DEFAULT 0,
+    lease_owner TEXT,  -- <호스트>:<pid>:<스레드 번호>
+    lease_expires REAL,
+    available_at REAL NOT NULL DEFAULT 0,  -- 재시도 대기 중이면 이 시각 이후에 임대
+    last_error TEXT,
+    result TEXT,  -- JSON
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs(status, available_at);
+CREATE INDEX IF NOT EXISTS jobs_parent ON jobs(parent_id);
+CREATE TABLE IF NOT EXISTS checkpoints (
+    job_id INTEGER PRIMARY KEY REFERENCES jobs(id),
+    data BLOB NOT NULL  -- zlib(pickle(페이지 데이터 리스트))
+);
+"""
+
+
+class ChunkFailed(Exception):
+    """report 작업의 청크 중 dead 상태인 청크가 있음"""
+
+
+class JobQueue:
+    """SQLite 기반 작업 대기열 (여러 스레드/프로세스가 함께 사용)"""
+
+    def __init__(self, path: Path = None, max_attempts: int = None, backoff: float = None):
+        """
+        Args:
+            path: 데이터베이스 파일 경로
+            max_attempts: 작업당 최대 시도 횟수 (넘으면 dead)
+            backoff: 재시도 대기 시간 기본값 (초, 실패할 때마다 2배)
+        """
+        self.path = path or JOB_QUEUE_PATH
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_attempts = max_attempts or JOB_MAX_ATTEMPTS
+        self.backoff = backoff if backoff is not None else JOB_RETRY_BACKOFF
+        self._lock = threading.Lock()
+        # 트랜잭션은 BEGIN IMMEDIATE로 직접 시작 (다른 프로세스와 임대가 겹치지 않도록)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+
+    def close(self):
+        """데이터베이스 연결 종료"""
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _transaction(self):
+        return _Transaction(self._lock, self._conn)
+
+    def submit(self, urls: Sequence[str], retry_dead: bool = False) -> int:
+        """
+        URL을 report 작업으로 추가
+
+        이미 있는 URL은 그대로 두어 중단된 작업을 이어서 실행하고,
+        완료된 URL은 새 실행으로 다시 대기시킨다 (변경이 없으면 304와 추출 캐시로 바로 끝남).
+
+        Args:
+            urls: PDF URL 목록
+            retry_dead: dead 상태인 URL도 다시 대기시킬지 여부
+
+        Returns:
+            새로 추가하거나 다시 대기시킨 작업 수
+        """
+        now = time.time()
+        count = 0
+        with self._transaction() as conn:
+            for url in urls:
+                row = conn.execute("SELECT id, status FROM jobs WHERE key = ?", (url,)).fetchone()
+                if row is None:
+                    conn.execute(
+                        "INSERT INTO jobs (kind, key, payload, status, created_at, updated_at) "
+                        "VALUES ('report', ?, ?, ?, ?, ?)",
+                        (url, json.dumps({'url': url}), PENDING, now, now))
+                    count += 1
+                elif row['status'] == DONE:
+                    self._delete_children(conn, row['id'])
+                    self._reset(conn, "id = ?", (row['id'],), now)
+                    count += 1
+                elif row['status'] == DEAD and retry_dead:
+                    self._reset(conn, "id = ? OR (parent_id = ? AND status = 'dead')", (row['id'], row['id']), now)
+                    count += 1
+        return count
+
+    def retry_dead(self) -> int:
+        """
+        dead 상태인 작업을 모두 다시 대기시킴 (끝난 청크의 체크포인트는 유지)
+
+        Returns:
+            다시 대기시킨 작업 수
+        """
+        with self._transaction() as conn:
+            return self._reset(conn, "status = 'dead'", (), time.time())
+
+    def lease(self, owner: str, lease_seconds: float = None) -> Optional[Dict]:
+        """
+        처리할 작업 하나를 임대 (청크 작업 우선, 임대가 만료된 작업 포함)
+
+        Args:
+            owner: 작업자 식별자
+            lease_seconds: 임대 시간 (None이면 설정값)
+
+        Returns:
+            작업 ({'id', 'kind', 'key', 'parent_id', 'payload', 'attempts', ...}, 없으면 None)
+        """
+        now = time.time()
+        lease_seconds = lease_seconds or JOB_LEASE_SECONDS
+        with self._transaction() as conn:
+            while True:
+                row = conn.execute(
+                    "SELECT * FROM jobs WHERE (status = 'pending' AND available_at <= ?) "
+                    "OR (status = 'leased' AND lease_expires < ?) "
+                    "ORDER BY kind = 'chunk' DESC, id LIMIT 1", (now, now)).fetchone()
+                if row is None:
+                    return None
+                if row['status'] == LEASED and row['attempts'] >= self.max_attempts:
+                    # 처리 중 작업자가 반복해서 멈춘 작업 (예: 메모리 부족)
+                    self._bury(conn, row, f"작업자 중단 {row['attempts']}회 ({row['lease_owner']})", now)
+                    continue
+                conn.execute(
+                    "UPDATE jobs SET status = 'leased', lease_owner = ?, lease_expires = ?, "
+                    "attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                    (owner, now + lease_seconds, now, row['id']))
+                job = _job_dict(row)
+                job['attempts'] += 1
+                job['lease_owner'] = owner
+                return job
+
+    def heartbeat(self, job: Dict, lease_seconds: float = None) -> bool:
+        """
+        임대 연장
+
+        Returns:
+            연장했으면 True (임대가 만료되어 다른 작업자가 가져갔으면 False)
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET lease_expires = ?, updated_at = ? "
+                "WHERE id = ? AND status = 'leased' AND lease_owner = ?",
+                (now + (lease_seconds or JOB_LEASE_SECONDS), now, job['id'], job['lease_owner']))
+            return cursor.rowcount == 1
+
+    def complete(self, job: Dict, result: Dict = None, checkpoint: List[Dict] = None) -> bool:
+        """
+        작업 완료 처리 (청크는 체크포인트 저장, 마지막 청크이면 report 작업을 다시 대기시킴)
+
+        Args:
+            job: lease()로 받은 작업
+            result: 기록할 결과 (JSON으로 저장)
+            checkpoint: 청크 추출 결과 (페이지 데이터 리스트)
+
+        Returns:
+            기록했으면 True (임대가 만료되어 다른 작업자가 가져갔으면 False)
+        """
+        now = time.time()
+        data = zlib.compress(pickle.dumps(checkpoint, protocol=pickle.HIGHEST_PROTOCOL)) if checkpoint is not None else None
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = 'done', result = ?, last_error = NULL, lease_owner = NULL, "
+                "lease_expires = NULL, updated_at = ? WHERE id = ? AND status = 'leased' AND lease_owner = ?",
+                (json.dumps(result, ensure_ascii=False) if result is not None else None, now,
+                 job['id'], job['lease_owner']))
+            if cursor.rowcount != 1:
+                return False
+            if data is not None:
+                conn.execute("INSERT OR REPLACE INTO checkpoints (job_id, data) VALUES (?, ?)", (job['id'], data))
+            if job['parent_id'] is not None:
+                remaining = conn.execute(
+                    "SELECT COUNT(*) FROM jobs WHERE parent_id = ? AND status != 'done'",
+                    (job['parent_id'],)).fetchone()[0]
+                if not remaining:
+                    # 조립 단계는 새 단계이므로 시도 횟수를 다시 셈
+                    conn.execute(
+                        "UPDATE jobs SET status = 'pending', attempts = 0, available_at = 0, updated_at = ? "
+                        "WHERE id = ? AND status = 'waiting'", (now, job['parent_id']))
+            return True
+
+    def fail(self, job: Dict, error: str, retry: bool = True) -> str:
+        """
+        작업 실패 처리 (재시도 가능하면 백오프 후 다시 대기, 아니면 dead)
+
+        Args:
+            job: lease()로 받은 작업
+            error: 오류 메시지
+            retry: 재시도할 오류인지 여부 (404처럼 다시 해도 실패할 오류는 False)
+
+        Returns:
+            변경된 상태 ('pending' 또는 'dead', 임대가 만료되었으면 'leased')
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ? AND status = 'leased' AND lease_owner = ?",
+                               (job['id'], job['lease_owner'])).fetchone()
+            if row is None:
+                return LEASED
+            if retry and row['attempts'] < self.max_attempts:
+                delay = self.backoff * (2 ** (row['attempts'] - 1))
+                conn.execute(
+                    "UPDATE jobs SET status = 'pending', available_at = ?, last_error = ?, lease_owner = NULL, "
+                    "lease_expires = NULL, updated_at = ? WHERE id = ?", (now + delay, error, now, row['id']))
+                return PENDING
+            self._bury(conn, row, error, now)
+            return DEAD
+
+    def spawn_children(self, job: Dict, chunks: Sequence[Tuple[str, Dict]]) -> bool:
+        """
+        report 작업의 청크 작업 생성 (이미 있는 청크는 유지, 목록에 없는 이전 청크는 삭제)
+
+        Args:
+            job: lease()로 받은 report 작업
+            chunks: (키, 내용) 리스트
+
+        Returns:
+            모든 청크가 이미 끝났으면 True (바로 조립), 아니면 False (report 작업은 청크 대기 상태)
+
+        Raises:
+            ChunkFailed: dead 상태인 청크가 있는 경우
+        """
+        now = time.time()
+        keys = {key for key, _ in chunks}
+        with self._transaction() as conn:
+            stale = [row['id'] for row in conn.execute("SELECT id, key FROM jobs WHERE parent_id = ?", (job['id'],))
+                     if row['key'] not in keys]
+            for child_id in stale:
+                # PDF나 추출 설정이 바뀌어 쓸 수 없는 체크포인트
+                conn.execute("DELETE FROM checkpoints WHERE job_id = ?", (child_id,))
+                conn.execute("DELETE FROM jobs WHERE id = ?", (child_id,))
+            conn.executemany(
+                "INSERT OR IGNORE INTO jobs (kind, key, parent_id, payload, status, created_at, updated_at) "
+                "VALUES ('chunk', ?, ?, ?, 'pending', ?, ?)",
+                [(key, job['id'], json.dumps(payload, ensure_ascii=False), now, now) for key, payload in chunks])
+
+            failed = conn.execute("SELECT key, last_error FROM jobs WHERE parent_id = ? AND status = 'dead' LIMIT 1",
+                                  (job['id'],)).fetchone()
+            if failed is not None:
+                raise ChunkFailed(f"{failed['key'].rsplit(':', 1)[-1]}: {failed['last_error']}")
+
+            remaining = conn.execute("SELECT COUNT(*) FROM jobs WHERE parent_id = ? AND status != 'done'",
+                                     (job['id'],)).fetchone()[0]
+            if remaining:
+                conn.execute(
+                    "UPDATE jobs SET status = 'waiting', lease_owner = NULL, lease_expires = NULL, updated_at = ? "
+                    "WHERE id = ? AND lease_owner = ?", (now, job['id'], job['lease_owner']))
+            return not remaining
+
+    def checkpoints(self, job: Dict) -> List[List[Dict]]:
+        """
+        report 작업의 청크 체크포인트 (청크 첫 페이지 순서)
+
+        Returns:
+            청크별 페이지 데이터 리스트
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT jobs.payload, checkpoints.data FROM jobs JOIN checkpoints ON checkpoints.job_id = jobs.id "
+                "WHERE jobs.parent_id = ?", (job['id'],)).fetchall()
+        # 청크 크기를 바꿔 재개하면 새 청크가 이전 청크보다 나중에 생성되므로 id가 아닌 페이지 순서로 정렬
+        rows.sort(key=lambda row: json.loads(row['payload'])['pages'][0])
+        return [pickle.loads(zlib.decompress(row['data'])) for row in rows]
+
+    def release(self, owner_prefix: str) -> int:
+        """
+        owner_prefix로 시작하는 작업자의 임대를 반납 (취소 시, 시도 횟수는 되돌림)
+
+        Returns:
+            반납한 작업 수
+        """
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = 'pending', attempts = MAX(attempts - 1, 0), lease_owner = NULL, "
+                "lease_expires = NULL, updated_at = ? WHERE status = 'leased' AND lease_owner LIKE ? || '%'",
+                (time.time(), owner_prefix))
+            return cursor.rowcount
+
+    def release_job(self, job: Dict) -> bool:
+        """
+        작업 하나의 임대를 반납 (작업 탓이 아닌 중단, 시도 횟수는 되돌림)
+
+        Returns:
+            반납했으면 True (임대가 만료되어 다른 작업자가 가져갔으면 False)
+        """
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = 'pending', attempts = MAX(attempts - 1, 0), lease_owner = NULL, "
+                "lease_expires = NULL, updated_at = ? WHERE id = ? AND status = 'leased' AND lease_owner = ?",
+                (time.time(), job['id'], job['lease_owner']))
+            return cursor.rowcount == 1
+
+    def recover_local(self) -> int:
+        """
+        이 호스트에서 종료된 프로세스가 쥐고 있던 임대를 만료를 기다리지 않고 회수 (시도 횟수는 유지)
+
+        Returns:
+            회수한 작업 수
+        """
+        host = socket.gethostname()
+        with self._transaction() as conn:
+            rows = conn.execute("SELECT id, lease_owner FROM jobs WHERE status = 'leased' AND lease_owner LIKE ? || ':%'",
+                                (host,)).fetchall()
+            dead = [row['id'] for row in rows if not _pid_alive(int(row['lease_owner'].split(':')[1]))]
+            conn.executemany("UPDATE jobs SET lease_expires = 0 WHERE id = ?", [(job_id,) for job_id in dead])
+        return len(dead)
+
+    def has_active(self) -> bool:
+        """아직 끝나지 않은 작업(pending, leased, waiting)이 있는지 여부"""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT 1 FROM jobs WHERE status IN ('pending', 'leased', 'waiting') LIMIT 1").fetchone() is not None
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """작업 종류별, 상태별 개수"""
+        counts = {kind: dict.fromkeys(JOB_STATUSES, 0) for kind in ('report', 'chunk')}
+        with self._lock:
+            for row in self._conn.execute("SELECT kind, status, COUNT(*) AS n FROM jobs GROUP BY kind, status"):
+                counts[row['kind']][row['status']] = row['n']
+        return counts
+
+    def dead_jobs(self) -> List[Dict]:
+        """dead 상태인 작업 목록 (오류 메시지 포함)"""
+        with self._lock:
+            rows = self._conn.execute("SELECT * FROM jobs WHERE status = 'dead' ORDER BY id").fetchall()
+        return [_job_dict(row) for row in rows]
+
+    def purge(self) -> int:
+        """
+        완료된 report 작업과 그 청크, 체크포인트 삭제
+
+        Returns:
+            삭제한 report 작업 수
+        """
+        with self._transaction() as conn:
+            ids = [row['id'] for row in conn.execute("SELECT id FROM jobs WHERE kind = 'report' AND status = 'done'")]
+            for job_id in ids:
+                self._delete_children(conn, job_id)
+                conn.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+        with self._lock:
+            self._conn.execute("VACUUM")
+        return len(ids)
+
+    def drop_checkpoints(self, job: Dict):
+        """조립을 마친 report 작업의 청크 체크포인트 삭제 (청크 작업 기록은 유지)"""
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM checkpoints WHERE job_id IN (SELECT id FROM jobs WHERE parent_id = ?)",
+                         (job['id'],))
+
+    def _bury(self, conn: sqlite3.Connection, row: sqlite3.Row, error: str, now: float):
+        """작업을 dead로 보류 (청크이면 report 작업도 함께)"""
+        conn.execute("UPDATE jobs SET status = 'dead', last_error = ?, lease_owner = NULL, lease_expires = NULL, "
+                     "updated_at = ? WHERE id = ?", (error, now, row['id']))
+        if row['parent_id'] is not None:
+            conn.execute("UPDATE jobs SET status = 'dead', last_error = ?, updated_at = ? "
+                         "WHERE id = ? AND status = 'waiting'",
+                         (f"청크 {row['key'].rsplit(':', 1)[-1]} 실패: {error}", now, row['parent_id']))
+
+    @staticmethod
+    def _reset(conn: sqlite3.Connection, where: str, params: tuple, now: float) -> int:
+        cursor = conn.execute(
+            f"UPDATE jobs SET status = 'pending', attempts = 0, available_at = 0, last_error = NULL, "
+            f"lease_owner = NULL, lease_expires = NULL, updated_at = ? WHERE {where}", (now, *params))
+        return cursor.rowcount
+
+    @staticmethod
+    def _delete_children(conn: sqlite3.Connection, job_id: int):
+        conn.execute("DELETE FROM checkpoints WHERE job_id IN (SELECT id FROM jobs WHERE parent_id = ?)", (job_id,))
+        conn.execute("DELETE FROM jobs WHERE parent_id = ?", (job_id,))
+
+
+class _Transaction:
+    """스레드 잠금 + BEGIN IMMEDIATE 트랜잭션 (예외 시 롤백)"""
+
+    def __init__(self, lock: threading.Lock, conn: sqlite3.Connection):
+        self._lock = lock
+        self._conn = conn
+
+    def __enter__(self) -> sqlite3.Connection:
+        self._lock.acquire()
+        try:
+            self._conn.execute("BEGIN IMMEDIATE")
+        except Exception:
+            self._lock.release()
+            raise
+        return self._conn
+
+    def __exit__(self, exc_type, *exc):
+        try:
+            self._conn.execute("ROLLBACK" if exc_type else "COMMIT")
+        finally:
+            self._lock.release()
+
+
+def _job_dict(row: sqlite3.Row) -> Dict:
+    job = dict(row)
+    job['payload'] = json.loads(job['payload'])
+    return job
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class JobRunner:
+    """작업 대기열의 report/chunk 작업을 처리하는 작업자 스레드 묶음"""
+
+    def __init__(self, job_queue: JobQueue = None, output_dir: Path = None, workers: int = None,
+                 extract_workers: int = None, chunk_pages: int = None, lease_seconds: float = None,
+                 use_cache: bool = None, mode: str = None, pages: str = None, use_index: bool = None,
+                 skip_duplicates: bool = None):
+        """
+        Args:
+            job_queue: 작업 대기열 (None이면 기본 경로)
+            output_dir: PDF 저장 디렉토리
+            workers: 작업자 스레드 수
+            extract_workers: 청크 추출 프로세스 수
+            chunk_pages: 청크당 페이지 수
+            lease_seconds: 작업 임대 시간
+            use_cache: 추출 캐시 사용 여부 (None이면 설정값)
+            mode: 추출 모드 ('full', 'text', 'tables')
+            pages: 추출할 페이지 범위 (예: "1-3,10")
+            use_index: 전문 검색 인덱스에 추가할지 여부 (None이면 설정값)
+            skip_duplicates: 이미 파싱한 보고서와 같으면 파싱 생략 (None이면 설정값)
+        """
+        self.queue = job_queue or JobQueue()
+        self.workers = workers or JOB_WORKERS
+        self.extract_workers = extract_workers or JOB_EXTRACT_WORKERS
+        self.chunk_pages = chunk_pages or JOB_CHUNK_PAGES
+        self.lease_seconds = lease_seconds or JOB_LEASE_SECONDS
+        if use_cache is None:
+            use_cache = USE_EXTRACT_CACHE
+        if use_index is None:
+            use_index = USE_SEARCH_INDEX
+        self.skip_duplicates = USE_DEDUPE if skip_duplicates is None else skip_duplicates
+
+        self.downloader = PDFDownloader(output_dir or DATA_DIR, cache=ExtractionCache() if use_cache else None,
+                                        mode=mode, pages=pages, search_index=SearchIndex() if use_index else None,
+                                        ocr=create_ocr_pool(),
+                                        dedupe=DedupeIndex() if self.skip_duplicates else None)
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+        self._stop = threading.Event()
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        # 추출 프로세스가 죽을 때 추출 중이던 청크 키: 원인을 가리기 위해 하나씩 별도 프로세스에서 다시 실행
+        self._suspects = set()
+        self._isolation_lock = threading.Lock()
+
+    def run(self) -> Dict[str, Dict[str, int]]:
+        """
+        대기열이 빌 때까지 작업 처리 (Ctrl+C로 취소하면 임대를 반납하고 종료)
+
+        Returns:
+            처리 후 작업 상태별 개수 (stats())
+        """
+        recovered = self.queue.recover_local()
+        if recovered:
+            print(f"[*] 중단된 실행의 작업 {recovered}건 회수")
+        print(f"[*] 작업 처리 시작 (작업자 {self.workers}, 추출 프로세스 {self.extract_workers}, "
+              f"청크 {self.chunk_pages}페이지)")
+
+        threads = [threading.Thread(target=self._work_loop, args=(f"{self.owner}:{i}",), daemon=True)
+                   for i in range(self.workers)]
+        for thread in threads:
+            thread.start()
+        try:
+            for thread in threads:
+                while thread.is_alive():
+                    thread.join(timeout=0.5)
+        except KeyboardInterrupt:
+            self._stop.set()
+            released = self.queue.release(self.owner + ":")
+            print(f"\n[*] 취소됨, 처리 중이던 작업 {released}건 반납 (다시 실행하면 이어서 처리)")
+            raise
+        finally:
+            with self._executor_lock:
+                if self._executor is not None:
+                    self._executor.shutdown(wait=not self._stop.is_set())
+                    self._executor = None
+
+        stats = self.queue.stats()
+        print(f"[OK] 작업 처리 완료: 보고서 완료 {stats['report'][DONE]}건, 실패 보류 {stats['report'][DEAD]}건")
+        return stats
+
+    def _work_loop(self, owner: str):
+        while not self._stop.is_set():
+            job = self.queue.lease(owner, self.lease_seconds)
+            if job is None:
+                if not self.queue.has_active():
+                    return
+                # 다른 작업자의 청크 또는 재시도 대기 중인 작업
+                self._stop.wait(JOB_POLL_INTERVAL)
+                continue
+
+            try:
+                if job['kind'] == 'chunk':
+                    self._run_chunk(job)
+                else:
+                    self._run_report(job)
+            except requests.RequestException as e:
+                self._fail(job, f"다운로드 실패: {e}", retry=_is_retryable(e))
+            except ChunkFailed as e:
+                self._fail(job, f"청크 실패: {e}", retry=False)
+            except Exception as e:
+                if self._stop.is_set():
+                    return
+                self._fail(job, f"{type(e).__name__}: {e}")
+
+    def _fail(self, job: Dict, error: str, retry: bool = True):
+        status = self.queue.fail(job, error, retry)
+        label = job['payload'].get('url') or job['key']
+        if status == PENDING:
+            print(f"[*] 재시도 대기 ({job['attempts']}/{self.queue.max_attempts}): {label}: {error}")
+        elif status == DEAD:
+            print(f"[ERROR] 실패 보류 (dead): {label}: {error}")
+
+    def _run_report(self, job: Dict):
+        """다운로드 -> 중복/캐시 확인 -> 청크 생성 또는 조립"""
+        url = job['payload']['url']
+        pdf_path = self.downloader.download(url)
+
+        original = self.downloader.find_duplicate(pdf_path) if self.skip_duplicates else None
+        if original is not None:
+            print(f"[*] 중복 보고서, 파싱 생략: {pdf_path.name} -> {original['name']}")
+            self.queue.complete(job, {'pdf_path': str(pdf_path), 'duplicate_of': original['name']})
+            return
+
+        if self.downloader.cached_pages(pdf_path) is not None:
+            pages_data = self.downloader.extract_and_save(pdf_path)
+            self.queue.complete(job, {'pdf_path': str(pdf_path), 'pages': len(pages_data)})
+            return
+
+        # PDF 내용과 추출 설정이 같을 때만 이전 실행의 청크 체크포인트를 사용
+        settings = self.downloader.extraction_settings()
+        version = hash_data({'pdf': pdf_sha256(pdf_path), 'settings': settings})[:16]
+        page_indexes = self.downloader.page_indexes(pdf_path)
+        chunks = []
+        for start in range(0, len(page_indexes), self.chunk_pages):
+            indexes = page_indexes[start:start + self.chunk_pages]
+            chunks.append((f"{job['id']}:{version}:{indexes[0] + 1}-{indexes[-1] + 1}",
+                           {'pdf_path': str(pdf_path), 'pages': indexes, 'settings': settings}))
+
+        if not self.queue.spawn_children(job, chunks):
+            print(f"[*] {pdf_path.name}: {len(page_indexes)}페이지, 청크 {len(chunks)}개 대기")
+            return
+
+        # 모든 청크가 끝났으면 조립 (OCR은 페이지 이미지 캐시가 있어 다시 해도 빠름)
+        pages_data = [page for chunk in self.queue.checkpoints(job) for page in chunk]
+        if self.downloader.ocr is not None:
+            pages_data = list(self.downloader.ocr.fill(iter(pages_data), pdf_path))
+        self.downloader.extract_and_save(pdf_path, pages_data)
+        if self.queue.complete(job, {'pdf_path': str(pdf_path), 'pages': len(pages_data)}):
+            self.queue.drop_checkpoints(job)
+        print(f"[OK] {pdf_path.name}: {len(pages_data)}페이지 완료")
+
+    def _run_chunk(self, job: Dict):
+        """페이지 범위 추출 (임대를 연장하며 대기) 후 체크포인트 저장"""
+        payload = job['payload']
+        label = f"{Path(payload['pdf_path']).name} 페이지 {job['key'].rsplit(':', 1)[-1]}"
+        task = (_extract_page_range, payload['pdf_path'], payload['pages'], payload['settings'])
+        start = time.perf_counter()
+
+        if job['key'] in self._suspects:
+            result = self._run_isolated(job, task, label)
+        else:
+            executor = self._get_executor()
+            try:
+                future = executor.submit(*task)
+            except BrokenProcessPool:
+                # 다른 청크 때문에 이미 깨진 풀: 이 청크의 시도로 세지 않음
+                self._drop_executor(executor)
+                self.queue.release_job(job)
+                return
+            try:
+                result = self._wait(job, future)
+            except BrokenProcessPool:
+                # 함께 실행 중이던 청크 중 어느 것이 프로세스를 죽였는지 알 수 없으므로 반납 후 따로 다시 실행
+                self._drop_executor(executor)
+                self._suspects.add(job['key'])
+                self.queue.release_job(job)
+                print(f"[WARN] 추출 프로세스 비정상 종료, 따로 다시 실행: {label}")
+                return
+        if result is None:
+            return
+
+        pages_data, timings = result
+        self._suspects.discard(job['key'])
+        _record_extract_metrics(start, timings, len(pages_data))
+        if self.queue.complete(job, {'pages': len(pages_data)}, checkpoint=pages_data):
+            print(f"[*] {label} 추출 완료")
+
+    def _run_isolated(self, job: Dict, task: Tuple, label: str) -> Optional[Tuple[List[Dict], Dict[str, float]]]:
+        """의심 청크를 전용 프로세스 하나에서 하나씩 실행 (여기서 프로세스가 죽으면 이 청크의 실패로 기록)"""
+        with self._isolation_lock:
+            executor = ProcessPoolExecutor(max_workers=1)
+            try:
+                return self._wait(job, executor.submit(*task))
+            except BrokenProcessPool:
+                self._fail(job, f"추출 프로세스 비정상 종료 (메모리 부족 등): {label}")
+                return None
+            finally:
+                executor.shutdown(wait=False)
+
+    def _wait(self, job: Dict, future: Future) -> Optional[Tuple[List[Dict], Dict[str, float]]]:
+        """
+        추출이 끝날 때까지 임대를 연장하며 대기
+
+        Returns:
+            추출 결과 (취소되었거나 임대를 잃어 다른 작업자가 가져갔으면 None)
+        """
+        while True:
+            try:
+                return future.result(timeout=self.lease_seconds / 3)
+            except FutureTimeoutError:
+                if self._stop.is_set():
+                    return None
+                if not self.queue.heartbeat(job, self.lease_seconds):
+                    future.cancel()
+                    print(f"[WARN] 임대가 만료되어 다른 작업자가 가져감, 대기 중단: {job['key']}")
+                    return None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.extract_workers)
+            return self._executor
+
+    def _drop_executor(self, executor: ProcessPoolExecutor):
+        """깨진 프로세스 풀 버리기 (다음 청크가 새 풀을 만듦)"""
+        with self._executor_lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False)
+
+
+def main(argv: List[str] = None):
+    """작업 대기열 명령 (python -m src jobs)"""
+    parser = argparse.ArgumentParser(description="AI Report - 재개 가능한 수집 작업 대기열")
+    parser.add_argument("urls", nargs="*", help="추가할 PDF URL 목록 (없으면 남은 작업만 처리)")
+    parser.add_argument("--url-file", type=str, help="URL 목록 파일 (한 줄에 하나)")
+    parser.add_argument("--workers", type=int, default=None, help="작업자 스레드 수")
+    parser.add_argument("--extract-workers", type=int, default=None, help="청크 추출 프로세스 수")
+    parser.add_argument("--chunk-pages", type=int, default=None, help="청크당 페이지 수")
+    parser.add_argument("--no-cache", action="store_true", help="추출 캐시를 사용하지 않음")
+    parser.add_argument("--mode", choices=["full", "text", "tables"], default=None,
+                        help="PDF 추출 모드 (full: 텍스트+표, text: 텍스트만, tables: 표만)")
+    parser.add_argument("--pages", type=str, default=None, help="추출할 페이지 범위 (예: 1-3,10)")
+    parser.add_argument("--no-index", action="store_true", help="전문 검색 인덱스에 추가하지 않음")
+    parser.add_argument("--keep-duplicates", action="store_true", help="중복 보고서도 다시 파싱")
+    parser.add_argument("--status", action="store_true", help="작업 상태만 출력")
+    parser.add_argument("--retry-dead", action="store_true", help="실패 보류(dead)된 작업을 다시 대기시킴")
+    parser.add_argument("--purge", action="store_true", help="완료된 작업과 체크포인트 삭제")
+    parser.add_argument("--profile", nargs="?", const="", default=None, metavar="FILE",
+                        help="단계별 시간/메모리 요약 출력 (FILE을 주면 .json 또는 .prom 형식으로 저장)")
+
+    args = parser.parse_args(argv)
+    collector = metrics.enable_metrics() if args.profile is not None else None
+
+    with JobQueue() as job_queue:
+        if args.purge:
+            print(f"[OK] 완료된 작업 {job_queue.purge()}건 삭제")
+        if args.retry_dead:
+            print(f"[OK] dead 작업 {job_queue.retry_dead()}건 다시 대기")
+
+        urls = list(args.urls)
+        if args.url_file:
+            urls.extend(read_url_file(Path(args.url_file)))
+        if urls:
+            print(f"[OK] 작업 추가: {job_queue.submit(urls)}건")
+
+        if not args.status and not args.purge and job_queue.has_active():
+            runner = JobRunner(job_queue, workers=args.workers, extract_workers=args.extract_workers,
+                               chunk_pages=args.chunk_pages, use_cache=False if args.no_cache else None,
+                               mode=args.mode, pages=args.pages, use_index=False if args.no_index else None,
+                               skip_duplicates=False if args.keep_duplicates else None)
+            try:
+                runner.run()
+            except KeyboardInterrupt:
+                return 130
+
+        stats = job_queue.stats()
+        for kind, counts in stats.items():
+            print(f"[*] {kind:<7}" + "  ".join(f"{status} {count}" for status, count in counts.items()))
+        for job in job_queue.dead_jobs():
+            print(f"[FAIL] {job['payload'].get('url') or job['key']}: {job['last_error']}")
+
+    if collector is not None:
+        print(f"\n[*] 단계별 계측 결과")
+        print(collector.format_table())
+        if args.profile:
+            collector.save(Path(args.profile))
+
+
+if __name__ == "__main__":
+    main()
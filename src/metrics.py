@@ -0,0 +1,191 @@
+"""
+파이프라인 계측 모듈
+
+다운로드, 페이지별 텍스트/표 추출, 텍스트 파일 기록, 렌더링 등 단계별로
+소요 시간, 처리 바이트/건수, 프로세스 최대 RSS를 모은다.
+enable_metrics()를 호출하기 전에는 계측 코드가 아무 것도 기록하지 않는다.
+"""
+import sys
+import json
+import time
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+try:
+    import resource
+except ImportError:
+    # Windows에는 resource 모듈이 없음 (최대 RSS는 기록하지 않음)
+    resource = None
+
+# Prometheus 지표 이름 접두어
+PROMETHEUS_PREFIX = "aireport"
+
+_collector = None
+
+
+def peak_rss_bytes() -> Optional[int]:
+    """현재 프로세스의 최대 RSS (바이트, 측정할 수 없으면 None)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux는 KB, macOS는 바이트 단위
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class MetricsCollector:
+    """단계별 시간, 바이트, 건수, 최대 RSS 수집"""
+
+    def __init__(self):
+        self._stages = {}
+        # 일괄 수집의 다운로드/파싱 스레드가 동시에 기록
+        self._lock = threading.Lock()
+        self._started = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[Dict[str, int]]:
+        """
+        블록 실행 시간을 단계에 기록
+
+        Args:
+            name: 단계 이름 (예: 'download', 'render')
+
+        Yields:
+            블록 안에서 'bytes', 'items'를 채울 수 있는 dict
+        """
+        counters = {'bytes': 0, 'items': 0}
+        start = time.perf_counter()
+        try:
+            yield counters
+        finally:
+            self.record(name, time.perf_counter() - start, counters['bytes'], counters['items'])
+
+    def record(self, name: str, seconds: float, nbytes: int = 0, items: int = 0, count: int = 1):
+        """
+        단계 측정값 누적
+
+        Args:
+            name: 단계 이름
+            seconds: 소요 시간 (초)
+            nbytes: 처리한 바이트 수
+            items: 처리한 건수 (페이지 수 등)
+            count: 측정 횟수
+        """
+        peak_rss = peak_rss_bytes()
+        with self._lock:
+            stats = self._stages.setdefault(name, {'count': 0, 'seconds': 0.0, 'bytes': 0, 'items': 0,
+                                                   'peak_rss_bytes': None})
+            stats['count'] += count
+            stats['seconds'] += seconds
+            stats['bytes'] += nbytes
+            stats['items'] += items
+            if peak_rss is not None:
+                stats['peak_rss_bytes'] = max(stats['peak_rss_bytes'] or 0, peak_rss)
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """
+        단계별 측정값
+
+        Returns:
+            {단계 이름: {'count', 'seconds', 'bytes', 'items', 'bytes_per_sec', 'peak_rss_bytes'}}
+            (기록된 순서)
+        """
+        with self._lock:
+            stages = {name: dict(stats) for name, stats in self._stages.items()}
+        for stats in stages.values():
+            stats['bytes_per_sec'] = stats['bytes'] / stats['seconds'] if stats['bytes'] and stats['seconds'] else 0.0
+        return stages
+
+    def to_json(self) -> str:
+        """JSON 문자열로 내보내기"""
+        return json.dumps({
+            'elapsed_seconds': time.perf_counter() - self._started,
+            'peak_rss_bytes': peak_rss_bytes(),
+            'stages': self.snapshot(),
+        }, ensure_ascii=False, indent=2)
+
+    def to_prometheus(self) -> str:
+        """Prometheus 텍스트 형식으로 내보내기"""
+        metrics = [
+            ('stage_seconds_total', 'counter', '단계 누적 소요 시간 (초)', 'seconds'),
+            ('stage_runs_total', 'counter', '단계 실행 횟수', 'count'),
+            ('stage_bytes_total', 'counter', '단계에서 처리한 바이트 수', 'bytes'),
+            ('stage_items_total', 'counter', '단계에서 처리한 건수', 'items'),
+            ('stage_peak_rss_bytes', 'gauge', '단계 종료 시점까지의 프로세스 최대 RSS', 'peak_rss_bytes'),
+        ]
+        stages = self.snapshot()
+        lines = []
+        for metric, kind, description, field in metrics:
+            lines.append(f"# HELP {PROMETHEUS_PREFIX}_{metric} {description}")
+            lines.append(f"# TYPE {PROMETHEUS_PREFIX}_{metric} {kind}")
+            for name, stats in stages.items():
+                if stats[field] is not None:
+                    lines.append(f'{PROMETHEUS_PREFIX}_{metric}{{stage="{name}"}} {stats[field]}')
+        return "\n".join(lines) + "\n"
+
+    def save(self, path: Path):
+        """
+        파일로 저장 (확장자가 .prom이면 Prometheus 텍스트, 그 외에는 JSON)
+
+        Args:
+            path: 저장 경로
+        """
+        path = Path(path)
+        content = self.to_prometheus() if path.suffix == '.prom' else self.to_json()
+        path.write_text(content, encoding='utf-8')
+        print(f"[OK] 계측 결과 저장: {path}")
+
+    def format_table(self) -> str:
+        """단계별 요약 표 (터미널 출력용)"""
+        lines = [f"{'단계':<16}{'횟수':>6}{'시간(초)':>10}{'건수':>8}{'MB':>10}{'MB/s':>9}{'최대 RSS(MB)':>14}"]
+        for name, stats in self.snapshot().items():
+            peak_rss = f"{stats['peak_rss_bytes'] / 1e6:.1f}" if stats['peak_rss_bytes'] else "-"
+            lines.append(f"{name:<16}{stats['count']:>6}{stats['seconds']:>10.3f}{stats['items']:>8}"
+                         f"{stats['bytes'] / 1e6:>10.2f}{stats['bytes_per_sec'] / 1e6:>9.2f}{peak_rss:>14}")
+        return "\n".join(lines)
+
+
+def enable_metrics() -> MetricsCollector:
+    """계측 시작 (이미 켜져 있으면 기존 수집기 반환)"""
+    global _collector
+    if _collector is None:
+        _collector = MetricsCollector()
+    return _collector
+
+
+def disable_metrics():
+    """계측 종료"""
+    global _collector
+    _collector = None
+
+
+def get_metrics() -> Optional[MetricsCollector]:
+    """현재 수집기 (계측이 꺼져 있으면 None)"""
+    return _collector
+
+
+@contextmanager
+def stage(name: str) -> Iterator[Dict[str, int]]:
+    """
+    계측이 켜져 있으면 블록 실행 시간을 단계에 기록
+
+    Args:
+        name: 단계 이름
+
+    Yields:
+        'bytes', 'items'를 채울 수 있는 dict (계측이 꺼져 있으면 버려짐)
+    """
+    collector = _collector
+    if collector is None:
+        yield {'bytes': 0, 'items': 0}
+        return
+    with collector.stage(name) as counters:
+        yield counters
+
+
+def record(name: str, seconds: float, nbytes: int = 0, items: int = 0, count: int = 1):
+    """계측이 켜져 있으면 측정값 누적 (MetricsCollector.record 참고)"""
+    collector = _collector
+    if collector is not None:
+        collector.record(name, seconds, nbytes, items, count)
@@ -0,0 +1,249 @@
+"""
+이미지 페이지 OCR 모듈
+
+텍스트 레이어가 없거나 글자가 거의 없는 페이지(스캔본, 이미지로 들어간 차트)만
+별도 프로세스 풀에서 렌더링 후 Tesseract로 인식한다. 결과는 렌더링한 페이지 이미지의 해시로 캐시한다.
+
+pytesseract와 tesseract 실행 파일이 없으면 OCR을 사용하지 않는다 (선택 의존성).
+"""
+import os
+import time
+import atexit
+import hashlib
+import threading
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple
+
+from .config import USE_OCR, OCR_WORKERS, OCR_LANG, OCR_RESOLUTION, OCR_MIN_CHARS, OCR_CACHE_DIR, OCR_MAX_PENDING
+from . import metrics
+
+# 작업자 프로세스에서 마지막으로 연 문서 ((경로, 수정 시각), PdfDocument)
+_worker_document = None
+_warned_unavailable = False
+# create_ocr_pool()이 돌려주는 프로세스 공용 풀 (서버처럼 오래 실행되는 프로세스에서 요청마다 풀을 만들지 않음)
+_shared_pool = None
+_shared_pool_lock = threading.Lock()
+
+
+@lru_cache(maxsize=1)
+def tesseract_version() -> Optional[str]:
+    """
+    사용 가능한 Tesseract 버전
+
+    Returns:
+        버전 문자열 (pytesseract 또는 tesseract 실행 파일이 없으면 None)
+    """
+    try:
+        import pytesseract
+    except ImportError:
+        return None
+    try:
+        return str(pytesseract.get_tesseract_version())
+    except (EnvironmentError, pytesseract.TesseractNotFoundError):
+        return None
+
+
+def ocr_available() -> bool:
+    """OCR 백엔드(pytesseract + tesseract) 사용 가능 여부"""
+    return tesseract_version() is not None
+
+
+def create_ocr_pool(use_ocr: bool = None) -> Optional["OCRPool"]:
+    """
+    설정값을 반영한 OCR 풀 (프로세스마다 하나를 만들어 재사용하고, 종료할 때 작업자를 정리)
+
+    Args:
+        use_ocr: OCR 사용 여부 (None이면 설정값)
+
+    Returns:
+        OCRPool (사용하지 않거나 백엔드가 없으면 None)
+    """
+    global _warned_unavailable, _shared_pool
+    if use_ocr is None:
+        use_ocr = USE_OCR
+    if not use_ocr:
+        return None
+    if not ocr_available():
+        if not _warned_unavailable:
+            print("[*] pytesseract/tesseract가 없어 이미지 페이지 OCR을 사용하지 않음")
+            _warned_unavailable = True
+        return None
+    with _shared_pool_lock:
+        if _shared_pool is None:
+            _shared_pool = OCRPool()
+            atexit.register(_shared_pool.close)
+        return _shared_pool
+
+
+class OCRPool:
+    """
+    이미지 페이지 OCR 전용 프로세스 풀 (텍스트/표 추출 작업자와 별도)
+
+    작업자 프로세스는 처음 submit()할 때 만들고 close()할 때 종료한다 (with 문 사용 가능, 닫은 뒤 다시 쓰면 새로 만듦).
+    """
+
+    def __init__(self, workers: int = None, lang: str = None, resolution: int = None,
+                 min_chars: int = None, cache_dir: Path = None, max_pending: int = None):
+        """
+        Args:
+            workers: OCR 프로세스 수
+            lang: Tesseract 언어 (예: 'kor+eng')
+            resolution: 페이지 렌더링 해상도 (DPI)
+            min_chars: 추출한 글자 수가 이보다 적은 이미지 페이지를 OCR 대상으로 판단
+            cache_dir: OCR 결과 캐시 디렉토리
+            max_pending: fill()에서 OCR 결과를 기다리며 쌓아 둘 최대 페이지 수
+        """
+        self.workers = workers or OCR_WORKERS
+        self.lang = lang or OCR_LANG
+        self.resolution = resolution or OCR_RESOLUTION
+        self.min_chars = min_chars if min_chars is not None else OCR_MIN_CHARS
+        self.cache_dir = cache_dir or OCR_CACHE_DIR
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_pending = max(1, max_pending or OCR_MAX_PENDING)
+        self._executor = None
+        # 일괄 수집의 여러 파싱 스레드가 같은 풀을 공유
+        self._lock = threading.Lock()
+
+    def settings(self) -> Dict:
+        """추출 결과에 영향을 주는 OCR 설정 (추출 캐시 키와 페이지 판단에 사용)"""
+        return {
+            'lang': self.lang,
+            'resolution': self.resolution,
+            'min_chars': self.min_chars,
+            'engine': tesseract_version(),
+        }
+
+    def submit(self, pdf_path: Path, page_num: int) -> Future:
+        """
+        페이지 하나를 OCR 작업자에 보냄 (처음 호출할 때 풀 생성)
+
+        Args:
+            pdf_path: PDF 파일 경로
+            page_num: 페이지 번호 (1부터 시작)
+
+        Returns:
+            (인식한 텍스트, 소요 시간, 캐시 적중 여부)의 Future
+        """
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor.submit(_ocr_page, str(pdf_path), page_num - 1, self.lang, self.resolution,
+                                     str(self.cache_dir), tesseract_version())
+
+    def fill(self, pages: Iterator[Dict], pdf_path: Path) -> Iterator[Dict]:
+        """
+        OCR이 필요한 페이지('needs_ocr')를 풀에 보내고 결과를 합쳐 페이지 순서대로 반환
+
+        텍스트 레이어가 있는 페이지의 추출은 OCR을 기다리지 않고 계속 진행되며,
+        앞쪽 페이지의 OCR이 끝날 때까지 뒤쪽 페이지의 반환만 순서를 맞추기 위해 미뤄진다.
+        미뤄진 페이지가 max_pending개가 되면 맨 앞 페이지의 OCR이 끝날 때까지 추출도 기다린다.
+
+        Args:
+            pages: 추출된 페이지 데이터 이터레이터
+            pdf_path: PDF 파일 경로
+
+        Yields:
+            페이지 데이터 (OCR 텍스트를 사용한 페이지는 'ocr': True)
+        """
+        pending = deque()
+        for page_data in pages:
+            future = self.submit(pdf_path, page_data['page_num']) if page_data.pop('needs_ocr', False) else None
+            pending.append((page_data, future))
+            while pending and (pending[0][1] is None or pending[0][1].done() or len(pending) >= self.max_pending):
+                yield self._merge(*pending.popleft())
+
+        while pending:
+            yield self._merge(*pending.popleft())
+
+    def _merge(self, page_data: Dict, future: Optional[Future]) -> Dict:
+        if future is None:
+            return page_data
+        try:
+            text, seconds, cached = future.result()
+        except Exception as e:
+            # OCR 실패는 추출 전체를 중단하지 않고 기존(빈) 텍스트 유지
+            print(f"[WARN] 페이지 {page_data['page_num']} OCR 실패: {e}")
+            return page_data
+
+        metrics.record('ocr', seconds, items=1)
+        if text.strip():
+            page_data['text'] = text.strip()
+            page_data['ocr'] = True
+        print(f"[*] 페이지 {page_data['page_num']} OCR 완료 ({'캐시' if cached else f'{seconds:.1f}초'})")
+        return page_data
+
+    def close(self):
+        """작업자 프로세스 종료"""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def needs_ocr(page, text: str, min_chars: int) -> bool:
+    """
+    OCR 대상 페이지 판단: 추출한 글자가 min_chars 미만이고 이미지가 있는 페이지
+
+    이미지가 없는 빈 페이지는 OCR해도 얻을 것이 없으므로 제외한다.
+
+    Args:
+        page: pdfplumber 페이지 객체
+        text: 추출한 텍스트
+        min_chars: 최소 글자 수
+    """
+    return len(text.strip()) < min_chars and bool(page.images)
+
+
+def _ocr_page(pdf_path: str, page_index: int, lang: str, resolution: int, cache_dir: str,
+              engine: str) -> Tuple[str, float, bool]:
+    """
+    작업자 프로세스용: 페이지를 렌더링하고 이미지 해시로 캐시를 확인한 뒤 OCR
+
+    Returns:
+        (인식한 텍스트, 소요 시간, 캐시 적중 여부)
+    """
+    start = time.perf_counter()
+    image = _render_page(pdf_path, page_index, resolution)
+
+    digest = hashlib.sha256(f"{image.mode}:{image.size}:{lang}:{engine}:".encode('utf-8'))
+    digest.update(image.tobytes())
+    cache_path = Path(cache_dir) / f"{digest.hexdigest()}.txt"
+    if cache_path.exists():
+        return cache_path.read_text(encoding='utf-8'), time.perf_counter() - start, True
+
+    import pytesseract
+
+    text = pytesseract.image_to_string(image, lang=lang)
+
+    # 다른 작업자와 동시에 같은 페이지를 기록해도 깨지지 않도록 임시 파일 후 교체
+    tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(text, encoding='utf-8')
+    tmp_path.replace(cache_path)
+    return text, time.perf_counter() - start, False
+
+
+def _render_page(pdf_path: str, page_index: int, resolution: int):
+    """작업자 프로세스용: 페이지를 회색조 PIL 이미지로 렌더링 (같은 문서는 다시 열지 않음)"""
+    global _worker_document
+    import pypdfium2
+
+    key = (pdf_path, os.stat(pdf_path).st_mtime_ns)
+    if _worker_document is None or _worker_document[0] != key:
+        if _worker_document is not None:
+            _worker_document[1].close()
+        _worker_document = (key, pypdfium2.PdfDocument(pdf_path))
+
+    page = _worker_document[1][page_index]
+    try:
+        return page.render(scale=resolution / 72, grayscale=True).to_pil()
+    finally:
+        page.close()
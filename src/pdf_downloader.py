@@ -1,140 +1,892 @@
 """
 PDF 다운로드 및 파싱 모듈
 """
-import sys
+import os
+import re
+import json
+import math
+import time
+import hashlib
+import threading
+from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import Future, ProcessPoolExecutor
 from pathlib import Path
+from urllib.parse import unquote, urlsplit
 import requests
-import pdfplumber
-from typing import Dict, List, Tuple
-
-from .config import DATA_DIR, USE_SSL_BYPASS, SSL_BYPASS_PATH, DOWNLOAD_TIMEOUT
-
-# SSL 우회 (회사 환경)
-if USE_SSL_BYPASS:
-    sys.path.append(SSL_BYPASS_PATH)
-    import utils.ssl_bypass
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .config import (DATA_DIR, DOWNLOAD_TIMEOUT, DOWNLOAD_CHUNK_SIZE,
+                     EXTRACT_WORKERS, EXTRACT_MODE, EXTRACT_PROGRESS_EVERY, TABLE_MIN_RULING_OBJECTS, TABLE_FORMAT,
+                     USE_EXTRACT_CACHE, USE_SEARCH_INDEX, EXPORT_FORMATS, EXPORT_COMPRESSION,
+                     USE_DEDUPE, DEDUPE_SIMHASH_PAGES)
+from . import metrics
+from .exporters import TextExporter, export_pages, export_path, parse_formats, resolve_compression
+from .dedupe import DedupeIndex, simhash
+from .extract_cache import ExtractionCache, file_sha256
+from .file_io import file_lock, open_mapped
+from .http_session import create_session
+from .ocr import OCRPool, create_ocr_pool, needs_ocr
+from .search_index import SearchIndex
+from .table_store import ColumnarTable, to_columnar
+
+# 추출 모드: (텍스트 추출 여부, 표 추출 여부)
+EXTRACT_MODES = {
+    'full': (True, True),
+    'text': (True, False),
+    'tables': (False, True),
+}
+# 표 저장 형식
+TABLE_FORMATS = ('columnar', 'list')
+UNSAFE_NAME_CHARS = re.compile(r'[^\w.-]')
 
 
 class PDFDownloader:
     """PDF 다운로드 및 파싱 클래스"""
 
-    def __init__(self, output_dir: Path = None):
+    def __init__(self, output_dir: Path = None, workers: int = None, cache: ExtractionCache = None,
+                 session: requests.Session = None, mode: str = None, pages: str = None,
+                 table_min_ruling: int = None, table_format: str = None, search_index: SearchIndex = None,
+                 ocr: OCRPool = None, export_formats: List[str] = None, export_compression: str = None,
+                 dedupe: DedupeIndex = None):
+        """
+        Args:
+            output_dir: PDF 저장 디렉토리
+            workers: 병렬 추출 프로세스 수
+            cache: 추출 결과 캐시 (None이면 사용 안 함)
+            session: 다운로드에 사용할 requests 세션 (None이면 create_session()으로 생성)
+            mode: 추출 모드 ('full', 'text', 'tables')
+            pages: 추출할 페이지 범위 (예: "1-3,10", None이면 전체)
+            table_min_ruling: 표 추출을 시도할 최소 선/사각형 객체 수
+            table_format: 표 저장 형식 ('columnar', 'list')
+            search_index: 파싱한 보고서를 색인할 검색 인덱스 (None이면 사용 안 함)
+            ocr: 텍스트가 없는 이미지 페이지를 인식할 OCR 풀 (None이면 사용 안 함)
+            export_formats: 텍스트 파일과 함께 기록할 내보내기 형식 (None이면 설정값)
+            export_compression: jsonl/csv/columnar 압축 방식 (None이면 설정값)
+            dedupe: 파싱한 보고서를 등록하고 중복을 찾을 색인 (None이면 사용 안 함)
+        """
         self.output_dir = output_dir or DATA_DIR
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.workers = workers or EXTRACT_WORKERS
+        self.cache = cache
+        self.search_index = search_index
+        self.ocr = ocr
+        self.dedupe = dedupe
+        self.session = session or create_session()
+        self.mode = mode or EXTRACT_MODE
+        if self.mode not in EXTRACT_MODES:
+            raise ValueError(f"지원하지 않는 추출 모드: {self.mode} (가능: {', '.join(EXTRACT_MODES)})")
+        self.pages = pages
+        if pages:
+            # 형식 오류는 파싱 전에 바로 알림
+            parse_page_ranges(pages, 0)
+        self.table_min_ruling = table_min_ruling if table_min_ruling is not None else TABLE_MIN_RULING_OBJECTS
+        self.table_format = table_format or TABLE_FORMAT
+        if self.table_format not in TABLE_FORMATS:
+            raise ValueError(f"지원하지 않는 표 형식: {self.table_format} (가능: {', '.join(TABLE_FORMATS)})")
+        # 보고서 생성과 검색 인덱스가 텍스트 파일을 읽으므로 text는 항상 포함
+        self.export_formats = parse_formats(['text'] + list(EXPORT_FORMATS if export_formats is None else export_formats))
+        self.export_compression = resolve_compression(
+            EXPORT_COMPRESSION if export_compression is None else export_compression)
+        # 다운로드 중인 파일명 -> URL (동시에 받는 다른 URL이 같은 파일명을 쓰지 않도록)
+        self._claims = {}
+        # 진행 중인 다운로드 (URL, 파일명) -> 결과 (같은 URL을 동시에 요청하면 먼저 시작한 다운로드를 기다림)
+        self._downloads: Dict[Tuple[str, Optional[str]], Future] = {}
+        self._claims_lock = threading.Lock()
 
     def download(self, url: str, filename: str = None) -> Path:
         """
         PDF 다운로드
 
+        본문을 청크 단위로 임시 파일(.part)에 기록한 뒤 원자적으로 이름을 바꾼다.
+        이전에 받은 파일이 있으면 저장된 ETag/Last-Modified로 조건부 요청을 보내
+        변경이 없을 때(304) 본문 전송 없이 기존 파일을 재사용하고,
+        중단된 .part 파일이 있으면 Range 요청으로 이어받는다.
+        받으면서 계산한 SHA-256은 메타데이터에 기록해 두어 캐시/중복 확인 때 파일을 다시 읽지 않는다.
+        같은 URL을 동시에 요청하면 먼저 시작한 다운로드의 결과를 함께 사용하고,
+        다른 프로세스가 같은 파일을 받는 중이면 파일 잠금으로 끝날 때까지 기다린다.
+
         Args:
             url: PDF URL
-            filename: 저장할 파일명 (None이면 URL에서 추출)
+            filename: 저장할 파일명 (None이면 url_filename(), 다른 URL이 이미 쓰는 이름이면 URL 해시를 붙임)
 
         Returns:
             다운로드된 PDF 파일 경로
         """
-        if filename is None:
-            filename = url.split("/")[-1]
+        key = (url, filename)
+        with self._claims_lock:
+            pending = self._downloads.get(key)
+            first = pending is None
+            if first:
+                pending = self._downloads[key] = Future()
+        if not first:
+            print(f"[*] 같은 URL을 받는 중, 완료 대기: {url}")
+            return pending.result()
+
+        try:
+            pdf_path = self._download(url, filename)
+            pending.set_result(pdf_path)
+            return pdf_path
+        except BaseException as e:
+            pending.set_exception(e)
+            raise
+        finally:
+            with self._claims_lock:
+                self._downloads.pop(key, None)
+
+    def _download(self, url: str, filename: Optional[str]) -> Path:
+        """download() 본문 (파일명 결정 후 파일 잠금을 잡고 다운로드)"""
+        claimed = filename is None
+        if claimed:
+            filename = self._claim_filename(url, url_filename(url))
+        try:
+            # .part는 이름이 바뀌거나 삭제되므로 잠금은 별도 파일에 건다
+            with file_lock(self.output_dir / (filename + ".lock")):
+                with metrics.stage('download') as counters:
+                    return self._fetch(url, filename, counters)
+        finally:
+            if claimed:
+                with self._claims_lock:
+                    self._claims.pop(filename, None)
+
+    def _claim_filename(self, url: str, filename: str) -> str:
+        """
+        URL에 쓸 파일명 결정 (다른 URL이 받았거나 받는 중인 파일을 덮어쓰지 않음)
+
+        파일명이 겹치면 URL 해시를 붙인 이름(<이름>-<해시 8자리>.pdf)을 사용하므로
+        같은 URL은 항상 같은 파일로 저장되어 조건부 요청과 이어받기가 그대로 동작한다.
+
+        Returns:
+            저장할 파일명
+        """
+        path = Path(filename)
+        alternate = f"{path.stem}-{hashlib.sha1(url.encode('utf-8')).hexdigest()[:8]}{path.suffix}"
+        with self._claims_lock:
+            for candidate in (alternate, filename):
+                owner = self._claims.get(candidate)
+                if owner is None:
+                    meta = _load_download_meta(self.output_dir / (candidate + ".meta.json"))
+                    owner = meta.get('url')
+                    if owner is None and candidate == filename and not (self.output_dir / candidate).exists():
+                        owner = url
+                if owner == url:
+                    break
+            else:
+                candidate = alternate
+                print(f"[*] 다른 URL이 같은 파일명을 사용 중, {candidate}로 저장: {url}")
+            self._claims[candidate] = url
+        return candidate
+
+    def _fetch(self, url: str, filename: str, counters: Dict[str, int]) -> Path:
+        """download() 본문 (counters에 받은 바이트 수 기록)"""
 
         pdf_path = self.output_dir / filename
+        part_path = pdf_path.with_name(pdf_path.name + ".part")
+        meta_path = pdf_path.with_name(pdf_path.name + ".meta.json")
+        meta = _load_download_meta(meta_path, url)
+
+        # 압축 전송이면 바이트 위치가 어긋나 이어받기가 불가능하므로 원본 그대로 요청
+        headers = {'Accept-Encoding': 'identity'}
+        resume_from = 0
+        if part_path.exists() and not meta.get('complete') and (meta.get('etag') or meta.get('last_modified')):
+            # 중단된 다운로드 이어받기 (서버 파일이 바뀌었으면 If-Range에 의해 200 전체 응답)
+            resume_from = part_path.stat().st_size
+            headers['Range'] = f"bytes={resume_from}-"
+            headers['If-Range'] = meta.get('etag') or meta['last_modified']
+        elif pdf_path.exists() and meta.get('complete'):
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
 
         print(f"[*] PDF 다운로드 중: {url}")
-        response = requests.get(url, timeout=DOWNLOAD_TIMEOUT)
-        response.raise_for_status()
-
-        with open(pdf_path, 'wb') as f:
-            f.write(response.content)
+        with self.session.get(url, headers=headers, stream=True, timeout=DOWNLOAD_TIMEOUT) as response:
+            if response.status_code == 304:
+                print(f"[OK] 변경 없음 (304), 기존 파일 사용: {pdf_path}")
+                return pdf_path
+            if response.status_code == 416 and resume_from:
+                # 이어받을 범위가 유효하지 않으면 처음부터 다시 받기
+                part_path.unlink()
+                return self._fetch(url, filename, counters)
+            response.raise_for_status()
+
+            if response.status_code == 206:
+                if not resume_from:
+                    raise requests.HTTPError(f"Range 요청 없이 부분 응답(206)을 받음: {url}", response=response)
+                if _content_range_start(response) != resume_from:
+                    # 요청과 다른 범위를 받았으면 이어붙일 수 없으므로 처음부터 다시 받기
+                    print(f"[WARN] 요청하지 않은 범위 응답 ({response.headers.get('Content-Range')}), 처음부터 다시 받음")
+                    response.close()
+                    part_path.unlink()
+                    return self._fetch(url, filename, counters)
+                mode = 'ab'
+                print(f"[*] {resume_from} bytes 지점부터 이어받기")
+            else:
+                mode = 'wb'
+
+            # 본문을 받기 전에 검증자를 기록해 두어야 중단 시 이어받기 가능
+            meta = {
+                'url': url,
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'complete': False,
+            }
+            _save_download_meta(meta_path, meta)
+
+            digest = hashlib.sha256()
+            with open(part_path, mode + '+') as f:
+                if mode == 'ab':
+                    # 이어받기 전 받은 부분도 해시에 포함
+                    f.seek(0)
+                    for chunk in iter(lambda: f.read(DOWNLOAD_CHUNK_SIZE), b''):
+                        digest.update(chunk)
+                for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                    f.write(chunk)
+                    digest.update(chunk)
+                    counters['bytes'] += len(chunk)
+
+        os.replace(part_path, pdf_path)
+        stat = pdf_path.stat()
+        meta.update(complete=True, sha256=digest.hexdigest(), size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+        _save_download_meta(meta_path, meta)
+        counters['items'] += 1
 
         print(f"[OK] 다운로드 완료: {pdf_path}")
         return pdf_path
 
-    def extract_text(self, pdf_path: Path) -> List[Dict]:
+    def extraction_settings(self) -> Dict:
+        """
+        추출 결과에 영향을 주는 설정 (캐시 키에 포함)
+
+        병렬 처리 여부처럼 결과를 바꾸지 않는 설정은 포함하지 않음
+        """
+        settings = {
+            'mode': self.mode,
+            'pages': self.pages,
+            'table_min_ruling': self.table_min_ruling,
+            'table_format': self.table_format,
+        }
+        # OCR을 사용하지 않으면 키를 넣지 않아 기존 캐시 항목을 그대로 사용
+        if self.ocr is not None and EXTRACT_MODES[self.mode][0]:
+            settings['ocr'] = self.ocr.settings()
+        return settings
+
+    def extract_cached(self, pdf_path: Path) -> Tuple[List[Dict], bool]:
+        """
+        캐시를 먼저 확인하고, 없으면 추출 후 캐시에 저장
+
+        Args:
+            pdf_path: PDF 파일 경로
+
+        Returns:
+            (페이지별 데이터, 캐시 적중 여부)
+        """
+        pages_data = self.cached_pages(pdf_path)
+        if pages_data is not None:
+            print(f"[OK] 추출 캐시 사용: {pdf_path}")
+            return pages_data, True
+
+        pages_data = self.extract_text(pdf_path)
+        if self.cache is not None:
+            self.cache.put(self._cache_key(pdf_path), pages_data)
+        return pages_data, False
+
+    def cached_pages(self, pdf_path: Path) -> Optional[List[Dict]]:
+        """
+        추출 캐시 조회 (파싱하지 않음)
+
+        Returns:
+            페이지별 데이터 (캐시가 없거나 항목이 없으면 None)
+        """
+        if self.cache is None:
+            return None
+        with metrics.stage('cache_lookup') as counters:
+            pages_data = self.cache.get(self._cache_key(pdf_path))
+            counters['items'] = int(pages_data is not None)
+        return pages_data
+
+    def _cache_key(self, pdf_path: Path) -> str:
+        return self.cache.make_key(pdf_path, self.extraction_settings(), sha256=pdf_sha256(pdf_path))
+
+    def extract_and_save(self, pdf_path: Path, pages_data: List[Dict] = None) -> List[Dict]:
+        """
+        PDF를 파싱(캐시 우선)하고 같은 이름의 텍스트 파일 및 내보내기 형식으로 저장 (검색 인덱스가 있으면 색인)
+
+        Args:
+            pdf_path: PDF 파일 경로
+            pages_data: 이미 추출한 페이지 데이터 (작업 대기열이 청크별로 추출해 모은 결과, None이면 파싱)
+
+        Returns:
+            페이지별 데이터 리스트
+        """
+        if pages_data is None:
+            pages_data, cache_hit = self.extract_cached(pdf_path)
+        else:
+            cache_hit = False
+            if self.cache is not None:
+                self.cache.put(self._cache_key(pdf_path), pages_data)
+
+        # 텍스트 파일 등 내보내기 형식을 한 번에 저장 (캐시 적중 시 기존 파일 재사용)
+        base_path = pdf_path.with_suffix('')
+        paths = [export_path(base_path, fmt, self.export_compression) for fmt in self.export_formats]
+        if not (cache_hit and all(path.exists() for path in paths)):
+            export_pages(pages_data, base_path, self.export_formats, self.export_compression or 'none')
+            print(f"[OK] 추출 결과 저장 ({', '.join(self.export_formats)}): {base_path}.*")
+
+        meta = _load_download_meta(pdf_path.with_name(pdf_path.name + ".meta.json"))
+        # 같은 PDF가 이미 색인되어 있으면 생략됨
+        if self.search_index is not None:
+            with metrics.stage('search_index') as counters:
+                counters['items'] = int(self.search_index.add_report(pdf_path, pages_data, url=meta.get('url'),
+                                                                     sha256=pdf_sha256(pdf_path)))
+
+        # 이후 다른 URL로 다시 올라온 같은 보고서를 찾을 수 있도록 등록
+        if self.dedupe is not None:
+            text = "\n".join(page_data['text'] for page_data in pages_data
+                             if page_data['page_num'] <= DEDUPE_SIMHASH_PAGES)
+            self.dedupe.add(self._dedupe_name(pdf_path), pdf_sha256(pdf_path), url=meta.get('url'),
+                            size=pdf_path.stat().st_size, fingerprint=simhash(text))
+
+        return pages_data
+
+    def find_duplicate(self, pdf_path: Path) -> Optional[Dict]:
+        """
+        이미 파싱한 보고서 중 내용이 같거나 거의 같은 보고서 찾기 (전체 파싱 전에 호출)
+
+        SHA-256이 같으면 같은 파일, 앞쪽 DEDUPE_SIMHASH_PAGES 페이지 텍스트의 SimHash가 가까우면
+        다시 올린 같은 보고서로 판단한다. 유사 중복은 색인에 기록해 다음에는 해시만으로 판단한다.
+
+        Args:
+            pdf_path: 다운로드한 PDF 파일 경로
+
+        Returns:
+            원본 보고서 정보 ({'name', 'url', 'match': 'exact' 또는 'near', ...}, 중복이 아니면 None)
+        """
+        if self.dedupe is None:
+            return None
+
+        with metrics.stage('dedupe') as counters:
+            sha256 = pdf_sha256(pdf_path)
+            original = self.dedupe.find_exact(sha256)
+            if original is not None:
+                if original['duplicate_of']:
+                    original = dict(original, name=original['duplicate_of'], match='near')
+                elif original['name'] != self._dedupe_name(pdf_path):
+                    original = dict(original, match='exact')
+                else:
+                    # 자기 자신 (같은 URL을 다시 받은 경우)
+                    return None
+            else:
+                with open_pdf(pdf_path) as pdf:
+                    text = "\n".join(page.extract_text() or '' for page in pdf.pages[:DEDUPE_SIMHASH_PAGES])
+                fingerprint = simhash(text)
+                original = None if fingerprint is None else self.dedupe.find_near(fingerprint, exclude_sha256=sha256)
+                if original is not None:
+                    meta = _load_download_meta(pdf_path.with_name(pdf_path.name + ".meta.json"))
+                    self.dedupe.add(self._dedupe_name(pdf_path), sha256, url=meta.get('url'),
+                                    size=pdf_path.stat().st_size,
+                                    fingerprint=fingerprint, duplicate_of=original['name'])
+                    original['match'] = 'near'
+
+            if original is None:
+                return None
+            if not (self.output_dir / original['name']).exists():
+                # 원본 파일이 지워졌으면 오래된 항목을 지우고 다시 파싱
+                self.dedupe.remove(original['sha256'])
+                return None
+            counters['items'] = 1
+        return original
+
+    def resolve_duplicate(self, pdf_path: Path) -> Path:
+        """
+        이미 파싱한 보고서와 같거나 거의 같으면 원본 PDF 경로를 반환 (원본의 추출 결과와 보고서를 재사용)
+
+        Args:
+            pdf_path: 다운로드한 PDF 파일 경로
+
+        Returns:
+            원본 PDF 경로 (중복이 아니면 pdf_path)
+        """
+        original = self.find_duplicate(pdf_path)
+        if original is None:
+            return pdf_path
+        print(f"[*] 중복 보고서 ({'동일' if original['match'] == 'exact' else '유사'}), 원본 사용: "
+              f"{pdf_path.name} -> {original['name']}")
+        return self.output_dir / original['name']
+
+    def _dedupe_name(self, pdf_path: Path) -> str:
+        """중복 색인에 기록할 이름 (PDF 저장 디렉토리 기준 상대 경로, 밖에 있으면 절대 경로)"""
+        try:
+            return pdf_path.resolve().relative_to(self.output_dir.resolve()).as_posix()
+        except ValueError:
+            return str(pdf_path.resolve())
+
+    def extract_text(self, pdf_path: Path, workers: int = None) -> List[Dict]:
         """
         PDF에서 텍스트와 표 추출
 
         Args:
             pdf_path: PDF 파일 경로
+            workers: 병렬 추출 프로세스 수 (None이면 self.workers)
 
         Returns:
             페이지별 데이터 리스트
         """
-        pages_data = []
+        return list(self.iter_pages(pdf_path, workers))
+
+    def iter_pages(self, pdf_path: Path, workers: int = None) -> Iterator[Dict]:
+        """
+        PDF를 파싱하면서 페이지 데이터를 순서대로 하나씩 반환
+
+        전체 문서를 메모리에 올리지 않으므로 페이지 수가 많은 보고서도
+        첫 페이지부터 바로 후속 처리(save_as_text 등)에 넘길 수 있다.
+
+        Args:
+            pdf_path: PDF 파일 경로
+            workers: 병렬 추출 프로세스 수 (None이면 self.workers)
+
+        Yields:
+            페이지 데이터 ({'page_num', 'text', 'tables'}, OCR 텍스트를 사용한 페이지는 'ocr': True)
+        """
+        pages = self._iter_extracted(pdf_path, workers or self.workers)
+        if 'ocr' in self.extraction_settings():
+            # 이미지 페이지만 OCR 풀로 보내고 나머지 페이지 추출은 계속 진행
+            pages = self.ocr.fill(pages, pdf_path)
+        yield from pages
+
+    def _iter_extracted(self, pdf_path: Path, workers: int) -> Iterator[Dict]:
+        """
+        텍스트 레이어와 표 추출 (단일 프로세스 또는 프로세스 풀)
+
+        Args:
+            pdf_path: PDF 파일 경로
+            workers: 병렬 추출 프로세스 수
+
+        Yields:
+            페이지 데이터 (OCR 대상이면 'needs_ocr': True)
+        """
+
+        settings = self.extraction_settings()
+        timings = {'text': 0.0, 'tables': 0.0}
+        start = time.perf_counter()
 
         print(f"[*] PDF 파싱 중: {pdf_path}")
-        with pdfplumber.open(pdf_path) as pdf:
+        with open_pdf(pdf_path) as pdf:
             total_pages = len(pdf.pages)
-            print(f"[*] 총 페이지 수: {total_pages}")
+            page_indexes = self._select_pages(total_pages)
+            print(f"[*] 총 페이지 수: {total_pages} (추출 대상 {len(page_indexes)}, 모드: {self.mode})")
+
+            if workers <= 1 or len(page_indexes) <= 1:
+                for done, i in enumerate(page_indexes, 1):
+                    page = pdf.pages[i]
+                    page_data = _extract_page(page, i + 1, settings, timings)
+                    # 페이지별 캐시를 비워 메모리를 한 페이지 분량으로 유지
+                    page.close()
+                    # 페이지마다 출력하면 큰 문서에서 출력 비용이 커지므로 간격을 두고 출력
+                    if EXTRACT_PROGRESS_EVERY and (done % EXTRACT_PROGRESS_EVERY == 0 or done == len(page_indexes)):
+                        print(f"[*] 페이지 {i + 1} 처리 완료 ({done}/{len(page_indexes)})")
+                    yield page_data
+
+                _record_extract_metrics(start, timings, len(page_indexes))
+                print(f"[OK] PDF 파싱 완료")
+                return
+
+        yield from self._iter_parallel(pdf_path, page_indexes, workers, settings, timings)
+        _record_extract_metrics(start, timings, len(page_indexes))
+        print(f"[OK] PDF 파싱 완료 (프로세스 {workers}개)")
+
+    def _select_pages(self, total_pages: int) -> List[int]:
+        """
+        추출할 페이지 인덱스 (0부터 시작) 목록
 
-            for i, page in enumerate(pdf.pages, 1):
-                page_data = {
-                    'page_num': i,
-                    'text': '',
-                    'tables': []
-                }
+        Args:
+            total_pages: 총 페이지 수
 
-                # 텍스트 추출
-                text = page.extract_text()
-                if text:
-                    page_data['text'] = text
+        Returns:
+            페이지 인덱스 리스트
+        """
+        if not self.pages:
+            return list(range(total_pages))
+        return parse_page_ranges(self.pages, total_pages)
 
-                # 표 추출
-                tables = page.extract_tables()
-                if tables:
-                    page_data['tables'] = tables
+    def _iter_parallel(self, pdf_path: Path, page_indexes: List[int], workers: int,
+                       settings: Dict, timings: Dict[str, float] = None) -> Iterator[Dict]:
+        """
+        페이지 범위를 프로세스 풀에 나눠 추출한 뒤 페이지 순서대로 반환
 
-                pages_data.append(page_data)
-                print(f"[*] 페이지 {i}/{total_pages} 처리 완료")
+        처리 중인 범위를 작업자 수만큼으로 제한하여 완료되었지만 아직 소비되지 않은
+        결과가 메모리에 쌓이지 않도록 함
 
-        print(f"[OK] PDF 파싱 완료")
-        return pages_data
+        Args:
+            pdf_path: PDF 파일 경로
+            page_indexes: 추출할 페이지 인덱스 리스트
+            workers: 프로세스 수
+            settings: 추출 설정 (extraction_settings)
+            timings: 작업자가 측정한 텍스트/표 추출 시간을 누적할 dict
 
-    def save_as_text(self, pages_data: List[Dict], output_path: Path):
+        Yields:
+            페이지 데이터
         """
-        추출된 데이터를 텍스트 파일로 저장
+        ranges = _split_page_ranges(page_indexes, workers)
+        pending_ranges = iter(ranges)
+        in_flight = deque()
+
+        with ProcessPoolExecutor(max_workers=min(workers, len(ranges))) as executor:
+            def submit_next():
+                chunk = next(pending_ranges, None)
+                if chunk is not None:
+                    in_flight.append((chunk, executor.submit(_extract_page_range, str(pdf_path), chunk, settings)))
+
+            for _ in range(workers):
+                submit_next()
+
+            # 제출 순서대로 결과를 꺼내 페이지 순서 유지
+            while in_flight:
+                chunk, future = in_flight.popleft()
+                pages_data, chunk_timings = future.result()
+                submit_next()
+                if timings is not None:
+                    for name, seconds in chunk_timings.items():
+                        timings[name] += seconds
+                print(f"[*] 페이지 {chunk[0] + 1}-{chunk[-1] + 1} 처리 완료")
+                yield from pages_data
+
+    def page_count(self, pdf_path: Path) -> int:
+        """
+        추출 대상 페이지 수 (페이지 범위가 지정되지 않았으면 PDF 총 페이지 수)
+
+        Args:
+            pdf_path: PDF 파일 경로
+
+        Returns:
+            페이지 수
+        """
+        return len(self.page_indexes(pdf_path))
+
+    def page_indexes(self, pdf_path: Path) -> List[int]:
+        """
+        추출 대상 페이지 인덱스 (0부터 시작, 페이지 범위 설정 반영)
+
+        Args:
+            pdf_path: PDF 파일 경로
+
+        Returns:
+            페이지 인덱스 리스트
+        """
+        with open_pdf(pdf_path) as pdf:
+            return self._select_pages(len(pdf.pages))
+
+    def stream_to_text(self, pdf_path: Path, output_path: Path, workers: int = None) -> Iterator[Dict]:
+        """
+        페이지를 파싱하는 즉시 텍스트 파일에 기록하면서 페이지 데이터를 반환
 
         Args:
-            pages_data: 페이지별 데이터
+            pdf_path: PDF 파일 경로
             output_path: 저장할 텍스트 파일 경로
+            workers: 병렬 추출 프로세스 수 (None이면 self.workers)
+
+        Yields:
+            페이지 데이터
         """
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(f"총 페이지 수: {len(pages_data)}\n")
-            f.write("=" * 80 + "\n")
+        exporter = TextExporter(output_path, self.page_count(pdf_path))
+        try:
+            for page_data in self.iter_pages(pdf_path, workers):
+                exporter.write_page(page_data)
+                yield page_data
+        finally:
+            exporter.close()
 
-            for page_data in pages_data:
-                f.write(f"\n[페이지 {page_data['page_num']}]\n")
-                f.write("-" * 80 + "\n")
-                f.write(page_data['text'] + "\n")
+        print(f"[OK] 텍스트 파일 저장: {output_path}")
 
-                if page_data['tables']:
-                    f.write(f"\n[표 {len(page_data['tables'])}개 발견]\n")
-                    for j, table in enumerate(page_data['tables'], 1):
-                        f.write(f"\n<표 {j}>\n")
-                        for row in table:
-                            f.write(" | ".join([str(cell) if cell else "" for cell in row]) + "\n")
+    def save_as_text(self, pages_data: Iterable[Dict], output_path: Path, total_pages: int = None):
+        """
+        추출된 데이터를 텍스트 파일로 저장
 
-                f.write("=" * 80 + "\n")
+        Args:
+            pages_data: 페이지별 데이터 (리스트 또는 iter_pages 이터레이터)
+            output_path: 저장할 텍스트 파일 경로
+            total_pages: 총 페이지 수 (이터레이터를 넘길 때 필요, None이면 len(pages_data))
+        """
+        if total_pages is None:
+            total_pages = len(pages_data)
+
+        with metrics.stage('write_text') as counters:
+            exporter = TextExporter(output_path, total_pages)
+            try:
+                for page_data in pages_data:
+                    exporter.write_page(page_data)
+                    counters['items'] += 1
+            finally:
+                counters['bytes'] = exporter.close()
 
         print(f"[OK] 텍스트 파일 저장: {output_path}")
 
 
-def download_report(url: str, output_dir: Path = None) -> Tuple[Path, List[Dict]]:
+def url_filename(url: str) -> str:
+    """
+    URL 경로의 마지막 부분으로 저장할 파일명 결정 (쿼리 문자열 제외, 파일명에 쓸 수 없는 문자는 '_')
+
+    Args:
+        url: PDF URL
+
+    Returns:
+        파일명 (경로가 비어 있으면 'report.pdf')
+    """
+    name = UNSAFE_NAME_CHARS.sub('_', unquote(urlsplit(url).path.rsplit('/', 1)[-1])).lstrip('.')
+    return name or 'report.pdf'
+
+
+def pdf_sha256(pdf_path: Path) -> str:
+    """
+    PDF 내용 해시 (다운로드하면서 기록한 해시가 있고 파일이 그대로이면 파일을 다시 읽지 않음)
+
+    Args:
+        pdf_path: PDF 파일 경로
+
+    Returns:
+        16진수 SHA-256
+    """
+    meta = _load_download_meta(pdf_path.with_name(pdf_path.name + ".meta.json"))
+    if meta.get('sha256'):
+        stat = pdf_path.stat()
+        if meta.get('size') == stat.st_size and meta.get('mtime_ns') == stat.st_mtime_ns:
+            return meta['sha256']
+    return file_sha256(pdf_path)
+
+
+def _load_download_meta(meta_path: Path, url: str = None) -> Dict:
+    """
+    저장된 다운로드 메타데이터(ETag/Last-Modified) 로드
+
+    Args:
+        meta_path: 메타데이터 파일 경로
+        url: 현재 요청 URL (다른 URL의 메타데이터는 무시, None이면 URL 확인 안 함)
+
+    Returns:
+        메타데이터 (없으면 빈 dict)
+    """
+    try:
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+    return meta if url is None or meta.get('url') == url else {}
+
+
+def _save_download_meta(meta_path: Path, meta: Dict):
+    """다운로드 메타데이터 저장"""
+    tmp_path = meta_path.with_name(meta_path.name + ".tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False)
+    os.replace(tmp_path, meta_path)
+
+
+def _content_range_start(response: requests.Response) -> int:
+    """
+    206 응답의 Content-Range 시작 위치 파싱
+
+    Returns:
+        시작 바이트 위치 (파싱 실패 시 -1)
+    """
+    content_range = response.headers.get('Content-Range', '')
+    try:
+        return int(content_range.split()[1].split('-')[0])
+    except (IndexError, ValueError):
+        return -1
+
+
+def parse_page_ranges(spec: str, total_pages: int) -> List[int]:
+    """
+    페이지 범위 문자열 파싱
+
+    Args:
+        spec: 1부터 시작하는 페이지 범위 (예: "1-3,10", "5-")
+        total_pages: 총 페이지 수 (범위를 벗어난 페이지는 제외)
+
+    Returns:
+        정렬된 페이지 인덱스 리스트 (0부터 시작)
+    """
+    indexes = set()
+    for part in spec.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        try:
+            if '-' in part:
+                first, last = part.split('-', 1)
+                first = int(first) if first.strip() else 1
+                last = int(last) if last.strip() else max(first, total_pages)
+            else:
+                first = last = int(part)
+        except ValueError:
+            raise ValueError(f"잘못된 페이지 범위: {part!r} (예: \"1-3,10\")")
+        if first < 1 or last < first:
+            raise ValueError(f"잘못된 페이지 범위: {part!r} (예: \"1-3,10\")")
+        indexes.update(range(first - 1, min(last, total_pages)))
+    return sorted(indexes)
+
+
+def _has_ruling_lines(page, min_objects: int) -> bool:
+    """
+    표 추출 전 사전 검사: 표 테두리가 될 수 있는 선/사각형/곡선 객체 수 확인
+
+    pdfplumber 기본 표 탐지(lines 전략)는 이 객체들의 변(edge)으로 셀을 구성하므로
+    하나도 없는 페이지는 extract_tables()를 호출해도 결과가 비어 있음
+
+    Args:
+        page: pdfplumber 페이지 객체
+        min_objects: 표 추출을 시도할 최소 객체 수
+
+    Returns:
+        표 추출을 시도할지 여부
+    """
+    if min_objects <= 0:
+        return True
+    objects = page.objects
+    count = len(objects.get('line', ())) + len(objects.get('rect', ())) + len(objects.get('curve', ()))
+    return count >= min_objects
+
+
+def _extract_page(page, page_num: int, settings: Dict = None, timings: Dict[str, float] = None) -> Dict:
+    """
+    단일 페이지에서 텍스트와 표 추출
+
+    Args:
+        page: pdfplumber 페이지 객체
+        page_num: 페이지 번호 (1부터 시작)
+        settings: 추출 설정 (mode, table_min_ruling, table_format, ocr), None이면 텍스트와 표 모두 추출
+        timings: 텍스트/표 추출 시간을 누적할 dict ({'text', 'tables'}, None이면 측정 안 함)
+
+    Returns:
+        페이지 데이터
+    """
+    settings = settings or {}
+    want_text, want_tables = EXTRACT_MODES[settings.get('mode', 'full')]
+
+    page_data = {
+        'page_num': page_num,
+        'text': '',
+        'tables': []
+    }
+
+    # 텍스트 추출 (글자가 거의 없는 이미지 페이지는 OCR 대상으로 표시)
+    start = time.perf_counter()
+    if want_text:
+        text = page.extract_text()
+        if text:
+            page_data['text'] = text
+        ocr_settings = settings.get('ocr')
+        if ocr_settings and needs_ocr(page, page_data['text'], ocr_settings['min_chars']):
+            page_data['needs_ocr'] = True
+    text_done = time.perf_counter()
+
+    # 표 추출 (선이 없는 본문/차트 페이지는 생략)
+    if want_tables and _has_ruling_lines(page, settings.get('table_min_ruling', 0)):
+        tables = page.extract_tables()
+        if tables:
+            # 작업자 프로세스에서 변환하면 결과 전달량도 줄어듦
+            page_data['tables'] = to_columnar(tables) if settings.get('table_format') == 'columnar' else tables
+
+    if timings is not None:
+        timings['text'] += text_done - start
+        timings['tables'] += time.perf_counter() - text_done
+
+    return page_data
+
+
+@contextmanager
+def open_pdf(pdf_path: Path) -> Iterator:
+    """
+    PDF를 읽기 전용 mmap 위에서 열기
+
+    병렬 추출 작업자들이 같은 파일을 mmap하면 페이지 캐시를 공유하므로
+    큰 PDF도 작업자 수만큼 메모리를 더 쓰지 않는다.
+
+    Args:
+        pdf_path: PDF 파일 경로
+
+    Yields:
+        pdfplumber.PDF
+    """
+    import pdfplumber
+
+    with open_mapped(pdf_path) as buffer, pdfplumber.open(buffer) as pdf:
+        yield pdf
+
+
+def _extract_page_range(pdf_path: str, page_indexes: List[int], settings: Dict) -> Tuple[List[Dict], Dict[str, float]]:
+    """
+    워커 프로세스용: PDF를 직접 열어 지정된 페이지 추출
+
+    Args:
+        pdf_path: PDF 파일 경로
+        page_indexes: 페이지 인덱스 리스트 (0부터 시작)
+        settings: 추출 설정 (extraction_settings)
+
+    Returns:
+        (페이지별 데이터 리스트, 텍스트/표 추출 시간)
+    """
+    pages_data = []
+    timings = {'text': 0.0, 'tables': 0.0}
+    with open_pdf(pdf_path) as pdf:
+        for i in page_indexes:
+            page = pdf.pages[i]
+            pages_data.append(_extract_page(page, i + 1, settings, timings))
+            page.close()
+    return pages_data, timings
+
+
+def _record_extract_metrics(start: float, timings: Dict[str, float], pages: int):
+    """추출 전체 시간과 페이지별 텍스트/표 추출 시간 합계 기록 (병렬이면 작업자 시간의 합)"""
+    metrics.record('extract', time.perf_counter() - start, items=pages)
+    metrics.record('extract_text', timings['text'], items=pages)
+    metrics.record('extract_tables', timings['tables'], items=pages)
+
+
+def _split_page_ranges(page_indexes: List[int], workers: int) -> List[List[int]]:
+    """
+    추출할 페이지를 순서를 유지한 채 묶음으로 분할
+
+    워커당 2개 정도의 묶음을 만들어 표가 많은 페이지가 한쪽에 몰려도 부하가 고르게 분산되도록 함
+
+    Args:
+        page_indexes: 페이지 인덱스 리스트
+        workers: 프로세스 수
+
+    Returns:
+        페이지 인덱스 묶음 리스트
+    """
+    chunk_size = max(1, math.ceil(len(page_indexes) / (workers * 2)))
+    return [page_indexes[start:start + chunk_size] for start in range(0, len(page_indexes), chunk_size)]
+
+
+def download_report(url: str, output_dir: Path = None, workers: int = None, use_cache: bool = None,
+                    mode: str = None, pages: str = None, use_index: bool = None) -> Tuple[Path, List[Dict]]:
     """
     보고서 다운로드 및 파싱 헬퍼 함수
 
     Args:
         url: PDF URL
         output_dir: 저장 디렉토리
+        workers: 병렬 추출 프로세스 수 (None이면 설정값)
+        use_cache: 추출 캐시 사용 여부 (None이면 설정값)
+        mode: 추출 모드 ('full', 'text', 'tables', None이면 설정값)
+        pages: 추출할 페이지 범위 (예: "1-3,10", None이면 전체)
+        use_index: 전문 검색 인덱스에 추가할지 여부 (None이면 설정값)
 
     Returns:
-        (PDF 파일 경로, 페이지 데이터)
+        (PDF 파일 경로, 페이지 데이터), 이미 파싱한 보고서와 중복이면 원본 PDF 경로와 원본의 페이지 데이터
     """
-    downloader = PDFDownloader(output_dir)
-    pdf_path = downloader.download(url)
-    pages_data = downloader.extract_text(pdf_path)
-
-    # 텍스트 파일로도 저장
-    txt_path = pdf_path.with_suffix('.txt')
-    downloader.save_as_text(pages_data, txt_path)
+    if use_cache is None:
+        use_cache = USE_EXTRACT_CACHE
+    if use_index is None:
+        use_index = USE_SEARCH_INDEX
+
+    downloader = PDFDownloader(output_dir, workers=workers, cache=ExtractionCache() if use_cache else None,
+                               mode=mode, pages=pages, search_index=SearchIndex() if use_index else None,
+                               ocr=create_ocr_pool(), dedupe=DedupeIndex() if USE_DEDUPE else None)
+    pdf_path = downloader.resolve_duplicate(downloader.download(url))
+    pages_data = downloader.extract_and_save(pdf_path)
 
     return pdf_path, pages_data
 
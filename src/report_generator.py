@@ -1,32 +1,131 @@
 """
 인터랙티브 HTML 보고서 생성 모듈
 """
+import os
 import json
+import hashlib
 import argparse
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Dict, List
-from jinja2 import Template
+from jinja2 import (ChoiceLoader, DictLoader, Environment, FileSystemBytecodeCache, FileSystemLoader, Template,
+                    select_autoescape)
+from markupsafe import Markup
 
-from .config import OUTPUT_DIR, TEMPLATE_DIR, DATA_DIR
-from .pdf_downloader import download_report
+from .config import (OUTPUT_DIR, TEMPLATE_DIR, DATA_DIR, TEMPLATE_CACHE_DIR, USE_EXTRACT_CACHE, USE_SEARCH_INDEX,
+                     USE_HISTORY_STORE, USE_DEDUPE, CHART_JS_URL, CHART_JS_VENDOR_PATH, REPORT_DATA_INLINE_MAX_ROWS, STOCK_TABLE_VIRTUAL_MIN_ROWS)
+from . import metrics
+from .build_manifest import BuildManifest, hash_data
+from .extract_cache import ExtractionCache, file_sha256
+from .file_io import clone_file, link_or_clone
+from .report_parser import extract_report_data
+from .history_store import HistoryStore
+from .search_index import SearchIndex
+
+# 템플릿 파일이 없을 때 사용하는 내장 템플릿 이름
+DEFAULT_TEMPLATE_NAME = "__default__.html"
+INDEX_TEMPLATE_NAME = "__index__.html"
+
+# 일괄 생성 시 공유 CSS/JS를 저장하는 디렉토리 (OUTPUT_DIR 기준)
+ASSETS_DIRNAME = "assets"
+CHART_JS_ASSET = "chart.umd.min.js"
+
+# 추천 종목 표의 열 (브라우저로 보내는 열 단위 데이터의 키)
+STOCK_FIELDS = ("name", "per", "pbr", "op_3m", "dividend", "target_1m")
+
+# 컴파일된 템플릿 바이트코드 파일 이름 (자동 이스케이프 없이 컴파일된 이전 캐시를 쓰지 않도록 구분)
+BYTECODE_CACHE_PATTERN = "__jinja2_autoescape_%s.cache"
+
+# 보고서 데이터를 별도 파일로 저장할 때의 확장자 (file://로 열어도 동작하도록 JSON 대신 스크립트)
+DATA_FILE_SUFFIX = ".data.js"
+
+# PDF 게시 방식: link(하드링크, 불가하면 복사), copy(복사), reference(원본 경로 참조)
+PDF_PUBLISH_MODES = ("link", "copy", "reference")
 
 
 class ReportGenerator:
     """HTML 보고서 생성기"""
 
-    def __init__(self, template_path: Path = None):
+    # 템플릿 디렉토리별 jinja2 Environment (같은 프로세스의 모든 인스턴스가 컴파일 결과 공유)
+    _environments: Dict[Path, Environment] = {}
+
+    def __init__(self, template_path: Path = None, output_dir: Path = None):
         self.template_path = template_path or (TEMPLATE_DIR / "report_template.html")
-        self.output_dir = OUTPUT_DIR
+        self.output_dir = output_dir or OUTPUT_DIR
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.env = self._get_environment(self.template_path.parent)
+
+    def _get_environment(self, template_dir: Path) -> Environment:
+        """
+        템플릿 디렉토리용 jinja2 Environment 반환 (없으면 생성)
+
+        컴파일된 템플릿은 Environment 안에 캐시되며, auto_reload로 파일 수정 시각이
+        바뀌면 다시 컴파일한다. 바이트코드는 디스크에도 저장되어 새 프로세스에서도 재사용된다.
+        보고서 제목, 종목명 등은 내려받거나 업로드된 PDF에서 추출한 값이므로 .html 템플릿은 자동 이스케이프한다.
+
+        Args:
+            template_dir: 템플릿 파일 디렉토리
+
+        Returns:
+            jinja2 Environment
+        """
+        env = self._environments.get(template_dir)
+        if env is None:
+            TEMPLATE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            env = Environment(
+                loader=ChoiceLoader([
+                    FileSystemLoader(str(template_dir)),
+                    DictLoader({
+                        DEFAULT_TEMPLATE_NAME: self._get_default_template(),
+                        "__default__.css": self._get_default_css(),
+                        "__default__.js": self._get_default_js(),
+                        INDEX_TEMPLATE_NAME: self._get_index_template(),
+                    }),
+                ]),
+                bytecode_cache=FileSystemBytecodeCache(str(TEMPLATE_CACHE_DIR), BYTECODE_CACHE_PATTERN),
+                autoescape=select_autoescape(['html']),
+                auto_reload=True,
+            )
+            self._environments[template_dir] = env
+        return env
+
+    def get_template(self) -> Template:
+        """
+        컴파일된 템플릿 반환 (템플릿 파일이 없으면 기본 템플릿)
 
-    def generate(self, report_data: Dict, pdf_filename: str, output_filename: str = None) -> Path:
+        Returns:
+            jinja2 Template
+        """
+        if self.template_path.exists():
+            return self.env.get_template(self.template_path.name)
+        return self.env.get_template(DEFAULT_TEMPLATE_NAME)
+
+    def template_fingerprint(self) -> str:
+        """
+        사용 중인 템플릿 소스(본문 + 기본 CSS/JS)의 해시 (증분 빌드 판단용)
+
+        Returns:
+            16진수 해시 문자열
+        """
+        name = self.template_path.name if self.template_path.exists() else DEFAULT_TEMPLATE_NAME
+        sources = [self.env.loader.get_source(self.env, template_name)[0]
+                   for template_name in (name, "__default__.css", "__default__.js")]
+        vendor_js = vendored_chart_js()
+        sources.append(hashlib.sha256(vendor_js.encode('utf-8')).hexdigest() if vendor_js else CHART_JS_URL)
+        # 자동 이스케이프 적용 전에 생성한 HTML도 다시 생성되도록 렌더링 방식 포함
+        sources.append('autoescape:html')
+        return hash_data(sources)
+
+    def generate(self, report_data: Dict, pdf_filename: str, output_filename: str = None,
+                 assets_url: str = None) -> Path:
         """
         HTML 보고서 생성
 
         Args:
             report_data: 보고서 데이터
-            pdf_filename: PDF 파일명
+            pdf_filename: PDF 파일명 (HTML 기준 상대 경로)
             output_filename: 출력 HTML 파일명
+            assets_url: 공유 CSS/JS 경로 (None이면 HTML에 인라인 포함)
 
         Returns:
             생성된 HTML 파일 경로
@@ -34,31 +133,177 @@ class ReportGenerator:
         if output_filename is None:
             output_filename = "report.html"
 
-        # 템플릿 로드
-        if self.template_path.exists():
-            with open(self.template_path, 'r', encoding='utf-8') as f:
-                template_content = f.read()
-        else:
-            # 기본 템플릿 사용
-            template_content = self._get_default_template()
+        # 템플릿 로드 (컴파일 결과 캐시 사용)
+        template = self.get_template()
 
-        template = Template(template_content)
+        # 차트/표 데이터: 작으면 HTML에 JSON으로 포함, 크면 따로 캐시되는 data.js로 분리
+        # 종목이 많으면 표 행을 HTML로 만들지 않고 브라우저에서 보이는 행만 렌더링
+        top_stocks = report_data.get('top_stocks', [])
+        virtual_table = len(top_stocks) > STOCK_TABLE_VIRTUAL_MIN_ROWS
+        payload = script_json({'top_stocks': stock_columns(top_stocks)})
+        data_url = None
+        if len(top_stocks) > REPORT_DATA_INLINE_MAX_ROWS:
+            data_url = self.write_data_file(payload, output_filename)
+            payload = None
 
-        # HTML 생성
-        html_content = template.render(
+        # Chart.js: 내려받은 파일이 있으면 공유 assets 또는 HTML 안(실행하지 않는 text/plain)에 포함
+        vendor_js = vendored_chart_js()
+        chart_js_url = f"{assets_url}/{CHART_JS_ASSET}" if vendor_js and assets_url else CHART_JS_URL
+        chart_js_inline = script_text(vendor_js) if vendor_js and not assets_url else None
+
+        # HTML 생성 후 전체 문자열을 만들지 않고 파일로 바로 기록
+        stream = template.stream(
             data=report_data,
             pdf_filename=pdf_filename,
-            json_data=json.dumps(report_data.get('top_stocks', []))
+            json_data=script_json(top_stocks),
+            report_json=payload,
+            data_url=data_url,
+            virtual_table=virtual_table,
+            chart_js_url=chart_js_url,
+            chart_js_inline=chart_js_inline,
+            assets_url=assets_url
         )
+        stream.enable_buffering(size=64)
 
-        # 파일 저장
         output_path = self.output_dir / output_filename
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+        with metrics.stage('render') as counters:
+            stream.dump(str(output_path), encoding='utf-8')
+            counters['items'] = 1
+            counters['bytes'] = os.path.getsize(output_path)
 
         print(f"[OK] HTML 보고서 생성: {output_path}")
         return output_path
 
+    def generate_batch(self, reports: List[Dict], workers: int = 1, pdf_mode: str = "link",
+                       index_filename: str = "index.html", force: bool = False) -> List[Path]:
+        """
+        여러 보고서를 한 번에 생성
+
+        CSS/JS는 assets/ 아래에 한 번만 기록해 모든 HTML이 공유하고,
+        PDF는 복사 대신 하드링크 또는 원본 경로 참조로 게시하며, 목록 페이지를 함께 만든다.
+        빌드 매니페스트와 비교해 PDF, report_data, 템플릿이 모두 그대로인 보고서는 다시 렌더링하지 않는다.
+
+        Args:
+            reports: 보고서 목록 ({'report_data', 'pdf_path', 'output_filename'})
+            workers: 렌더링 프로세스 수 (1이면 현재 프로세스에서 처리)
+            pdf_mode: PDF 게시 방식 ('link', 'copy', 'reference')
+            index_filename: 목록 페이지 파일명 (None이면 생성 안 함)
+            force: True이면 매니페스트와 관계없이 모두 다시 생성
+
+        Returns:
+            생성된 HTML 파일 경로 리스트 (입력 순서)
+        """
+        assets_url = self.write_assets()
+        manifest = BuildManifest(self.output_dir)
+        template_hash = self.template_fingerprint()
+
+        jobs = []
+        for i, report in enumerate(reports, 1):
+            output_filename = report.get('output_filename') or f"report_{i}.html"
+            pdf_path = Path(report['pdf_path'])
+            pdf_href = publish_pdf(pdf_path, self.output_dir, pdf_mode)
+            inputs = {
+                'pdf': file_sha256(pdf_path),
+                'report_data': hash_data(report['report_data']),
+                'template': template_hash,
+                'pdf_href': pdf_href,
+                'assets_url': assets_url,
+            }
+            jobs.append((report['report_data'], pdf_href, output_filename, inputs))
+
+        stale = [job for job in jobs if force or not manifest.is_fresh(job[2], job[3])]
+        if len(stale) < len(jobs):
+            print(f"[OK] 변경 없는 보고서 {len(jobs) - len(stale)}개 건너뜀")
+
+        if workers <= 1 or len(stale) <= 1:
+            for data, pdf_href, output_filename, _ in stale:
+                self.generate(data, pdf_href, output_filename, assets_url)
+        else:
+            # 작업자 프로세스의 렌더링은 단계별로 나누지 않고 전체 시간만 기록
+            with metrics.stage('render_parallel') as counters, ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(_render_report, str(self.template_path), str(self.output_dir),
+                                           data, pdf_href, output_filename, assets_url)
+                           for data, pdf_href, output_filename, _ in stale]
+                for future in futures:
+                    future.result()
+                counters['items'] = len(futures)
+
+        for _, _, output_filename, inputs in stale:
+            manifest.record(output_filename, inputs)
+        manifest.save()
+
+        html_paths = [self.output_dir / job[2] for job in jobs]
+        if index_filename:
+            self.generate_index(
+                [(job[0], path.name) for job, path in zip(jobs, html_paths)],
+                index_filename,
+                assets_url,
+            )
+
+        print(f"[OK] 보고서 {len(html_paths)}개 일괄 생성 완료")
+        return html_paths
+
+    def write_data_file(self, payload: str, output_filename: str) -> str:
+        """
+        보고서 데이터를 HTML 옆의 <이름>.data.js로 저장 (내용이 같으면 다시 쓰지 않음)
+
+        Args:
+            payload: script_json으로 만든 JSON 문자열
+            output_filename: 출력 HTML 파일명
+
+        Returns:
+            HTML에서 참조할 경로 (내용 해시를 쿼리로 붙여 바뀌었을 때만 새로 받음)
+        """
+        data_path = (self.output_dir / output_filename).with_suffix(DATA_FILE_SUFFIX)
+        content = f"window.REPORT_DATA = {payload};\n"
+        _write_if_changed(data_path, content)
+        digest = hashlib.sha256(content.encode('utf-8')).hexdigest()[:12]
+        return f"{data_path.name}?v={digest}"
+
+    def write_assets(self) -> str:
+        """
+        공유 CSS/JS 파일을 OUTPUT_DIR/assets에 기록 (내용이 같으면 다시 쓰지 않음)
+
+        Returns:
+            HTML에서 참조할 assets 경로
+        """
+        assets_dir = self.output_dir / ASSETS_DIRNAME
+        assets_dir.mkdir(parents=True, exist_ok=True)
+
+        for template_name, filename in (("__default__.css", "report.css"), ("__default__.js", "report.js")):
+            _write_if_changed(assets_dir / filename, self.env.get_template(template_name).render())
+
+        vendor_js = vendored_chart_js()
+        if vendor_js:
+            _write_if_changed(assets_dir / CHART_JS_ASSET, vendor_js)
+
+        return ASSETS_DIRNAME
+
+    def generate_index(self, entries: List[tuple], index_filename: str = "index.html",
+                       assets_url: str = None) -> Path:
+        """
+        보고서 목록 페이지 생성
+
+        Args:
+            entries: (보고서 데이터, HTML 파일명) 리스트
+            index_filename: 목록 페이지 파일명
+            assets_url: 공유 CSS 경로
+
+        Returns:
+            목록 페이지 경로
+        """
+        reports = [{'data': data, 'href': href} for data, href in entries]
+        reports.sort(key=lambda report: str(report['data'].get('date', '')), reverse=True)
+
+        output_path = self.output_dir / index_filename
+        self.env.get_template(INDEX_TEMPLATE_NAME).stream(
+            reports=reports,
+            assets_url=assets_url
+        ).dump(str(output_path), encoding='utf-8')
+
+        print(f"[OK] 목록 페이지 생성: {output_path}")
+        return output_path
+
     def _get_default_template(self) -> str:
         """기본 템플릿 반환"""
         return """<!DOCTYPE html>
@@ -67,83 +312,19 @@ class ReportGenerator:
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>{{ data.title }} - {{ data.subtitle }}</title>
-    <script src="https://cdn.jsdelivr.net/npm/chart.js"></script>
+    {% if assets_url %}
+    <link rel="stylesheet" href="{{ assets_url }}/report.css">
+    <script src="{{ assets_url }}/report.js" defer></script>
+    {% else %}
     <style>
-        * { margin: 0; padding: 0; box-sizing: border-box; }
-        body { font-family: 'Segoe UI', 'Malgun Gothic', sans-serif; background: #f5f7fa; color: #333; line-height: 1.6; }
-        .header { background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 2rem 0; box-shadow: 0 4px 6px rgba(0,0,0,0.1); }
-        .container { max-width: 1400px; margin: 0 auto; padding: 0 1rem; }
-        .header h1 { font-size: 2.5rem; margin-bottom: 0.5rem; font-weight: 700; }
-        .header .meta { opacity: 0.9; font-size: 1.1rem; }
-        .tabs { background: white; margin-top: -2rem; border-radius: 10px; box-shadow: 0 2px 8px rgba(0,0,0,0.1); overflow: hidden; }
-        .tab-buttons { display: flex; border-bottom: 2px solid #e0e0e0; background: #fafafa; overflow-x: auto; -webkit-overflow-scrolling: touch; }
-        .tab-button { flex: 1; min-width: 100px; padding: 1.2rem 0.5rem; background: none; border: none; cursor: pointer; font-size: 1rem; font-weight: 600; color: #666; transition: all 0.3s; position: relative; white-space: nowrap; }
-        .tab-button:hover { background: #f0f0f0; color: #333; }
-        .tab-button.active { color: #667eea; background: white; }
-        .tab-button.active::after { content: ''; position: absolute; bottom: -2px; left: 0; right: 0; height: 3px; background: #667eea; }
-        .tab-content { display: none; padding: 1.5rem; animation: fadeIn 0.5s; }
-        .tab-content.active { display: block; }
-        @keyframes fadeIn { from { opacity: 0; transform: translateY(10px); } to { opacity: 1; transform: translateY(0); } }
-        .summary-grid { display: grid; grid-template-columns: repeat(auto-fit, minmax(280px, 1fr)); gap: 1rem; margin-bottom: 2rem; }
-        .card { background: white; padding: 1.5rem; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.08); border-left: 4px solid #667eea; }
-        .card h3 { color: #667eea; margin-bottom: 1rem; font-size: 1.2rem; display: flex; align-items: center; gap: 0.5rem; }
-        .card h3::before { content: '▶'; font-size: 0.8rem; }
-        .card ul { list-style: none; }
-        .card li { padding: 0.5rem 0; border-bottom: 1px solid #f0f0f0; padding-left: 1.5rem; position: relative; font-size: 0.95rem; }
-        .card li:last-child { border-bottom: none; }
-        .card li::before { content: '•'; position: absolute; left: 0; color: #667eea; font-weight: bold; }
-        .table-wrapper { overflow-x: auto; -webkit-overflow-scrolling: touch; }
-        .stock-table { width: 100%; min-width: 600px; border-collapse: collapse; background: white; border-radius: 8px; overflow: hidden; box-shadow: 0 2px 4px rgba(0,0,0,0.08); }
-        .stock-table thead { background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; }
-        .stock-table th { padding: 0.8rem 0.5rem; text-align: left; font-weight: 600; font-size: 0.9rem; }
-        .stock-table td { padding: 0.8rem 0.5rem; border-bottom: 1px solid #f0f0f0; font-size: 0.9rem; }
-        .stock-table tbody tr:active { background: #f8f9ff; }
-        .positive { color: #e74c3c; font-weight: 600; }
-        .negative { color: #3498db; font-weight: 600; }
-        .chart-container { background: white; padding: 1rem; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.08); margin-bottom: 1.5rem; height: 300px; }
-        .pdf-viewer { background: white; padding: 0.5rem; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.08); margin-top: 1rem; }
-        .pdf-viewer iframe { width: 100%; height: 500px; border: none; border-radius: 4px; }
-        .badge { display: inline-block; padding: 0.25rem 0.6rem; border-radius: 20px; font-size: 0.8rem; font-weight: 600; }
-        .badge-high { background: #e74c3c; color: white; }
-        .badge-medium { background: #f39c12; color: white; }
-        .badge-low { background: #95a5a6; color: white; }
-        .msci-grid { display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 0.8rem; }
-        .msci-item { background: #f8f9ff; padding: 0.8rem; border-radius: 6px; display: flex; justify-content: space-between; align-items: center; border-left: 3px solid #667eea; font-size: 0.9rem; }
-        .footer { text-align: center; padding: 1.5rem; color: #999; margin-top: 2rem; font-size: 0.9rem; }
-
-        /* 모바일 최적화 */
-        @media (max-width: 768px) {
-            .header h1 { font-size: 1.8rem; }
-            .header .meta { font-size: 0.9rem; line-height: 1.4; }
-            .container { padding: 0 0.5rem; margin-top: 2rem !important; }
-            .tabs { margin-top: -1rem; border-radius: 8px; }
-            .tab-button { font-size: 0.85rem; padding: 1rem 0.3rem; min-width: 80px; }
-            .tab-content { padding: 1rem; }
-            .tab-content h2 { font-size: 1.3rem; margin-bottom: 1rem !important; }
-            .summary-grid { grid-template-columns: 1fr; gap: 1rem; }
-            .card { padding: 1rem; }
-            .card h3 { font-size: 1.1rem; }
-            .card li { font-size: 0.9rem; padding: 0.4rem 0 0.4rem 1.2rem; }
-            .stock-table { min-width: 550px; font-size: 0.85rem; }
-            .stock-table th, .stock-table td { padding: 0.6rem 0.4rem; }
-            .chart-container { height: 250px; padding: 0.5rem; }
-            .pdf-viewer iframe { height: 400px; }
-            .msci-grid { grid-template-columns: 1fr; gap: 0.6rem; }
-            .msci-item { padding: 0.7rem; font-size: 0.85rem; }
-            .footer { padding: 1rem; font-size: 0.85rem; }
-        }
-
-        @media (max-width: 480px) {
-            .header h1 { font-size: 1.5rem; }
-            .header .meta { font-size: 0.8rem; }
-            .tab-button { font-size: 0.75rem; padding: 0.8rem 0.2rem; min-width: 70px; }
-            .stock-table { min-width: 500px; font-size: 0.8rem; }
-            .chart-container { height: 200px; }
-            .pdf-viewer iframe { height: 350px; }
-        }
+{% include "__default__.css" %}
     </style>
+    {% endif %}
+    {% if data_url %}
+    <link rel="prefetch" href="{{ data_url }}" as="script">
+    {% endif %}
 </head>
-<body>
+<body data-chartjs="{{ chart_js_url }}"{% if data_url %} data-report-data="{{ data_url }}"{% endif %}>
     <div class="header">
         <div class="container">
             <h1>{{ data.title }}</h1>
@@ -185,6 +366,30 @@ class ReportGenerator:
 
             <div id="stocks" class="tab-content">
                 <h2 style="margin-bottom: 1.5rem; color: #333;">고금리 상황에서 유리한 저평가 실적주</h2>
+                {% if virtual_table %}
+                <div class="stock-filters">
+                    <input type="search" id="filter-name" placeholder="종목명">
+                    <input type="number" id="filter-per" placeholder="PER 이하" step="any" inputmode="decimal">
+                    <input type="number" id="filter-pbr" placeholder="PBR 이하" step="any" inputmode="decimal">
+                    <input type="number" id="filter-dividend" placeholder="배당 이상 (%)" step="any" inputmode="decimal">
+                    <span id="stock-count">{{ data.top_stocks | length }}개 종목</span>
+                </div>
+                <div class="table-wrapper virtual-table" id="stock-viewport">
+                    <table class="stock-table">
+                        <thead>
+                            <tr>
+                                <th data-sort="name">종목명</th>
+                                <th data-sort="per">PER (배)</th>
+                                <th data-sort="pbr">PBR (배)</th>
+                                <th data-sort="op_3m">OP 3M 변화 (%)</th>
+                                <th data-sort="dividend">배당수익률 (%)</th>
+                                <th data-sort="target_1m">목표가 1M 변화 (%)</th>
+                            </tr>
+                        </thead>
+                        <tbody id="stock-rows"></tbody>
+                    </table>
+                </div>
+                {% else %}
                 <div class="table-wrapper">
                     <table class="stock-table">
                         <thead>
@@ -201,16 +406,17 @@ class ReportGenerator:
                             {% for stock in data.top_stocks %}
                             <tr>
                                 <td><strong>{{ stock.name }}</strong></td>
-                                <td>{{ stock.per }}</td>
-                                <td>{{ stock.pbr }}</td>
-                                <td class="{% if stock.op_3m > 0 %}positive{% else %}negative{% endif %}">{{ '%+.1f' | format(stock.op_3m) }}</td>
-                                <td>{{ stock.dividend }}</td>
-                                <td class="{% if stock.target_1m > 0 %}positive{% else %}negative{% endif %}">{{ '%+.1f' | format(stock.target_1m) }}</td>
+                                <td>{{ stock.per if stock.per is not none else '-' }}</td>
+                                <td>{{ stock.pbr if stock.pbr is not none else '-' }}</td>
+                                <td class="{% if stock.op_3m is none %}{% elif stock.op_3m > 0 %}positive{% else %}negative{% endif %}">{% if stock.op_3m is none %}-{% else %}{{ '%+.1f' | format(stock.op_3m) }}{% endif %}</td>
+                                <td>{{ stock.dividend if stock.dividend is not none else '-' }}</td>
+                                <td class="{% if stock.target_1m is none %}{% elif stock.target_1m > 0 %}positive{% else %}negative{% endif %}">{% if stock.target_1m is none %}-{% else %}{{ '%+.1f' | format(stock.target_1m) }}{% endif %}</td>
                             </tr>
                             {% endfor %}
                         </tbody>
                     </table>
                 </div>
+                {% endif %}
             </div>
 
             <div id="msci" class="tab-content">
@@ -243,7 +449,7 @@ class ReportGenerator:
 
             <div id="pdf" class="tab-content">
                 <h2 style="margin-bottom: 1.5rem; color: #333;">전체 보고서</h2>
-                <div class="pdf-viewer"><iframe src="{{ pdf_filename }}"></iframe></div>
+                <div class="pdf-viewer"><iframe data-src="{{ pdf_filename }}" title="{{ data.title }}"></iframe></div>
             </div>
         </div>
     </div>
@@ -253,167 +459,797 @@ class ReportGenerator:
         <p style="font-size: 0.9rem; margin-top: 0.5rem;">본 자료는 투자 참고용이며, 투자 결정은 본인의 판단과 책임 하에 이루어져야 합니다.</p>
     </div>
 
+    {% if report_json %}
+    <script type="application/json" id="report-data">{{ report_json | safe }}</script>
+    {% endif %}
+    {% if chart_js_inline %}
+    <script type="text/plain" id="chartjs-source">{{ chart_js_inline | safe }}</script>
+    {% endif %}
+    {% if not assets_url %}
     <script>
-        function openTab(evt, tabName) {
-            var i, tabcontent, tabbuttons;
-            tabcontent = document.getElementsByClassName("tab-content");
-            for (i = 0; i < tabcontent.length; i++) {
-                tabcontent[i].classList.remove("active");
-            }
-            tabbuttons = document.getElementsByClassName("tab-button");
-            for (i = 0; i < tabbuttons.length; i++) {
-                tabbuttons[i].classList.remove("active");
-            }
-            document.getElementById(tabName).classList.add("active");
-            evt.currentTarget.classList.add("active");
+{% include "__default__.js" %}
+    </script>
+    {% endif %}
+</body>
+</html>"""
+
+
+    def _get_index_template(self) -> str:
+        """보고서 목록 페이지 템플릿 반환"""
+        return """<!DOCTYPE html>
+<html lang="ko">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>AI Report - 보고서 목록</title>
+    {% if assets_url %}
+    <link rel="stylesheet" href="{{ assets_url }}/report.css">
+    {% else %}
+    <style>
+{% include "__default__.css" %}
+    </style>
+    {% endif %}
+</head>
+<body>
+    <div class="header">
+        <div class="container">
+            <h1>보고서 목록</h1>
+            <div class="meta">총 {{ reports | length }}건</div>
+        </div>
+    </div>
+
+    <div class="container" style="margin-top: 3rem;">
+        <div class="summary-grid">
+            {% for report in reports %}
+            <div class="card">
+                <h3><a href="{{ report.href }}" style="color: inherit;">{{ report.data.title }}</a></h3>
+                <ul>
+                    <li>{{ report.data.subtitle }} | {{ report.data.date }}</li>
+                    {% if report.data.analysts %}<li>{{ report.data.analysts | join(', ') }}</li>{% endif %}
+                </ul>
+            </div>
+            {% endfor %}
+        </div>
+    </div>
+
+    <div class="footer">
+        <p>AI Report - Interactive Financial Report Generator</p>
+    </div>
+</body>
+</html>"""
+
+    def _get_default_css(self) -> str:
+        """기본 템플릿 스타일시트 반환 (인라인 또는 공유 assets/report.css로 출력)"""
+        return """* { margin: 0; padding: 0; box-sizing: border-box; }
+body { font-family: 'Segoe UI', 'Malgun Gothic', sans-serif; background: #f5f7fa; color: #333; line-height: 1.6; }
+.header { background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 2rem 0; box-shadow: 0 4px 6px rgba(0,0,0,0.1); }
+.container { max-width: 1400px; margin: 0 auto; padding: 0 1rem; }
+.header h1 { font-size: 2.5rem; margin-bottom: 0.5rem; font-weight: 700; }
+.header .meta { opacity: 0.9; font-size: 1.1rem; }
+.tabs { background: white; margin-top: -2rem; border-radius: 10px; box-shadow: 0 2px 8px rgba(0,0,0,0.1); overflow: hidden; }
+.tab-buttons { display: flex; border-bottom: 2px solid #e0e0e0; background: #fafafa; overflow-x: auto; -webkit-overflow-scrolling: touch; }
+.tab-button { flex: 1; min-width: 100px; padding: 1.2rem 0.5rem; background: none; border: none; cursor: pointer; font-size: 1rem; font-weight: 600; color: #666; transition: all 0.3s; position: relative; white-space: nowrap; }
+.tab-button:hover { background: #f0f0f0; color: #333; }
+.tab-button.active { color: #667eea; background: white; }
+.tab-button.active::after { content: ''; position: absolute; bottom: -2px; left: 0; right: 0; height: 3px; background: #667eea; }
+.tab-content { display: none; padding: 1.5rem; animation: fadeIn 0.5s; }
+.tab-content.active { display: block; }
+@keyframes fadeIn { from { opacity: 0; transform: translateY(10px); } to { opacity: 1; transform: translateY(0); } }
+.summary-grid { display: grid; grid-template-columns: repeat(auto-fit, minmax(280px, 1fr)); gap: 1rem; margin-bottom: 2rem; }
+.card { background: white; padding: 1.5rem; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.08); border-left: 4px solid #667eea; }
+.card h3 { color: #667eea; margin-bottom: 1rem; font-size: 1.2rem; display: flex; align-items: center; gap: 0.5rem; }
+.card h3::before { content: '▶'; font-size: 0.8rem; }
+.card ul { list-style: none; }
+.card li { padding: 0.5rem 0; border-bottom: 1px solid #f0f0f0; padding-left: 1.5rem; position: relative; font-size: 0.95rem; }
+.card li:last-child { border-bottom: none; }
+.card li::before { content: '•'; position: absolute; left: 0; color: #667eea; font-weight: bold; }
+.table-wrapper { overflow-x: auto; -webkit-overflow-scrolling: touch; }
+.stock-table { width: 100%; min-width: 600px; border-collapse: collapse; background: white; border-radius: 8px; overflow: hidden; box-shadow: 0 2px 4px rgba(0,0,0,0.08); }
+.stock-table thead { background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; }
+.stock-table th { padding: 0.8rem 0.5rem; text-align: left; font-weight: 600; font-size: 0.9rem; }
+.stock-table td { padding: 0.8rem 0.5rem; border-bottom: 1px solid #f0f0f0; font-size: 0.9rem; }
+.stock-table tbody tr:active { background: #f8f9ff; }
+.stock-filters { display: flex; flex-wrap: wrap; gap: 0.5rem; align-items: center; margin-bottom: 1rem; }
+.stock-filters input { width: 9rem; padding: 0.5rem; border: 1px solid #ddd; border-radius: 4px; font-size: 0.9rem; }
+#stock-count { color: #666; font-size: 0.9rem; }
+.virtual-table { height: 600px; overflow-y: auto; }
+.virtual-table .stock-table { overflow: visible; }
+.virtual-table th { position: sticky; top: 0; background: #667eea; cursor: pointer; user-select: none; }
+.virtual-table th[aria-sort="ascending"]::after { content: ' ▲'; }
+.virtual-table th[aria-sort="descending"]::after { content: ' ▼'; }
+.virtual-table td { white-space: nowrap; }
+.virtual-table tr.spacer td { padding: 0; border: none; }
+.positive { color: #e74c3c; font-weight: 600; }
+.negative { color: #3498db; font-weight: 600; }
+.chart-container { background: white; padding: 1rem; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.08); margin-bottom: 1.5rem; height: 300px; }
+.pdf-viewer { background: white; padding: 0.5rem; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.08); margin-top: 1rem; }
+.pdf-viewer iframe { width: 100%; height: 500px; border: none; border-radius: 4px; }
+.badge { display: inline-block; padding: 0.25rem 0.6rem; border-radius: 20px; font-size: 0.8rem; font-weight: 600; }
+.badge-high { background: #e74c3c; color: white; }
+.badge-medium { background: #f39c12; color: white; }
+.badge-low { background: #95a5a6; color: white; }
+.msci-grid { display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 0.8rem; }
+.msci-item { background: #f8f9ff; padding: 0.8rem; border-radius: 6px; display: flex; justify-content: space-between; align-items: center; border-left: 3px solid #667eea; font-size: 0.9rem; }
+.footer { text-align: center; padding: 1.5rem; color: #999; margin-top: 2rem; font-size: 0.9rem; }
+
+/* 모바일 최적화 */
+@media (max-width: 768px) {
+    .header h1 { font-size: 1.8rem; }
+    .header .meta { font-size: 0.9rem; line-height: 1.4; }
+    .container { padding: 0 0.5rem; margin-top: 2rem !important; }
+    .tabs { margin-top: -1rem; border-radius: 8px; }
+    .tab-button { font-size: 0.85rem; padding: 1rem 0.3rem; min-width: 80px; }
+    .tab-content { padding: 1rem; }
+    .tab-content h2 { font-size: 1.3rem; margin-bottom: 1rem !important; }
+    .summary-grid { grid-template-columns: 1fr; gap: 1rem; }
+    .card { padding: 1rem; }
+    .card h3 { font-size: 1.1rem; }
+    .card li { font-size: 0.9rem; padding: 0.4rem 0 0.4rem 1.2rem; }
+    .stock-table { min-width: 550px; font-size: 0.85rem; }
+    .stock-table th, .stock-table td { padding: 0.6rem 0.4rem; }
+    .stock-filters input { width: calc(50% - 0.25rem); }
+    .virtual-table { height: 70vh; }
+    .chart-container { height: 250px; padding: 0.5rem; }
+    .pdf-viewer iframe { height: 400px; }
+    .msci-grid { grid-template-columns: 1fr; gap: 0.6rem; }
+    .msci-item { padding: 0.7rem; font-size: 0.85rem; }
+    .footer { padding: 1rem; font-size: 0.85rem; }
+}
+
+@media (max-width: 480px) {
+    .header h1 { font-size: 1.5rem; }
+    .header .meta { font-size: 0.8rem; }
+    .tab-button { font-size: 0.75rem; padding: 0.8rem 0.2rem; min-width: 70px; }
+    .stock-table { min-width: 500px; font-size: 0.8rem; }
+    .chart-container { height: 200px; }
+    .pdf-viewer iframe { height: 350px; }
+}"""
+
+    def _get_default_js(self) -> str:
+        """
+        기본 템플릿 스크립트 반환 (인라인 또는 공유 assets/report.js로 출력)
+
+        Chart.js, 차트, PDF iframe은 해당 탭을 처음 열 때 불러오고 초기화한다.
+        종목이 많은 보고서의 표는 열 단위 데이터에서 화면에 보이는 행만 만들어 그린다.
+        """
+        return """var reportState = { charts: null, chartJs: null, data: null, table: null };
+
+// 차트는 앞쪽 종목만 그림 (전체 종목은 표에서 확인)
+var CHART_MAX_STOCKS = 50;
+// 화면 위아래로 미리 그려 둘 행 수
+var STOCK_ROW_OVERSCAN = 10;
+
+function openTab(evt, tabName) {
+    var i, tabcontent, tabbuttons;
+    tabcontent = document.getElementsByClassName("tab-content");
+    for (i = 0; i < tabcontent.length; i++) {
+        tabcontent[i].classList.remove("active");
+    }
+    tabbuttons = document.getElementsByClassName("tab-button");
+    for (i = 0; i < tabbuttons.length; i++) {
+        tabbuttons[i].classList.remove("active");
+    }
+    document.getElementById(tabName).classList.add("active");
+    evt.currentTarget.classList.add("active");
+    activateTab(tabName);
+}
+
+function activateTab(tabName) {
+    if (tabName === 'charts' && !reportState.charts) {
+        reportState.charts = Promise.all([loadChartJs(), loadReportData()]).then(function (results) {
+            renderCharts(stockRecords(results[1].top_stocks, CHART_MAX_STOCKS));
+        }, function () {
+            reportState.charts = null;
+        });
+    }
+    if (tabName === 'stocks' && !reportState.table && document.getElementById('stock-rows')) {
+        reportState.table = loadReportData().then(function (data) {
+            initStockTable(data.top_stocks);
+        }, function () {
+            reportState.table = null;
+        });
+    }
+    if (tabName === 'pdf') {
+        var frame = document.querySelector('#pdf iframe[data-src]');
+        if (frame) {
+            frame.src = frame.getAttribute('data-src');
+            frame.removeAttribute('data-src');
         }
+    }
+}
 
-        const stockData = {{ json_data | safe }};
-
-        const perCtx = document.getElementById('perChart').getContext('2d');
-        new Chart(perCtx, {
-            type: 'bar',
-            data: {
-                labels: stockData.map(s => s.name),
-                datasets: [{
-                    label: 'PER (배)',
-                    data: stockData.map(s => s.per),
-                    backgroundColor: 'rgba(102, 126, 234, 0.7)',
-                    borderColor: 'rgba(102, 126, 234, 1)',
-                    borderWidth: 2
-                }]
-            },
-            options: {
-                responsive: true,
-                maintainAspectRatio: false,
-                plugins: {
-                    title: { display: true, text: 'PER 비교 (낮을수록 저평가)', font: { size: 16 } },
-                    legend: { display: false }
-                },
-                scales: { y: { beginAtZero: true, title: { display: true, text: 'PER (배)' } } }
+function loadScript(src) {
+    return new Promise(function (resolve, reject) {
+        var script = document.createElement('script');
+        script.src = src;
+        script.onload = resolve;
+        script.onerror = reject;
+        document.head.appendChild(script);
+    });
+}
+
+function loadChartJs() {
+    if (window.Chart) {
+        return Promise.resolve();
+    }
+    if (!reportState.chartJs) {
+        var inline = document.getElementById('chartjs-source');
+        if (inline) {
+            // 내장된 Chart.js는 text/plain으로 두었다가 필요할 때 실행
+            var script = document.createElement('script');
+            script.text = inline.textContent;
+            document.head.appendChild(script);
+            reportState.chartJs = Promise.resolve();
+        } else {
+            reportState.chartJs = loadScript(document.body.getAttribute('data-chartjs')).catch(function (error) {
+                reportState.chartJs = null;
+                throw error;
+            });
+        }
+    }
+    return reportState.chartJs;
+}
+
+function loadReportData() {
+    if (!reportState.data) {
+        var node = document.getElementById('report-data');
+        if (node) {
+            reportState.data = Promise.resolve(JSON.parse(node.textContent));
+        } else {
+            // 큰 데이터는 별도 파일 (<보고서>.data.js가 window.REPORT_DATA 설정)
+            reportState.data = loadScript(document.body.getAttribute('data-report-data')).then(function () {
+                return window.REPORT_DATA;
+            }, function (error) {
+                reportState.data = null;
+                throw error;
+            });
+        }
+    }
+    return reportState.data;
+}
+
+function stockRecords(columns, limit) {
+    var count = Math.min(columns.name.length, limit || columns.name.length);
+    var records = [];
+    for (var i = 0; i < count; i++) {
+        var record = {};
+        for (var key in columns) {
+            record[key] = columns[key][i];
+        }
+        records.push(record);
+    }
+    return records;
+}
+
+function isMissing(value) {
+    return value === null || value === undefined;
+}
+
+function initStockTable(columns) {
+    var viewport = document.getElementById('stock-viewport');
+    var table = {
+        columns: columns,
+        order: [],
+        sortKey: null,
+        sortDir: 1,
+        rowHeight: 0,
+        viewport: viewport,
+        tbody: document.getElementById('stock-rows'),
+        frame: 0,
+        collator: window.Intl ? new Intl.Collator('ko') : null
+    };
+
+    viewport.addEventListener('scroll', function () {
+        scheduleStockRows(table);
+    }, { passive: true });
+    window.addEventListener('resize', function () {
+        scheduleStockRows(table);
+    });
+
+    var headers = viewport.querySelectorAll('th[data-sort]');
+    for (var i = 0; i < headers.length; i++) {
+        headers[i].addEventListener('click', function (evt) {
+            var key = evt.currentTarget.getAttribute('data-sort');
+            table.sortDir = table.sortKey === key ? -table.sortDir : 1;
+            table.sortKey = key;
+            for (var j = 0; j < headers.length; j++) {
+                headers[j].removeAttribute('aria-sort');
             }
+            evt.currentTarget.setAttribute('aria-sort', table.sortDir > 0 ? 'ascending' : 'descending');
+            sortStocks(table);
+            renderStockRows(table);
         });
+    }
 
-        const divCtx = document.getElementById('dividendChart').getContext('2d');
-        new Chart(divCtx, {
-            type: 'bar',
-            data: {
-                labels: stockData.map(s => s.name),
-                datasets: [{
-                    label: '배당수익률 (%)',
-                    data: stockData.map(s => s.dividend),
-                    backgroundColor: 'rgba(231, 76, 60, 0.7)',
-                    borderColor: 'rgba(231, 76, 60, 1)',
-                    borderWidth: 2
-                }]
-            },
-            options: {
-                responsive: true,
-                maintainAspectRatio: false,
-                plugins: {
-                    title: { display: true, text: '배당수익률 비교 (높을수록 유리)', font: { size: 16 } },
-                    legend: { display: false }
-                },
-                scales: { y: { beginAtZero: true, title: { display: true, text: '배당수익률 (%)' } } }
-            }
+    var timer = null;
+    ['filter-name', 'filter-per', 'filter-pbr', 'filter-dividend'].forEach(function (id) {
+        document.getElementById(id).addEventListener('input', function () {
+            clearTimeout(timer);
+            timer = setTimeout(function () {
+                filterStocks(table);
+            }, 150);
         });
-    </script>
-</body>
-</html>"""
+    });
+
+    filterStocks(table);
+}
+
+function filterStocks(table) {
+    var columns = table.columns;
+    var name = document.getElementById('filter-name').value.trim().toLowerCase();
+    var maxPer = parseFloat(document.getElementById('filter-per').value);
+    var maxPbr = parseFloat(document.getElementById('filter-pbr').value);
+    var minDividend = parseFloat(document.getElementById('filter-dividend').value);
+
+    var order = [];
+    for (var i = 0; i < columns.name.length; i++) {
+        if (name && String(columns.name[i]).toLowerCase().indexOf(name) < 0) continue;
+        if (!isNaN(maxPer) && (isMissing(columns.per[i]) || columns.per[i] > maxPer)) continue;
+        if (!isNaN(maxPbr) && (isMissing(columns.pbr[i]) || columns.pbr[i] > maxPbr)) continue;
+        if (!isNaN(minDividend) && (isMissing(columns.dividend[i]) || columns.dividend[i] < minDividend)) continue;
+        order.push(i);
+    }
+    table.order = order;
+    sortStocks(table);
+
+    document.getElementById('stock-count').textContent = order.length === columns.name.length
+        ? order.length + '개 종목' : order.length + ' / ' + columns.name.length + '개 종목';
+    table.viewport.scrollTop = 0;
+    renderStockRows(table);
+}
+
+function sortStocks(table) {
+    if (!table.sortKey) return;
+    var values = table.columns[table.sortKey];
+    var dir = table.sortDir;
+    var collator = table.collator;
+    // 값이 없는 종목은 방향과 관계없이 맨 뒤, 같은 값은 원래 순서 유지
+    table.order.sort(function (a, b) {
+        var x = values[a], y = values[b];
+        if (isMissing(x) || isMissing(y)) {
+            return isMissing(x) === isMissing(y) ? a - b : (isMissing(x) ? 1 : -1);
+        }
+        var result = typeof x === 'string' && collator ? collator.compare(x, y) : (x < y ? -1 : (x > y ? 1 : 0));
+        return result * dir || a - b;
+    });
+}
+
+function scheduleStockRows(table) {
+    if (table.frame) return;
+    table.frame = requestAnimationFrame(function () {
+        table.frame = 0;
+        renderStockRows(table);
+    });
+}
+
+function renderStockRows(table) {
+    var order = table.order;
+    var rowHeight = table.rowHeight || 40;
+    var headerHeight = table.viewport.querySelector('thead').offsetHeight;
+    var visible = Math.ceil(table.viewport.clientHeight / rowHeight);
+    var start = Math.max(0, Math.floor((table.viewport.scrollTop - headerHeight) / rowHeight) - STOCK_ROW_OVERSCAN);
+    var end = Math.min(order.length, start + visible + 2 * STOCK_ROW_OVERSCAN);
+
+    // 보이지 않는 행은 높이만 가진 빈 행으로 대신해 스크롤 길이를 유지
+    var fragment = document.createDocumentFragment();
+    fragment.appendChild(spacerRow(start * rowHeight));
+    for (var i = start; i < end; i++) {
+        fragment.appendChild(stockRow(table.columns, order[i]));
+    }
+    fragment.appendChild(spacerRow((order.length - end) * rowHeight));
+    table.tbody.textContent = '';
+    table.tbody.appendChild(fragment);
+
+    // 첫 렌더링에서 실제 행 높이를 재고 다시 배치
+    if (!table.rowHeight && end > start) {
+        table.rowHeight = table.tbody.rows[1].offsetHeight || rowHeight;
+        if (table.rowHeight !== rowHeight) {
+            renderStockRows(table);
+        }
+    }
+}
+
+function spacerRow(height) {
+    var row = document.createElement('tr');
+    row.className = 'spacer';
+    var cell = document.createElement('td');
+    cell.colSpan = 6;
+    cell.style.height = height + 'px';
+    row.appendChild(cell);
+    return row;
+}
+
+function stockRow(columns, i) {
+    var row = document.createElement('tr');
+    var name = document.createElement('strong');
+    name.textContent = columns.name[i];
+    row.appendChild(document.createElement('td')).appendChild(name);
+    stockCell(row, formatValue(columns.per[i]));
+    stockCell(row, formatValue(columns.pbr[i]));
+    stockCell(row, formatChange(columns.op_3m[i]), changeClass(columns.op_3m[i]));
+    stockCell(row, formatValue(columns.dividend[i]));
+    stockCell(row, formatChange(columns.target_1m[i]), changeClass(columns.target_1m[i]));
+    return row;
+}
+
+function stockCell(row, text, className) {
+    var cell = document.createElement('td');
+    cell.textContent = text;
+    if (className) {
+        cell.className = className;
+    }
+    row.appendChild(cell);
+}
+
+function formatValue(value) {
+    return isMissing(value) ? '-' : String(value);
+}
+
+function formatChange(value) {
+    return isMissing(value) ? '-' : (value >= 0 ? '+' : '') + value.toFixed(1);
+}
+
+function changeClass(value) {
+    return isMissing(value) ? '' : (value > 0 ? 'positive' : 'negative');
+}
+
+function renderCharts(stockData) {
+    const perCtx = document.getElementById('perChart').getContext('2d');
+    new Chart(perCtx, {
+        type: 'bar',
+        data: {
+            labels: stockData.map(s => s.name),
+            datasets: [{
+                label: 'PER (배)',
+                data: stockData.map(s => s.per),
+                backgroundColor: 'rgba(102, 126, 234, 0.7)',
+                borderColor: 'rgba(102, 126, 234, 1)',
+                borderWidth: 2
+            }]
+        },
+        options: {
+            responsive: true,
+            maintainAspectRatio: false,
+            plugins: {
+                title: { display: true, text: 'PER 비교 (낮을수록 저평가)', font: { size: 16 } },
+                legend: { display: false }
+            },
+            scales: { y: { beginAtZero: true, title: { display: true, text: 'PER (배)' } } }
+        }
+    });
+
+    const divCtx = document.getElementById('dividendChart').getContext('2d');
+    new Chart(divCtx, {
+        type: 'bar',
+        data: {
+            labels: stockData.map(s => s.name),
+            datasets: [{
+                label: '배당수익률 (%)',
+                data: stockData.map(s => s.dividend),
+                backgroundColor: 'rgba(231, 76, 60, 0.7)',
+                borderColor: 'rgba(231, 76, 60, 1)',
+                borderWidth: 2
+            }]
+        },
+        options: {
+            responsive: true,
+            maintainAspectRatio: false,
+            plugins: {
+                title: { display: true, text: '배당수익률 비교 (높을수록 유리)', font: { size: 16 } },
+                legend: { display: false }
+            },
+            scales: { y: { beginAtZero: true, title: { display: true, text: '배당수익률 (%)' } } }
+        }
+    });
+}"""
+
+
+def vendored_chart_js() -> str:
+    """
+    내려받아 둔 Chart.js 소스 (CHART_JS_VENDOR_PATH, 없으면 빈 문자열)
+
+    Returns:
+        스크립트 소스
+    """
+    if not CHART_JS_VENDOR_PATH.is_file():
+        return ""
+    return CHART_JS_VENDOR_PATH.read_text(encoding='utf-8')
+
+
+def stock_columns(stocks: List[Dict]) -> Dict[str, list]:
+    """
+    추천 종목 리스트를 열 단위로 변환 (종목마다 키를 반복하지 않아 JSON이 작아짐)
+
+    Args:
+        stocks: 종목 dict 리스트
+
+    Returns:
+        {열 이름: 값 리스트} (STOCK_FIELDS 순서)
+    """
+    return {field: [stock.get(field) for stock in stocks] for field in STOCK_FIELDS}
+
+
+def script_json(value) -> Markup:
+    """
+    <script> 안에 넣을 JSON 문자열 ('</script>'로 스크립트가 끝나지 않도록 '</'를 이스케이프)
+
+    Args:
+        value: JSON으로 변환할 값
+
+    Returns:
+        JSON 문자열 (이미 안전하므로 템플릿 자동 이스케이프를 다시 적용하지 않음)
+    """
+    return script_text(json.dumps(value, ensure_ascii=False))
+
+
+def script_text(source: str) -> Markup:
+    """<script> 안에 그대로 넣을 문자열의 '</' 이스케이프 (템플릿 자동 이스케이프 대상 아님)"""
+    return Markup(source.replace("</", "<\\/"))
+
+
+def _write_if_changed(path: Path, content: str):
+    """내용이 바뀐 경우에만 기록 (브라우저/HTTP 캐시의 수정 시각 유지)"""
+    if path.exists() and path.read_text(encoding='utf-8') == content:
+        return
+    path.write_text(content, encoding='utf-8')
 
 
-def generate_hanaw_report(url: str = None, output_filename: str = "hanaw_report.html"):
+def publish_pdf(pdf_path: Path, output_dir: Path, mode: str = "link") -> str:
+    """
+    PDF를 HTML과 같은 위치에 게시
+
+    Args:
+        pdf_path: 원본 PDF 경로
+        output_dir: HTML 출력 디렉토리
+        mode: 'link' (하드링크, 다른 파일시스템이면 복제), 'copy' (복제), 'reference' (원본 경로 참조)
+              복제는 reflink, copy_file_range, sendfile 순으로 시도 (file_io.clone_file)
+
+    Returns:
+        HTML에서 사용할 PDF 경로 (output_dir 기준 상대 경로)
+    """
+    if mode not in PDF_PUBLISH_MODES:
+        raise ValueError(f"지원하지 않는 PDF 게시 방식: {mode} (가능: {', '.join(PDF_PUBLISH_MODES)})")
+
+    if mode == "reference":
+        return Path(os.path.relpath(pdf_path.resolve(), output_dir.resolve())).as_posix()
+
+    output_pdf_path = output_dir / pdf_path.name
+    if output_pdf_path.exists():
+        if os.path.samefile(pdf_path, output_pdf_path):
+            return pdf_path.name
+        output_pdf_path.unlink()
+
+    method = link_or_clone(pdf_path, output_pdf_path) if mode == "link" else clone_file(pdf_path, output_pdf_path)
+    if method == 'hardlink':
+        print(f"[OK] PDF 링크: {output_pdf_path}")
+    else:
+        print(f"[OK] PDF 복사 ({method}): {output_pdf_path}")
+    return pdf_path.name
+
+
+def _render_report(template_path: str, output_dir: str, report_data: Dict, pdf_href: str,
+                   output_filename: str, assets_url: str) -> str:
+    """
+    워커 프로세스용: 보고서 하나 렌더링
+
+    Returns:
+        생성된 HTML 파일 경로
+    """
+    generator = ReportGenerator(Path(template_path), Path(output_dir))
+    return str(generator.generate(report_data, pdf_href, output_filename, assets_url))
+
+
+def generate_reports(reports: List[Dict], workers: int = 1, pdf_mode: str = "link",
+                     index_filename: str = "index.html", force: bool = False) -> List[Path]:
+    """
+    여러 보고서 일괄 생성 헬퍼 함수
+
+    Args:
+        reports: 보고서 목록 ({'report_data', 'pdf_path', 'output_filename'})
+        workers: 렌더링 프로세스 수
+        pdf_mode: PDF 게시 방식 ('link', 'copy', 'reference')
+        index_filename: 목록 페이지 파일명
+        force: True이면 변경 여부와 관계없이 모두 다시 생성
+
+    Returns:
+        생성된 HTML 파일 경로 리스트
+    """
+    return ReportGenerator().generate_batch(reports, workers, pdf_mode, index_filename, force)
+
+
+def generate_hanaw_report(url: str = None, output_filename: str = "hanaw_report.html", workers: int = None,
+                          use_cache: bool = None, mode: str = None, pages: str = None, force: bool = False,
+                          use_index: bool = None):
     """
     하나증권 Quant Weekly 보고서 생성
 
+    다운로드 → 파싱(보고서 데이터 추출) → 렌더링 → PDF 게시 단계마다 빌드 매니페스트와 비교하여
+    입력이 바뀐 단계만 다시 수행한다. 보고서 데이터는 PDF의 표와 텍스트에서 추출하며
+    PDF 옆에 .report.json으로 저장된다.
+
     Args:
         url: PDF URL (기본값: 최신 보고서)
         output_filename: 출력 파일명
+        workers: PDF 병렬 추출 프로세스 수 (None이면 설정값)
+        use_cache: 추출 캐시 사용 여부 (None이면 설정값)
+        mode: PDF 추출 모드 ('full', 'text', 'tables', None이면 설정값)
+        pages: 추출할 페이지 범위 (예: "1-3,10", None이면 전체)
+        force: True이면 매니페스트와 관계없이 모든 단계를 다시 수행
+        use_index: 파싱한 보고서를 전문 검색 인덱스에 추가할지 여부 (None이면 설정값)
     """
     if url is None:
         url = "https://www.hanaw.com/download/research/FileServer/WEB/strategy/market/2026/01/20/EDIT_Quant_Weekly_260121.pdf"
 
-    # PDF 다운로드
-    pdf_path, pages_data = download_report(url, DATA_DIR)
-
-    # 보고서 데이터 구성
-    report_data = {
-        "title": "우상향 금리, 저평가 실적주가 답",
-        "subtitle": "실전 퀀트",
-        "date": "2026.01.21",
-        "analysts": ["이경수 (gang@hanafn.com)", "이철현 (lch2678@hanafn.com)"],
-        "summary": {
-            "key_points": [
-                "연초 미국 금리 상승 영향으로 글로벌 저평가 및 중형주 강세",
-                "금리 상승 시기에 미국 저평가 및 중소형주 강세 뚜렷",
-                "달러 하락 시기에도 배당모멘텀, 저평가, 중형주 팩터 유리",
-                "코스피는 금리 상승 시기에 유리한 자산 (미국 중소형주와 연동성 높음)",
-                "2월은 배당 상향, 목표주가 변화, 고배당, 저평가, 실적 상향 컨셉 유리"
-            ],
-            "strategy": [
-                "지주회사: SK, 한화, GS 등",
-                "유틸리티: 한국전력",
-                "산업재: HD현대건설기계, 팬오션, 현대위아",
-                "소재: 한국타이어앤테크놀로지",
-                "금융: 유통, 증권, 은행"
-            ]
-        },
-        "msci_review": {
-            "date": "2026.02.11",
-            "new_entries": [
-                {"name": "삼성에피스홀딩스", "probability": "높음"},
-                {"name": "현대건설", "probability": "높음"},
-                {"name": "에이비엘바이오", "probability": "높음"},
-                {"name": "레인보우로보틱스", "probability": "중간"},
-                {"name": "현대오토에버", "probability": "낮음"}
-            ],
-            "removals": [
-                {"name": "LG생활건강", "probability": "높음"},
-                {"name": "코웨이", "probability": "높음"}
-            ]
-        },
-        "top_stocks": [
-            {"name": "이마트", "per": 9.1, "pbr": 0.2, "op_3m": 6.9, "dividend": 2.7, "target_1m": 21.0},
-            {"name": "GS", "per": 7.2, "pbr": 0.4, "op_3m": 7.6, "dividend": 4.4, "target_1m": 25.9},
-            {"name": "롯데쇼핑", "per": 8.5, "pbr": 0.1, "op_3m": 2.5, "dividend": 5.0, "target_1m": 17.3},
-            {"name": "iM금융지주", "per": 4.6, "pbr": 0.4, "op_3m": 3.4, "dividend": 4.9, "target_1m": 26.2},
-            {"name": "팬오션", "per": 6.3, "pbr": 0.4, "op_3m": 2.1, "dividend": 2.9, "target_1m": 12.5},
-            {"name": "SK", "per": 8.4, "pbr": 0.6, "op_3m": 29.1, "dividend": 2.4, "target_1m": 32.1},
-            {"name": "BNK금융지주", "per": 5.6, "pbr": 0.5, "op_3m": 3.8, "dividend": 4.8, "target_1m": 8.9},
-            {"name": "한국타이어앤테크놀로지", "per": 6.1, "pbr": 0.7, "op_3m": 18.4, "dividend": 3.6, "target_1m": 25.6},
-            {"name": "신세계", "per": 11.0, "pbr": 0.6, "op_3m": 7.3, "dividend": 1.6, "target_1m": -5.5},
-            {"name": "한국금융지주", "per": 5.9, "pbr": 1.1, "op_3m": 18.4, "dividend": 4.3, "target_1m": 33.7}
-        ]
-    }
+    downloader = _create_downloader(workers, use_cache, mode, pages, use_index)
+
+    # PDF 다운로드 (변경 없으면 서버가 304로 응답, 다른 URL로 이미 파싱한 보고서이면 원본 사용)
+    pdf_path = downloader.resolve_duplicate(downloader.download(url))
 
-    # HTML 생성
+    return build_report(downloader, pdf_path, output_filename, url=url, force=force)
+
+
+def generate_report_from_pdf(pdf_path: Path, output_filename: str = None, workers: int = None,
+                             use_cache: bool = None, mode: str = None, pages: str = None, force: bool = False,
+                             use_index: bool = None, url: str = None) -> Path:
+    """
+    이미 받은 PDF 파일로 보고서 생성 (다운로드 단계 없음, 나머지는 generate_hanaw_report와 같음)
+
+    Args:
+        pdf_path: PDF 파일 경로
+        output_filename: 출력 파일명 (None이면 PDF 이름.html)
+        workers, use_cache, mode, pages, force, use_index: generate_hanaw_report와 같음
+        url: 원본 URL (빌드 매니페스트 기록용)
+
+    Returns:
+        생성된 HTML 파일 경로
+    """
+    downloader = _create_downloader(workers, use_cache, mode, pages, use_index)
+    pdf_path = downloader.resolve_duplicate(Path(pdf_path))
+    return build_report(downloader, pdf_path, output_filename or f"{pdf_path.stem}.html", url=url, force=force)
+
+
+def _create_downloader(workers: int = None, use_cache: bool = None, mode: str = None, pages: str = None,
+                       use_index: bool = None):
+    """설정값을 반영한 PDFDownloader 생성"""
+    # 렌더링만 하는 경우 requests/pdfplumber를 불러오지 않도록 여기서 import
+    from .dedupe import DedupeIndex
+    from .ocr import create_ocr_pool
+    from .pdf_downloader import PDFDownloader
+
+    if use_cache is None:
+        use_cache = USE_EXTRACT_CACHE
+    if use_index is None:
+        use_index = USE_SEARCH_INDEX
+
+    return PDFDownloader(DATA_DIR, workers=workers, cache=ExtractionCache() if use_cache else None,
+                         mode=mode, pages=pages, search_index=SearchIndex() if use_index else None,
+                         ocr=create_ocr_pool(), dedupe=DedupeIndex() if USE_DEDUPE else None)
+
+
+def build_report(downloader, pdf_path: Path, output_filename: str, url: str = None, force: bool = False) -> Path:
+    """
+    PDF 파싱 → 보고서 데이터 추출 → 렌더링 → PDF 게시 (입력이 바뀐 단계만 수행)
+
+    Args:
+        downloader: 파싱에 사용할 PDFDownloader
+        pdf_path: PDF 파일 경로
+        output_filename: 출력 HTML 파일명
+        url: 원본 URL (빌드 매니페스트 기록용)
+        force: True이면 매니페스트와 관계없이 모든 단계를 다시 수행
+
+    Returns:
+        HTML 파일 경로
+    """
+    from .pdf_downloader import pdf_sha256
+
+    manifest = BuildManifest(OUTPUT_DIR)
+    previous = manifest.get(output_filename) or {}
+    # 다운로드하면서 기록한 해시가 있으면 PDF를 다시 읽지 않음
+    pdf_hash = pdf_sha256(pdf_path)
+    extract_hash = hash_data(downloader.extraction_settings())
+
+    # PDF 파싱 및 보고서 데이터 추출 (PDF와 추출 설정이 그대로이고 이전 결과 파일이 있으면 생략)
+    report_json_path = pdf_path.with_suffix('.report.json')
+    if (force or previous.get('pdf') != pdf_hash or previous.get('extract') != extract_hash
+            or not pdf_path.with_suffix('.txt').exists() or not report_json_path.exists()):
+        pages_data = downloader.extract_and_save(pdf_path)
+        with metrics.stage('report_data'):
+            report_data = extract_report_data(pages_data)
+        with open(report_json_path, 'w', encoding='utf-8') as f:
+            json.dump(report_data, f, ensure_ascii=False, indent=2)
+        print(f"[OK] 보고서 데이터 추출: 추천 종목 {len(report_data['top_stocks'])}개, "
+              f"MSCI 편입 {len(report_data['msci_review']['new_entries'])}개 / "
+              f"편출 {len(report_data['msci_review']['removals'])}개")
+    else:
+        print(f"[OK] PDF 변경 없음, 파싱 생략: {pdf_path}")
+        with open(report_json_path, 'r', encoding='utf-8') as f:
+            report_data = json.load(f)
+
+    # HTML 생성 (PDF, 보고서 데이터, 템플릿이 모두 그대로이면 생략)
     generator = ReportGenerator()
-    html_path = generator.generate(report_data, pdf_path.name, output_filename)
+    inputs = {
+        'url': url,
+        'pdf': pdf_hash,
+        'extract': extract_hash,
+        'report_data': hash_data(report_data),
+        'template': generator.template_fingerprint(),
+    }
+    if not force and manifest.is_fresh(output_filename, inputs):
+        html_path = OUTPUT_DIR / output_filename
+        print(f"[OK] 입력 변경 없음, HTML 생성 생략: {html_path}")
+    else:
+        # 종목 지표를 보고서 날짜별로 누적 (다시 생성할 때만, 같은 내용이면 생략)
+        if USE_HISTORY_STORE:
+            with metrics.stage('history'), HistoryStore() as store:
+                store.add_report(pdf_path.name, report_data, url)
+        html_path = generator.generate(report_data, pdf_path.name, output_filename)
+
+    # PDF를 output 폴더에 게시 (HTML과 같은 위치에, 가능하면 하드링크, 이미 같은 파일이면 생략)
+    with metrics.stage('publish_pdf'):
+        publish_pdf(pdf_path, OUTPUT_DIR)
 
-    # PDF를 output 폴더로 복사 (HTML과 같은 위치에)
-    import shutil
-    output_pdf_path = OUTPUT_DIR / pdf_path.name
-    shutil.copy2(pdf_path, output_pdf_path)
-    print(f"[OK] PDF 복사: {output_pdf_path}")
+    manifest.record(output_filename, inputs)
+    manifest.save()
 
     return html_path
 
 
-if __name__ == "__main__":
+def main(argv: List[str] = None):
+    """보고서 생성 명령 (python -m src report)"""
     parser = argparse.ArgumentParser(description="AI Report - 인터랙티브 금융 보고서 생성기")
     parser.add_argument("--url", type=str, help="PDF URL")
     parser.add_argument("--output", type=str, default="report.html", help="출력 파일명")
+    parser.add_argument("--workers", type=int, default=None, help="PDF 병렬 추출 프로세스 수")
+    parser.add_argument("--no-cache", action="store_true", help="추출 캐시를 사용하지 않고 항상 다시 파싱")
+    parser.add_argument("--mode", choices=["full", "text", "tables"], default=None,
+                        help="PDF 추출 모드 (full: 텍스트+표, text: 텍스트만, tables: 표만)")
+    parser.add_argument("--pages", type=str, default=None, help="추출할 페이지 범위 (예: 1-3,10)")
+    parser.add_argument("--render-batch", type=str, default=None,
+                        help="일괄 생성할 보고서 목록 JSON 파일 ([{report_data, pdf_path, output_filename}, ...])")
+    parser.add_argument("--render-workers", type=int, default=1, help="일괄 생성 렌더링 프로세스 수")
+    parser.add_argument("--pdf-mode", choices=PDF_PUBLISH_MODES, default="link", help="일괄 생성 시 PDF 게시 방식")
+    parser.add_argument("--force", action="store_true", help="변경 여부와 관계없이 모든 단계를 다시 수행")
+    parser.add_argument("--no-index", action="store_true", help="전문 검색 인덱스에 추가하지 않음")
+    parser.add_argument("--profile", nargs="?", const="", default=None, metavar="FILE",
+                        help="단계별 시간/메모리 요약 출력 (FILE을 주면 .json 또는 .prom 형식으로 저장)")
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+    collector = metrics.enable_metrics() if args.profile is not None else None
 
-    if args.url:
-        print(f"[*] URL에서 보고서 생성: {args.url}")
-        # 커스텀 URL 처리 (현재는 하나증권만 지원)
-        html_path = generate_hanaw_report(args.url, args.output)
+    if args.render_batch:
+        with open(args.render_batch, 'r', encoding='utf-8') as f:
+            reports = json.load(f)
+        html_paths = generate_reports(reports, args.render_workers, args.pdf_mode, force=args.force)
+        print(f"\n[OK] 완료! {len(html_paths)}개 보고서")
+        print(f"[*] 목록 페이지: {OUTPUT_DIR / 'index.html'}")
     else:
-        # 기본 하나증권 보고서
-        html_path = generate_hanaw_report(output_filename=args.output)
+        options = {
+            'workers': args.workers,
+            'use_cache': False if args.no_cache else None,
+            'mode': args.mode,
+            'pages': args.pages,
+            'force': args.force,
+            'use_index': False if args.no_index else None,
+        }
+
+        if args.url:
+            print(f"[*] URL에서 보고서 생성: {args.url}")
+            # 커스텀 URL 처리 (현재는 하나증권만 지원)
+            html_path = generate_hanaw_report(args.url, args.output, **options)
+        else:
+            # 기본 하나증권 보고서
+            html_path = generate_hanaw_report(output_filename=args.output, **options)
 
-    print(f"\n[OK] 완료!")
-    print(f"[*] HTML 보고서: {html_path}")
-    print(f"[*] 브라우저에서 열어보세요.")
+        print(f"\n[OK] 완료!")
+        print(f"[*] HTML 보고서: {html_path}")
+        print(f"[*] 브라우저에서 열어보세요.")
+
+    if collector is not None:
+        print(f"\n[*] 단계별 계측 결과")
+        print(collector.format_table())
+        if args.profile:
+            collector.save(Path(args.profile))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+"""
+보고서 데이터 추출 모듈
+
+pdfplumber가 추출한 pages_data(텍스트와 표)에서 HTML 템플릿이 사용하는
+report_data(제목, 요약, top_stocks, msci_review)를 구성한다.
+"""
+import re
+import math
+from typing import Dict, List, Optional, Sequence, TypedDict
+
+from .config import TOP_STOCKS_LIMIT
+from .table_store import ColumnarTable, parse_numeric_column
+
+
+class StockRecord(TypedDict):
+    """추천 종목 레코드"""
+    name: str
+    per: Optional[float]
+    pbr: Optional[float]
+    op_3m: Optional[float]
+    dividend: Optional[float]
+    target_1m: Optional[float]
+
+
+class MsciEntry(TypedDict):
+    """MSCI 편입/편출 예상 종목"""
+    name: str
+    probability: str
+
+
+# 종목 표 헤더 매칭 규칙 (필드명, 헤더 정규식) - 위에서부터 먼저 일치하는 규칙 적용 (영문 보고서 헤더 포함)
+STOCK_COLUMN_PATTERNS = [
+    ('name', re.compile(r'종목|^Name$', re.I)),
+    ('per', re.compile(r'PER|P/E', re.I)),
+    ('pbr', re.compile(r'PBR|P/B', re.I)),
+    ('op_1m', re.compile(r'OP.*1M', re.I | re.S)),
+    ('op_3m', re.compile(r'OP.*3M', re.I | re.S)),
+    ('target_1m', re.compile(r'목표주가|Target', re.I)),
+    ('dividend', re.compile(r'배당|Dividend', re.I)),
+]
+STOCK_NUMERIC_FIELDS = ('per', 'pbr', 'op_3m', 'dividend', 'target_1m')
+
+# 숫자 셀: "1,234", "-5.5", "(5.5)" (음수), "49.0%"
+NUMBER_TOKEN = r'\(?[-+]?[\d,]*\.?\d+\)?%?'
+STOCK_LINE_PATTERN = re.compile(rf'^(?P<name>\S.*?)\s+(?P<values>{NUMBER_TOKEN}(?:\s+{NUMBER_TOKEN})+)$')
+
+DATE_PATTERN = re.compile(r'(\d{4})\.(\d{1,2})\.(\d{1,2})')
+ANALYST_PATTERN = re.compile(r'([가-힣]{2,4})\s+([\w.+-]+@[\w-]+(?:\.[\w-]+)+)')
+MSCI_DATE_PATTERN = re.compile(r'(\d{1,2})월\s*(\d{1,2})일\s*MSCI')
+# 글머리표 문자 (\uf09f 등은 Wingdings 글꼴 기호가 변환된 사용자 정의 영역 문자)
+BULLET_CHARS = '\uf09f\uf0a7\uf06e•■□▪◦●○-·'
+PROBABILITIES = ('높음', '중간', '낮음')
+STRATEGY_KEYWORDS = ('결국', '베팅', '후보', '전략')
+
+
+def match_stock_columns(header_cells: Sequence[Optional[str]]) -> List[Optional[str]]:
+    """
+    헤더 셀을 종목 필드명에 매칭
+
+    Args:
+        header_cells: 헤더 행 셀 리스트
+
+    Returns:
+        열별 필드명 (매칭되지 않으면 None)
+    """
+    columns = []
+    for cell in header_cells:
+        field = None
+        for name, pattern in STOCK_COLUMN_PATTERNS:
+            if cell and pattern.search(cell) and name not in columns:
+                field = name
+                break
+        columns.append(field)
+    return columns
+
+
+def extract_top_stocks(pages_data: List[Dict], limit: int = None) -> List[StockRecord]:
+    """
+    PER/PBR/배당수익률 등의 열을 가진 종목 표에서 추천 종목 추출
+
+    표에 종목명 열이 없으면(종목명이 표 테두리 밖에 있는 경우) 같은 페이지 텍스트에서
+    표의 숫자와 일치하는 줄을 찾아 종목명과 표에 없는 뒤쪽 열(예: 배당수익률)을 보완한다.
+
+    Args:
+        pages_data: 페이지별 데이터
+        limit: 최대 종목 수 (None이면 설정값, 0이면 전체)
+
+    Returns:
+        종목 레코드 리스트 (보고서 순서)
+    """
+    if limit is None:
+        limit = TOP_STOCKS_LIMIT
+
+    for page_data in pages_data:
+        for table in page_data['tables']:
+            if len(table) < 2:
+                continue
+            columns = match_stock_columns(table[0])
+            if 'per' not in columns or 'pbr' not in columns:
+                continue
+
+            if 'name' in columns:
+                records = _records_from_table(columns, table)
+            else:
+                records = _records_from_text(columns, table[1:], page_data['text'])
+
+            if records:
+                return records[:limit] if limit else records
+    return []
+
+
+def _records_from_table(columns: List[Optional[str]], table) -> List[StockRecord]:
+    """종목명 열이 있는 표를 열 단위로 변환해 레코드 구성"""
+    parsed = {}
+    for index, field in enumerate(columns):
+        if field is None:
+            continue
+        if isinstance(table, ColumnarTable):
+            # 추출 시 변환해 둔 열 사용
+            if field == 'name':
+                parsed[field] = table.column(index)
+            else:
+                numbers = table.numbers(index)
+                parsed[field] = ([None] * (len(table) - 1) if numbers is None
+                                 else [None if math.isnan(value) else value for value in numbers])
+            continue
+        cells = [row[index] if index < len(row) else None for row in table[1:]]
+        parsed[field] = cells if field == 'name' else parse_numeric_column(cells)
+
+    records = []
+    for i, name in enumerate(parsed['name']):
+        name = (name or '').strip()
+        if not name or parsed['per'][i] is None:
+            continue
+        records.append(_make_stock_record(name, {field: parsed[field][i] for field in parsed if field != 'name'}))
+    return records
+
+
+def _records_from_text(columns: List[Optional[str]], body: List[List[Optional[str]]], text: str) -> List[StockRecord]:
+    """표 숫자와 일치하는 텍스트 줄에서 종목명과 누락된 열 보완"""
+    # 텍스트 머리말에는 있지만 표 헤더에 없는 필드는 텍스트 줄의 뒤쪽 숫자로 간주
+    extra_fields = [name for name, pattern in STOCK_COLUMN_PATTERNS
+                    if name != 'name' and name not in columns and pattern.search(text)]
+    text_rows = []
+    for line in text.split('\n'):
+        match = STOCK_LINE_PATTERN.match(line.strip())
+        if match:
+            text_rows.append((match.group('name'), parse_numeric_column(match.group('values').split())))
+
+    table_rows = [parse_numeric_column(row) for row in body]
+    records = []
+    for row in table_rows:
+        if row[columns.index('per')] is None:
+            continue
+        for name, values in text_rows:
+            if values[:len(row)] != row:
+                continue
+            fields = {field: value for field, value in zip(columns, row) if field}
+            fields.update(zip(extra_fields, values[len(row):]))
+            records.append(_make_stock_record(name, fields))
+            break
+    return records
+
+
+def _make_stock_record(name: str, fields: Dict[str, Optional[float]]) -> StockRecord:
+    """템플릿이 사용하는 필드만 가진 종목 레코드 생성"""
+    record = {'name': name}
+    for field in STOCK_NUMERIC_FIELDS:
+        record[field] = fields.get(field)
+    return record
+
+
+def extract_msci_review(pages_data: List[Dict], report_date: str = '') -> Dict:
+    """
+    '편입'/'편출' 열과 확률(높음/중간/낮음) 열을 가진 표에서 MSCI 리뷰 예상 종목 추출
+
+    Args:
+        pages_data: 페이지별 데이터
+        report_date: 보고서 날짜 (리뷰 날짜의 연도 추정용, 예: "2026.01.21")
+
+    Returns:
+        {'date', 'new_entries', 'removals'}
+    """
+    review = {'date': '', 'new_entries': [], 'removals': []}
+
+    for page_data in pages_data:
+        for table in page_data['tables']:
+            for row in table:
+                cells = [(cell or '').strip() for cell in row]
+                probability = next((cell for cell in reversed(cells) if cell in PROBABILITIES), None)
+                if not cells or not cells[0] or probability is None:
+                    continue
+                entry = MsciEntry(name=cells[0], probability=probability)
+                if any('편입' in cell for cell in cells[1:]):
+                    review['new_entries'].append(entry)
+                elif any('편출' in cell for cell in cells[1:]):
+                    review['removals'].append(entry)
+
+        match = MSCI_DATE_PATTERN.search(page_data['text'])
+        if match and not review['date']:
+            year_match = DATE_PATTERN.search(report_date)
+            year = year_match.group(1) if year_match else ''
+            review['date'] = f"{year}.{int(match.group(1)):02d}.{int(match.group(2)):02d}".lstrip('.')
+
+    return review
+
+
+def extract_summary(text: str) -> Dict[str, List[str]]:
+    """
+    첫 페이지 글머리표 문단을 주요 포인트와 투자 전략으로 분류
+
+    Args:
+        text: 첫 페이지 텍스트
+
+    Returns:
+        {'key_points', 'strategy'}
+    """
+    bullets = []
+    for line in text.split('\n'):
+        line = line.strip()
+        if line.startswith(('도표', '자료:', '주:')):
+            if bullets:
+                break
+            continue
+        if line and line[0] in BULLET_CHARS:
+            bullets.append(line.lstrip(BULLET_CHARS).strip())
+        elif bullets and line:
+            # 줄바꿈된 문단 이어 붙이기
+            bullets[-1] = f"{bullets[-1]} {line}"
+
+    summary = {'key_points': [], 'strategy': []}
+    for bullet in bullets:
+        target = 'strategy' if any(keyword in bullet for keyword in STRATEGY_KEYWORDS) else 'key_points'
+        summary[target].append(bullet)
+    return summary
+
+
+def extract_report_data(pages_data: List[Dict], limit: int = None) -> Dict:
+    """
+    pages_data에서 HTML 보고서용 report_data 구성
+
+    Args:
+        pages_data: 페이지별 데이터
+        limit: 최대 추천 종목 수 (None이면 설정값, 0이면 전체)
+
+    Returns:
+        report_data (title, subtitle, date, analysts, summary, msci_review, top_stocks)
+    """
+    first_text = pages_data[0]['text'] if pages_data else ''
+    lines = [line.strip() for line in first_text.split('\n') if line.strip()]
+
+    title = lines[0] if lines else ''
+    subtitle = ''
+    date = ''
+    for line in lines[1:4]:
+        match = DATE_PATTERN.search(line)
+        if match:
+            date = f"{match.group(1)}.{int(match.group(2)):02d}.{int(match.group(3)):02d}"
+            subtitle = line[:match.start()].strip(' I|')
+            break
+
+    analysts = [f"{name} ({email})" for name, email in ANALYST_PATTERN.findall('\n'.join(lines[:5]))]
+
+    return {
+        'title': title,
+        'subtitle': subtitle,
+        'date': date,
+        'analysts': analysts,
+        'summary': extract_summary(first_text),
+        'msci_review': extract_msci_review(pages_data, date),
+        'top_stocks': extract_top_stocks(pages_data, limit),
+    }
@@ -0,0 +1,503 @@
+"""
+로컬 보고서 서버 모듈
+
+python -m src serve 로 실행하는 asyncio 기반 HTTP 서버.
+작업자 프로세스가 pdfplumber와 컴파일된 템플릿을 미리 불러 둔 채로 보고서 생성 요청을 처리하므로
+요청마다 Python 시작, import, 템플릿 컴파일 비용이 들지 않는다. 추출 캐시와 빌드 매니페스트도 그대로 사용한다.
+
+API:
+    POST /reports   JSON {"url": "...", "output": "a.html", "force": false}
+                    또는 PDF 본문 (Content-Type: application/pdf, ?name=a.pdf&output=a.html)
+                    -> {"html": "/a.html", "pdf": "/a.pdf", "seconds": 1.23}
+                    (같은 출력 파일을 다른 입력으로 생성 중이면 409)
+    GET  /healthz   -> {"status": "ok", "jobs": 진행 중인 작업 수}
+    GET  /<파일>    OUTPUT_DIR의 HTML/PDF/에셋 (ETag, Last-Modified, Cache-Control, Range 지원)
+"""
+import re
+import json
+import time
+import asyncio
+import hashlib
+import argparse
+import mimetypes
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from email.utils import formatdate, parsedate_to_datetime
+from http import HTTPStatus
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from .config import (OUTPUT_DIR, SERVE_HOST, SERVE_PORT, SERVE_WORKERS, SERVE_MAX_UPLOAD_BYTES,
+                     SERVE_MIN_UPLOAD_RATE, SERVE_UPLOAD_DIR)
+
+# HTML은 다시 생성될 수 있으므로 매번 ETag로 재검증, PDF/에셋은 잠시 캐시
+HTML_CACHE_CONTROL = "no-cache"
+STATIC_CACHE_CONTROL = "public, max-age=3600"
+# 요청 줄과 헤더를 기다리는 시간 (본문은 크기에 비례한 시간을 따로 허용)
+KEEPALIVE_TIMEOUT = 15
+MAX_HEADER_LINES = 100
+
+UNSAFE_NAME_CHARS = re.compile(r'[^\w.-]')
+RANGE_PATTERN = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+class HTTPError(Exception):
+    """클라이언트에 상태 코드와 메시지로 응답할 오류"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def _warm_worker():
+    """작업자 프로세스 초기화: 무거운 모듈을 불러오고 기본 템플릿을 미리 컴파일"""
+    import pdfplumber  # noqa: F401
+    from .report_generator import ReportGenerator
+
+    ReportGenerator().get_template()
+
+
+def _ping() -> bool:
+    return True
+
+
+def _build_from_url(url: str, output_filename: str, force: bool) -> Tuple[str, str]:
+    """
+    작업자 프로세스용: URL의 보고서 생성 (요청 단위로 병렬 처리하므로 페이지 병렬 추출은 사용 안 함)
+
+    Returns:
+        (HTML 파일명, 게시된 PDF 파일명)
+    """
+    from .report_generator import _create_downloader, build_report
+
+    downloader = _create_downloader(workers=1)
+    # 다른 URL이 같은 파일명을 쓰고 있으면 다른 이름으로 저장되고, 중복 보고서이면 원본을 게시하므로
+    # 실제 게시한 PDF 이름을 돌려줌
+    pdf_path = downloader.resolve_duplicate(downloader.download(url))
+    return build_report(downloader, pdf_path, output_filename, url=url, force=force).name, pdf_path.name
+
+
+def _build_from_pdf(pdf_path: str, output_filename: str, force: bool) -> Tuple[str, str]:
+    """
+    작업자 프로세스용: 업로드된 PDF로 보고서 생성
+
+    Returns:
+        (HTML 파일명, 게시된 PDF 파일명)
+    """
+    from .report_generator import _create_downloader, build_report
+
+    downloader = _create_downloader(workers=1)
+    pdf_path = downloader.resolve_duplicate(Path(pdf_path))
+    return build_report(downloader, pdf_path, output_filename, force=force).name, pdf_path.name
+
+
+def safe_filename(name: str, suffix: str) -> str:
+    """
+    요청에서 받은 이름을 OUTPUT_DIR에 쓸 수 있는 파일명으로 정리
+
+    Args:
+        name: 요청한 파일명 (경로 부분은 버림)
+        suffix: 보장할 확장자 (예: '.html')
+    """
+    name = UNSAFE_NAME_CHARS.sub('_', name.replace('\\', '/').rsplit('/', 1)[-1]).lstrip('.')
+    if not name:
+        raise HTTPError(400, "파일명이 비어 있음")
+    return name if name.lower().endswith(suffix) else name + suffix
+
+
+class ReportServer:
+    """보고서 생성 요청 처리 및 OUTPUT_DIR 정적 파일 제공"""
+
+    def __init__(self, host: str = None, port: int = None, workers: int = None):
+        self.host = host or SERVE_HOST
+        self.port = port if port is not None else SERVE_PORT
+        self.workers = workers or SERVE_WORKERS
+        self.output_dir = OUTPUT_DIR
+        self._pool = None
+        self._pool_lock = None
+        self._server = None
+        # 출력 파일명 -> (입력, 작업): 같은 입력과 출력 파일에 대한 동시 요청은 하나의 작업을 공유
+        self._jobs: Dict[str, Tuple[str, asyncio.Future]] = {}
+
+    async def start(self):
+        """작업자 프로세스를 미리 띄우고 연결 수신 시작"""
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self._pool_lock = asyncio.Lock()
+        await self._start_pool()
+
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        print(f"[OK] 보고서 서버 시작: http://{self.host}:{self.port} (작업자 {self.workers}개, {self.output_dir})")
+
+    async def _start_pool(self):
+        """작업자 프로세스를 띄우고 모두 준비될 때까지 대기"""
+        self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_warm_worker)
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self._pool, _ping) for _ in range(self.workers)))
+
+    async def _restart_pool(self, broken: ProcessPoolExecutor):
+        """
+        작업자가 비정상 종료되어 쓸 수 없게 된 풀을 새 풀로 교체
+
+        Args:
+            broken: 실패한 작업을 제출했던 풀 (이미 다른 요청이 교체했으면 아무것도 하지 않음)
+        """
+        async with self._pool_lock:
+            if self._pool is not broken:
+                return
+            print("[WARN] 작업자 프로세스가 비정상 종료됨: 작업자 다시 시작")
+            broken.shutdown(wait=False)
+            self._pool = None
+            await self._start_pool()
+
+    async def serve_forever(self):
+        """서버 실행 (중단될 때까지)"""
+        if self._server is None:
+            await self.start()
+        try:
+            async with self._server:
+                await self._server.serve_forever()
+        finally:
+            await self.close()
+
+    async def close(self):
+        """연결 수신 중단 및 작업자 종료"""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """keep-alive 연결에서 요청을 차례로 처리"""
+        try:
+            while True:
+                try:
+                    # 유휴 시간 제한은 요청 줄과 헤더에만 적용 (큰 업로드는 크기에 비례해 기다림)
+                    request = await asyncio.wait_for(_read_request(reader), KEEPALIVE_TIMEOUT)
+                    if request is None:
+                        break
+                    await _read_body(reader, request)
+                except HTTPError as e:
+                    await _send_json(writer, e.status, {'error': str(e)}, keep_alive=False)
+                    break
+
+                keep_alive = request['headers'].get('connection', '').lower() != 'close'
+                try:
+                    await self._dispatch(request, writer, keep_alive)
+                except HTTPError as e:
+                    await _send_json(writer, e.status, {'error': str(e)}, keep_alive)
+                except Exception as e:
+                    print(f"[ERROR] {request['method']} {request['target']}: {e}")
+                    await _send_json(writer, 500, {'error': str(e)}, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _dispatch(self, request: Dict, writer: asyncio.StreamWriter, keep_alive: bool):
+        method, path = request['method'], request['path']
+        if path == '/reports':
+            if method != 'POST':
+                raise HTTPError(405, "POST만 지원")
+            result = await self._create_report(request)
+            await _send_json(writer, 201, result, keep_alive)
+        elif path == '/healthz':
+            await _send_json(writer, 200, {'status': 'ok', 'jobs': len(self._jobs)}, keep_alive)
+        elif method in ('GET', 'HEAD'):
+            await self._serve_file(request, writer, keep_alive)
+        else:
+            raise HTTPError(405, f"지원하지 않는 메서드: {method}")
+
+    async def _create_report(self, request: Dict) -> Dict:
+        """
+        보고서 생성 요청 처리 (URL 또는 업로드된 PDF)
+
+        Returns:
+            {'html', 'pdf', 'seconds'} (OUTPUT_DIR 기준 URL 경로)
+        """
+        start = time.perf_counter()
+        content_type = request['headers'].get('content-type', '').split(';')[0].strip().lower()
+        query = request['query']
+
+        if content_type == 'application/pdf':
+            body = request['body']
+            if not body.startswith(b'%PDF'):
+                raise HTTPError(400, "PDF 파일이 아님")
+            digest = hashlib.sha256(body).hexdigest()
+            pdf_name = safe_filename(query.get('name') or f"upload_{digest[:16]}", '.pdf')
+            output_filename = safe_filename(query.get('output') or Path(pdf_name).stem, '.html')
+            force = query.get('force') == '1'
+
+            # ?name=은 출력 파일명에만 사용하고, 파일은 내용 해시로 저장 (URL로 받은 PDF와 메타데이터를 덮어쓰지 않음)
+            pdf_path = SERVE_UPLOAD_DIR / f"upload_{digest[:16]}.pdf"
+            await asyncio.get_running_loop().run_in_executor(None, _write_upload, pdf_path, body)
+            source = f"upload:{digest}"
+            job = (_build_from_pdf, str(pdf_path), output_filename, force)
+        else:
+            try:
+                payload = json.loads(request['body'] or b'{}')
+            except json.JSONDecodeError:
+                raise HTTPError(400, "JSON 본문이 아님")
+            url = payload.get('url') if isinstance(payload, dict) else None
+            if not url or urlsplit(url).scheme not in ('http', 'https'):
+                raise HTTPError(400, "url(http/https)이 필요함")
+            url_name = urlsplit(url).path.rsplit('/', 1)[-1]
+            output_filename = safe_filename(payload.get('output') or Path(url_name).stem or 'report', '.html')
+            source = f"url:{url}"
+            job = (_build_from_url, url, output_filename, bool(payload.get('force')))
+
+        html_name, pdf_name = await self._run_job(output_filename, source, job)
+        print(f"[OK] 보고서 요청 처리: {html_name} ({time.perf_counter() - start:.2f}초)")
+        return {'html': f"/{html_name}", 'pdf': f"/{pdf_name}", 'seconds': round(time.perf_counter() - start, 3)}
+
+    async def _run_job(self, output_filename: str, source: str, job: Tuple) -> Tuple[str, str]:
+        """
+        작업자 프로세스에서 실행 (같은 입력으로 같은 출력 파일을 만드는 작업이 진행 중이면 그 결과를 기다림)
+
+        Args:
+            output_filename: 출력 HTML 파일명
+            source: 입력 식별자 ('url:<URL>' 또는 'upload:<SHA-256>')
+            job: (작업 함수, 인자...)
+
+        Returns:
+            (HTML 파일명, PDF 파일명)
+
+        Raises:
+            HTTPError: 같은 출력 파일을 다른 입력으로 생성 중인 경우 (409),
+                작업자가 다시 시작한 뒤에도 비정상 종료된 경우 (503)
+        """
+        running = self._jobs.get(output_filename)
+        if running is not None:
+            if running[0] != source:
+                raise HTTPError(409, f"{output_filename}을(를) 다른 입력으로 생성 중 (잠시 후 다시 요청)")
+            future = running[1]
+        else:
+            future = asyncio.ensure_future(self._execute(job))
+            self._jobs[output_filename] = (source, future)
+            future.add_done_callback(lambda _: self._jobs.pop(output_filename, None))
+        return await asyncio.shield(future)
+
+    async def _execute(self, job: Tuple) -> Tuple[str, str]:
+        """작업자 풀에서 작업 실행 (작업자가 비정상 종료되면 풀을 다시 띄우고 한 번 재시도)"""
+        for _ in range(2):
+            pool = self._pool
+            try:
+                return await asyncio.get_running_loop().run_in_executor(pool, *job)
+            except BrokenProcessPool:
+                await self._restart_pool(pool)
+        raise HTTPError(503, "작업자 프로세스가 비정상 종료됨 (잠시 후 다시 요청)")
+
+    async def _serve_file(self, request: Dict, writer: asyncio.StreamWriter, keep_alive: bool):
+        """OUTPUT_DIR의 파일을 캐시 헤더와 함께 전송"""
+        file_path = self._resolve(request['path'])
+        if file_path is None:
+            if request['path'] == '/':
+                await self._send_listing(request, writer, keep_alive)
+                return
+            raise HTTPError(404, "파일 없음")
+
+        stat = file_path.stat()
+        etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+        headers = {
+            'Content-Type': mimetypes.guess_type(file_path.name)[0] or 'application/octet-stream',
+            'ETag': etag,
+            'Last-Modified': formatdate(stat.st_mtime, usegmt=True),
+            'Cache-Control': HTML_CACHE_CONTROL if file_path.suffix == '.html' else STATIC_CACHE_CONTROL,
+            'Accept-Ranges': 'bytes',
+        }
+        if file_path.suffix in ('.html', '.css', '.js'):
+            headers['Content-Type'] += '; charset=utf-8'
+
+        if _not_modified(request['headers'], etag, stat.st_mtime):
+            _write_head(writer, 304, headers, keep_alive)
+            await writer.drain()
+            return
+
+        status, offset, length = 200, 0, stat.st_size
+        byte_range = _parse_range(request['headers'], etag, stat.st_size)
+        if byte_range is not None:
+            status, (offset, length) = 206, byte_range
+            headers['Content-Range'] = f"bytes {offset}-{offset + length - 1}/{stat.st_size}"
+        headers['Content-Length'] = str(length)
+
+        _write_head(writer, status, headers, keep_alive)
+        await writer.drain()
+        if request['method'] == 'GET' and length:
+            with open(file_path, 'rb') as f:
+                # 가능하면 os.sendfile로 커널에서 바로 전송 (지원하지 않으면 읽어서 전송)
+                await asyncio.get_running_loop().sendfile(writer.transport, f, offset, length)
+
+    def _resolve(self, url_path: str) -> Optional[Path]:
+        """URL 경로를 OUTPUT_DIR 안의 파일 경로로 변환 (디렉토리 밖, 숨김 파일, 없는 파일이면 None)"""
+        relative = unquote(url_path).lstrip('/')
+        # .build_manifest.json 같은 내부 파일과 '..'은 제공하지 않음
+        if any(part.startswith('.') for part in relative.replace('\\', '/').split('/')):
+            return None
+        root = self.output_dir.resolve()
+        file_path = (root / relative).resolve()
+        if file_path != root and root not in file_path.parents:
+            return None
+        if file_path.is_dir():
+            file_path = file_path / "index.html"
+        return file_path if file_path.is_file() else None
+
+    async def _send_listing(self, request: Dict, writer: asyncio.StreamWriter, keep_alive: bool):
+        """index.html이 없을 때 보여줄 HTML 보고서 목록"""
+        names = sorted(path.name for path in self.output_dir.glob("*.html"))
+        items = "".join(f'<li><a href="/{name}">{name}</a></li>' for name in names)
+        body = f"<!DOCTYPE html><meta charset=\"utf-8\"><title>AI Report</title><ul>{items}</ul>".encode('utf-8')
+        headers = {'Content-Type': 'text/html; charset=utf-8', 'Content-Length': str(len(body)),
+                   'Cache-Control': HTML_CACHE_CONTROL}
+        _write_head(writer, 200, headers, keep_alive)
+        if request['method'] == 'GET':
+            writer.write(body)
+        await writer.drain()
+
+
+async def _read_request(reader: asyncio.StreamReader) -> Optional[Dict]:
+    """
+    HTTP/1.1 요청 줄과 헤더 읽기 (본문은 _read_body()로 읽음)
+
+    Returns:
+        {'method', 'target', 'path', 'query', 'headers', 'length'} (연결이 닫혔으면 None)
+    """
+    request_line = await reader.readline()
+    if not request_line.strip():
+        return None
+    try:
+        method, target, _ = request_line.decode('latin-1').split()
+    except ValueError:
+        raise HTTPError(400, "잘못된 요청 줄")
+
+    headers = {}
+    for _ in range(MAX_HEADER_LINES):
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+    else:
+        raise HTTPError(431, "헤더가 너무 많음")
+
+    try:
+        length = int(headers.get('content-length') or 0)
+    except ValueError:
+        raise HTTPError(400, "잘못된 Content-Length")
+    if length < 0:
+        raise HTTPError(400, "잘못된 Content-Length")
+    if length > SERVE_MAX_UPLOAD_BYTES:
+        raise HTTPError(413, f"본문이 너무 큼 (최대 {SERVE_MAX_UPLOAD_BYTES} bytes)")
+
+    parts = urlsplit(target)
+    query = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+    return {'method': method.upper(), 'target': target, 'path': parts.path or '/', 'query': query,
+            'headers': headers, 'length': length}
+
+
+async def _read_body(reader: asyncio.StreamReader, request: Dict):
+    """
+    요청 본문을 읽어 request['body']에 저장
+
+    KEEPALIVE_TIMEOUT에 SERVE_MIN_UPLOAD_RATE 기준 전송 시간을 더한 만큼 기다리므로
+    느린 회선의 큰 업로드는 허용하고, 멈춘 연결은 끊는다.
+
+    Raises:
+        HTTPError: 제한 시간 안에 본문이 도착하지 않은 경우 (408)
+    """
+    length = request['length']
+    if not length:
+        request['body'] = b''
+        return
+    try:
+        request['body'] = await asyncio.wait_for(reader.readexactly(length),
+                                                 KEEPALIVE_TIMEOUT + length / SERVE_MIN_UPLOAD_RATE)
+    except asyncio.TimeoutError:
+        raise HTTPError(408, "본문 전송 시간 초과")
+
+
+def _write_head(writer: asyncio.StreamWriter, status: int, headers: Dict[str, str], keep_alive: bool):
+    """상태 줄과 헤더 기록"""
+    lines = [f"HTTP/1.1 {status} {HTTPStatus(status).phrase}",
+             f"Date: {formatdate(usegmt=True)}",
+             f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+    lines.extend(f"{name}: {value}" for name, value in headers.items())
+    writer.write(("\r\n".join(lines) + "\r\n\r\n").encode('latin-1'))
+
+
+async def _send_json(writer: asyncio.StreamWriter, status: int, data: Dict, keep_alive: bool):
+    body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+    _write_head(writer, status, {'Content-Type': 'application/json; charset=utf-8',
+                                 'Content-Length': str(len(body)), 'Cache-Control': 'no-store'}, keep_alive)
+    writer.write(body)
+    await writer.drain()
+
+
+def _not_modified(headers: Dict[str, str], etag: str, mtime: float) -> bool:
+    """If-None-Match / If-Modified-Since 조건부 요청이면 True"""
+    if 'if-none-match' in headers:
+        return etag in [tag.strip() for tag in headers['if-none-match'].split(',')] or headers['if-none-match'] == '*'
+    if 'if-modified-since' in headers:
+        try:
+            return int(mtime) <= parsedate_to_datetime(headers['if-modified-since']).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def _parse_range(headers: Dict[str, str], etag: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    단일 Range 요청 해석
+
+    Returns:
+        (시작 위치, 길이), Range가 없거나 If-Range가 맞지 않으면 None
+
+    Raises:
+        HTTPError: 범위가 파일 밖인 경우 (416)
+    """
+    match = RANGE_PATTERN.match(headers.get('range', '').replace(' ', ''))
+    if not match or headers.get('if-range', etag) != etag:
+        return None
+    start, end = match.groups()
+    if start:
+        start, end = int(start), min(int(end), size - 1) if end else size - 1
+    elif end:
+        # 끝에서부터 N바이트
+        start, end = max(size - int(end), 0), size - 1
+    else:
+        return None
+    if start >= size or start > end:
+        raise HTTPError(416, "요청한 범위가 파일 밖임")
+    return start, end - start + 1
+
+
+def _write_upload(pdf_path: Path, body: bytes):
+    """업로드된 PDF 저장 (임시 파일에 쓴 뒤 교체)"""
+    pdf_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = pdf_path.with_name(pdf_path.name + ".part")
+    tmp_path.write_bytes(body)
+    tmp_path.replace(pdf_path)
+
+
+def main(argv: List[str] = None):
+    """보고서 서버 명령 (python -m src serve)"""
+    parser = argparse.ArgumentParser(description="AI Report - 로컬 보고서 서버")
+    parser.add_argument("--host", type=str, default=None, help=f"수신 주소 (기본값: {SERVE_HOST}, 공유하려면 0.0.0.0)")
+    parser.add_argument("--port", type=int, default=None, help=f"포트 (기본값: {SERVE_PORT})")
+    parser.add_argument("--workers", type=int, default=None, help=f"보고서 생성 작업자 프로세스 수 (기본값: {SERVE_WORKERS})")
+
+    args = parser.parse_args(argv)
+
+    server = ReportServer(args.host, args.port, args.workers)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        print("\n[OK] 보고서 서버 종료")
+
+
+if __name__ == "__main__":
+    main()
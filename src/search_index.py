@@ -0,0 +1,301 @@
+"""
+보고서 전문 검색 인덱스 모듈
+
+다운로드한 보고서의 페이지 텍스트를 글자 2-gram 역색인으로 SQLite 파일에 저장한다.
+한국어는 띄어쓰기와 조사 때문에 단어 단위 토큰화가 어려우므로 글자 2-gram으로 후보 페이지를 찾고
+원문에 검색어가 실제로 있는지 확인한다. 검색 시 PDF는 읽지 않는다.
+"""
+import re
+import sqlite3
+import argparse
+import threading
+import unicodedata
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+from .config import DATA_DIR, SEARCH_INDEX_PATH
+from .extract_cache import file_sha256
+
+# 검색 결과 스니펫 앞뒤 글자 수
+SNIPPET_CONTEXT = 40
+
+TOKEN_PATTERN = re.compile(r'\w+')
+QUERY_PATTERN = re.compile(r'"([^"]+)"|(\S+)')
+# save_as_text()가 기록한 텍스트 파일의 페이지 머리말
+TEXT_PAGE_PATTERN = re.compile(r'^\[페이지 (\d+)\]\n-{80}\n', re.M)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS reports (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    url TEXT,
+    sha256 TEXT NOT NULL,
+    page_count INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS pages (
+    id INTEGER PRIMARY KEY,
+    report_id INTEGER NOT NULL REFERENCES reports(id),
+    page_num INTEGER NOT NULL,
+    text TEXT NOT NULL  -- normalize_text() 결과
+);
+CREATE INDEX IF NOT EXISTS pages_report ON pages(report_id);
+CREATE TABLE IF NOT EXISTS postings (
+    gram TEXT NOT NULL,
+    page_id INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (gram, page_id)
+) WITHOUT ROWID;
+"""
+
+
+def normalize_text(text: str) -> str:
+    """검색용 정규화 (NFKC, 소문자, 연속 공백을 공백 하나로)"""
+    return ' '.join(unicodedata.normalize('NFKC', text).lower().split())
+
+
+def text_grams(text: str) -> Counter:
+    """
+    정규화된 텍스트의 글자 2-gram 빈도
+
+    단어(\\w+)마다 2-gram을 만든다. 한 글자 단어는 검색 후보를 좁히는 데 쓰지 않으므로 제외한다.
+
+    Args:
+        text: normalize_text() 결과
+
+    Returns:
+        2-gram별 등장 횟수
+    """
+    grams = Counter()
+    for token in TOKEN_PATTERN.findall(text):
+        grams.update(token[i:i + 2] for i in range(len(token) - 1))
+    return grams
+
+
+def parse_query(query: str) -> List[str]:
+    """
+    검색어를 정규화된 검색 항목으로 분리 (큰따옴표로 묶은 구절은 하나의 항목)
+
+    Args:
+        query: 검색어 (예: '팬오션 "MSCI 편입"')
+
+    Returns:
+        검색 항목 리스트 (모두 포함된 페이지만 검색됨)
+    """
+    terms = []
+    for phrase, word in QUERY_PATTERN.findall(query):
+        term = normalize_text(phrase or word)
+        if term and term not in terms:
+            terms.append(term)
+    return terms
+
+
+class SearchIndex:
+    """SQLite 기반 글자 2-gram 역색인"""
+
+    def __init__(self, path: Path = None):
+        self.path = path or SEARCH_INDEX_PATH
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # 일괄 수집의 파싱 작업자 스레드가 함께 사용하므로 잠금으로 직렬화
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+
+    def close(self):
+        """데이터베이스 연결 종료"""
+        self._conn.close()
+
+    def add_report(self, pdf_path: Path, pages_data: Iterable[Dict], url: str = None,
+                   sha256: str = None) -> bool:
+        """
+        보고서 페이지 텍스트를 색인 (같은 PDF, 같은 페이지 수로 이미 색인되어 있으면 생략)
+
+        Args:
+            pdf_path: PDF 파일 경로 (파일명이 보고서 이름)
+            pages_data: 페이지별 데이터
+            url: 원본 URL
+            sha256: PDF 해시 (None이면 계산)
+
+        Returns:
+            새로 색인했으면 True
+        """
+        pages_data = [page_data for page_data in pages_data if page_data['text']]
+        return self._add(Path(pdf_path).name, sha256 or file_sha256(pdf_path), url,
+                         [(page_data['page_num'], page_data['text']) for page_data in pages_data])
+
+    def add_text_file(self, txt_path: Path, url: str = None) -> bool:
+        """
+        save_as_text()로 저장한 텍스트 파일을 색인 (기존 보고서를 PDF 파싱 없이 색인할 때 사용)
+
+        Args:
+            txt_path: 텍스트 파일 경로 (같은 이름의 PDF가 있으면 그 해시로 변경 여부 판단)
+            url: 원본 URL
+
+        Returns:
+            새로 색인했으면 True
+        """
+        txt_path = Path(txt_path)
+        content = txt_path.read_text(encoding='utf-8')
+        pdf_path = txt_path.with_suffix('.pdf')
+        sha256 = file_sha256(pdf_path) if pdf_path.exists() else file_sha256(txt_path)
+
+        pages = []
+        matches = list(TEXT_PAGE_PATTERN.finditer(content))
+        for match, next_match in zip(matches, matches[1:] + [None]):
+            body = content[match.end():next_match.start() if next_match else len(content)]
+            # 페이지 구분선과 표 부분 제외
+            body = body.rsplit("=" * 80, 1)[0].split("\n[표 ", 1)[0].strip()
+            if body:
+                pages.append((int(match.group(1)), body))
+        return self._add(pdf_path.name, sha256, url, pages)
+
+    def _add(self, name: str, sha256: str, url: Optional[str], pages: List[tuple]) -> bool:
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT id, sha256, page_count FROM reports WHERE name = ?",
+                                     (name,)).fetchone()
+            if row and row[1] == sha256 and row[2] == len(pages):
+                return False
+            if row:
+                self._delete_report(row[0])
+
+            report_id = self._conn.execute(
+                "INSERT INTO reports (name, url, sha256, page_count) VALUES (?, ?, ?, ?)",
+                (name, url, sha256, len(pages))).lastrowid
+            for page_num, text in pages:
+                text = normalize_text(text)
+                page_id = self._conn.execute("INSERT INTO pages (report_id, page_num, text) VALUES (?, ?, ?)",
+                                             (report_id, page_num, text)).lastrowid
+                self._conn.executemany("INSERT INTO postings (gram, page_id, count) VALUES (?, ?, ?)",
+                                       ((gram, page_id, count) for gram, count in text_grams(text).items()))
+        print(f"[OK] 검색 인덱스 추가: {name} ({len(pages)} 페이지)")
+        return True
+
+    def remove_report(self, name: str):
+        """보고서를 인덱스에서 삭제"""
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT id FROM reports WHERE name = ?", (name,)).fetchone()
+            if row:
+                self._delete_report(row[0])
+
+    def _delete_report(self, report_id: int):
+        self._conn.execute("DELETE FROM postings WHERE page_id IN (SELECT id FROM pages WHERE report_id = ?)",
+                           (report_id,))
+        self._conn.execute("DELETE FROM pages WHERE report_id = ?", (report_id,))
+        self._conn.execute("DELETE FROM reports WHERE id = ?", (report_id,))
+
+    def search(self, query: str, limit: int = 20) -> List[Dict]:
+        """
+        검색어가 모두 포함된 페이지 검색
+
+        Args:
+            query: 검색어 (공백으로 구분된 항목은 AND, 큰따옴표로 구절 검색)
+            limit: 최대 결과 수
+
+        Returns:
+            [{'report', 'url', 'page_num', 'score', 'snippet'}, ...]
+            (검색어 등장 횟수 내림차순, 같으면 최신 보고서 이름 순)
+        """
+        terms = parse_query(query)
+        if not terms:
+            return []
+
+        # 후보 페이지는 두 글자 이상 단어의 2-gram으로 찾음 (한 글자는 다른 단어 안에 있을 수 있음)
+        grams: Set[str] = set()
+        for term in terms:
+            grams.update(text_grams(term))
+
+        # 2-gram 후보를 원문 포함 여부로 확인 (2-gram이 없으면 전체 페이지에서 확인)
+        conditions = " AND ".join(["instr(pages.text, ?) > 0"] * len(terms))
+        params = list(terms)
+        if grams:
+            candidates = " INTERSECT ".join(["SELECT page_id FROM postings WHERE gram = ?"] * len(grams))
+            conditions = f"pages.id IN ({candidates}) AND {conditions}"
+            params = sorted(grams) + params
+        sql = f"""SELECT pages.page_num, pages.text, reports.name, reports.url FROM pages
+                  JOIN reports ON reports.id = pages.report_id WHERE {conditions}"""
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+
+        hits = [{'report': name, 'url': url, 'page_num': page_num,
+                 'score': sum(text.count(term) for term in terms), 'text': text}
+                for page_num, text, name, url in rows]
+        hits.sort(key=lambda hit: hit['page_num'])
+        hits.sort(key=lambda hit: hit['report'], reverse=True)
+        hits.sort(key=lambda hit: hit['score'], reverse=True)
+
+        hits = hits[:limit]
+        for hit in hits:
+            hit['snippet'] = make_snippet(hit.pop('text'), terms[0])
+        return hits
+
+    def stats(self) -> Dict[str, int]:
+        """색인된 보고서, 페이지, 2-gram 수"""
+        with self._lock:
+            return {
+                'reports': self._conn.execute("SELECT COUNT(*) FROM reports").fetchone()[0],
+                'pages': self._conn.execute("SELECT COUNT(*) FROM pages").fetchone()[0],
+                'grams': self._conn.execute("SELECT COUNT(DISTINCT gram) FROM postings").fetchone()[0],
+            }
+
+
+def make_snippet(text: str, term: str, context: int = SNIPPET_CONTEXT) -> str:
+    """
+    검색어 주변 텍스트 (검색어는 [ ]로 표시)
+
+    Args:
+        text: 정규화된 페이지 텍스트
+        term: 검색 항목
+        context: 앞뒤 글자 수
+    """
+    start = text.find(term)
+    if start < 0:
+        return text[:context * 2]
+    end = start + len(term)
+    prefix = "..." if start > context else ""
+    suffix = "..." if end + context < len(text) else ""
+    return f"{prefix}{text[max(0, start - context):start]}[{text[start:end]}]{text[end:end + context]}{suffix}"
+
+
+def index_data_dir(index: SearchIndex, data_dir: Path = None) -> int:
+    """
+    데이터 디렉토리의 텍스트 파일(save_as_text 결과)을 모두 색인
+
+    Args:
+        index: 검색 인덱스
+        data_dir: 데이터 디렉토리
+
+    Returns:
+        새로 색인한 보고서 수
+    """
+    data_dir = data_dir or DATA_DIR
+    return sum(1 for txt_path in sorted(data_dir.glob("*.txt")) if index.add_text_file(txt_path))
+
+
+def main(argv: List[str] = None):
+    """전문 검색 명령 (python -m src search)"""
+    parser = argparse.ArgumentParser(description="AI Report - 보고서 전문 검색")
+    parser.add_argument("query", nargs="?", help='검색어 (공백은 AND, 구절은 "큰따옴표")')
+    parser.add_argument("--limit", type=int, default=20, help="최대 결과 수")
+    parser.add_argument("--index-dir", action="store_true",
+                        help="데이터 디렉토리의 기존 텍스트 파일을 색인 (PDF를 다시 파싱하지 않음)")
+
+    args = parser.parse_args(argv)
+
+    index = SearchIndex()
+    if args.index_dir:
+        print(f"[OK] 새로 색인한 보고서: {index_data_dir(index)}건")
+    if args.query:
+        results = index.search(args.query, limit=args.limit)
+        for hit in results:
+            print(f"{hit['report']} p.{hit['page_num']} (점수 {hit['score']})")
+            print(f"    {hit['snippet']}")
+        print(f"[OK] {len(results)}건")
+    elif not args.index_dir:
+        stats = index.stats()
+        print(f"[*] 보고서 {stats['reports']}건, 페이지 {stats['pages']}개, 2-gram {stats['grams']}개")
+    index.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,327 @@
+"""
+열 단위 표 저장 모듈
+
+pdfplumber가 반환하는 List[List[Optional[str]]] 표를 열 단위로 보관한다.
+셀 문자열은 표마다 사전(중복 제거, intern)으로 저장하고 각 열은 사전 번호 배열로,
+숫자 열은 추출 시 한 번만 변환하여 array('d')로 함께 보관한다.
+행 단위 접근(table[0], table[1:], for row in table)은 기존 리스트 표와 같게 동작한다.
+"""
+import re
+import sys
+import math
+import struct
+from array import array
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+# 숫자 셀: "1,234", "-5.5", "(5.5)" (음수), "49.0%"
+NUMBER_PATTERN = re.compile(r'^\(?[-+]?[\d,]*\.?\d+\)?%?$')
+
+# 바이너리 형식: 매직, 행 수, 열 수, 사전 크기, 번호 배열 형식
+BINARY_MAGIC = b'CTB1'
+_HEADER = struct.Struct('<4sIIIc')
+
+
+def parse_numeric_column(cells: Sequence[Optional[str]]) -> List[Optional[float]]:
+    """
+    표의 한 열을 숫자로 일괄 변환
+
+    쉼표, 퍼센트 기호, 괄호 음수 표기를 처리하고 숫자가 아닌 셀은 None으로 둔다.
+
+    Args:
+        cells: 셀 문자열 리스트
+
+    Returns:
+        float 또는 None 리스트
+    """
+    values = []
+    for cell in cells:
+        cell = (cell or '').strip().replace(' ', '')
+        if not NUMBER_PATTERN.match(cell):
+            values.append(None)
+            continue
+        negative = cell.startswith('(') and cell.endswith(')')
+        number = float(cell.strip('()%').replace(',', ''))
+        values.append(-number if negative else number)
+    return values
+
+
+class TableRow:
+    """ColumnarTable의 한 행 (셀을 복사하지 않는 읽기 전용 뷰)"""
+
+    __slots__ = ('_table', '_row')
+
+    def __init__(self, table: 'ColumnarTable', row: int):
+        self._table = table
+        self._row = row
+
+    def __len__(self) -> int:
+        return self._table.ncols
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._table.cell(self._row, col) for col in range(self._table.ncols)[index]]
+        if index < 0:
+            index += self._table.ncols
+        if not 0 <= index < self._table.ncols:
+            raise IndexError("열 번호가 범위를 벗어남")
+        return self._table.cell(self._row, index)
+
+    def __iter__(self) -> Iterator[Optional[str]]:
+        values = self._table._values
+        for codes in self._table._codes:
+            yield values[codes[self._row]]
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (TableRow, list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+
+class ColumnarTable:
+    """사전 인코딩된 문자열 열과 숫자 열로 저장한 표"""
+
+    __slots__ = ('nrows', 'ncols', '_values', '_codes', '_numeric')
+
+    def __init__(self, nrows: int, ncols: int, values: List[Optional[str]], codes: List[array],
+                 numeric: dict):
+        self.nrows = nrows
+        self.ncols = ncols
+        self._values = values
+        self._codes = codes
+        self._numeric = numeric
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Sequence[Optional[str]]]) -> 'ColumnarTable':
+        """
+        pdfplumber 표(행 리스트)를 열 단위로 변환
+
+        첫 행은 머리글로 보고, 나머지 행에 숫자로 읽히는 셀이 하나라도 있는 열은
+        숫자 배열(숫자가 아닌 셀은 NaN)을 함께 만든다.
+
+        Args:
+            rows: 행 리스트 (행마다 셀 수가 달라도 됨, 부족한 셀은 None)
+
+        Returns:
+            ColumnarTable
+        """
+        nrows = len(rows)
+        ncols = max((len(row) for row in rows), default=0)
+        values = [None]
+        index = {None: 0}
+        columns = [[] for _ in range(ncols)]
+
+        for row in rows:
+            for col in range(ncols):
+                cell = row[col] if col < len(row) else None
+                code = index.get(cell)
+                if code is None:
+                    code = index[cell] = len(values)
+                    values.append(sys.intern(cell))
+                columns[col].append(code)
+
+        typecode = 'H' if len(values) <= 0xFFFF else 'I'
+        codes = [array(typecode, column) for column in columns]
+
+        numeric = {}
+        for col in range(ncols):
+            parsed = parse_numeric_column([values[code] for code in codes[col][1:]])
+            if any(value is not None for value in parsed):
+                numeric[col] = array('d', (math.nan if value is None else value for value in parsed))
+
+        return cls(nrows, ncols, values, codes, numeric)
+
+    def __len__(self) -> int:
+        return self.nrows
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [TableRow(self, row) for row in range(self.nrows)[index]]
+        if index < 0:
+            index += self.nrows
+        if not 0 <= index < self.nrows:
+            raise IndexError("행 번호가 범위를 벗어남")
+        return TableRow(self, index)
+
+    def __iter__(self) -> Iterator[TableRow]:
+        for row in range(self.nrows):
+            yield TableRow(self, row)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (ColumnarTable, list, tuple)):
+            return self.to_rows() == [list(row) for row in other]
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"ColumnarTable({self.nrows}x{self.ncols}, 숫자 열 {sorted(self._numeric)})"
+
+    def __reduce__(self):
+        # 프로세스 간 전달과 캐시 저장 시 바이너리 형식 사용 (불러올 때 문자열 intern)
+        return (ColumnarTable.from_bytes, (self.to_bytes(),))
+
+    def cell(self, row: int, col: int) -> Optional[str]:
+        """(행, 열) 셀 문자열"""
+        return self._values[self._codes[col][row]]
+
+    @property
+    def header(self) -> List[Optional[str]]:
+        """머리글 행"""
+        return self.row(0) if self.nrows else []
+
+    def row(self, row: int) -> List[Optional[str]]:
+        """한 행의 셀 리스트"""
+        return [self._values[codes[row]] for codes in self._codes]
+
+    def column(self, col: int) -> List[Optional[str]]:
+        """머리글을 제외한 한 열의 셀 문자열 리스트"""
+        values = self._values
+        return [values[code] for code in self._codes[col][1:]]
+
+    def numbers(self, col: int) -> Optional[array]:
+        """
+        머리글을 제외한 한 열의 숫자 배열
+
+        Returns:
+            array('d') (숫자가 아닌 셀은 NaN), 숫자 셀이 없는 열은 None
+        """
+        return self._numeric.get(col)
+
+    def numeric_columns(self) -> List[int]:
+        """숫자 배열이 있는 열 번호"""
+        return sorted(self._numeric)
+
+    def to_numpy(self, col: int):
+        """
+        숫자 열을 NumPy 배열로 반환 (복사하지 않음, numpy 설치 필요)
+
+        Returns:
+            numpy.ndarray (float64), 숫자 셀이 없는 열은 None
+        """
+        import numpy as np
+
+        numbers = self._numeric.get(col)
+        return None if numbers is None else np.frombuffer(numbers, dtype=np.float64)
+
+    def to_rows(self) -> List[List[Optional[str]]]:
+        """pdfplumber와 같은 행 리스트로 변환"""
+        return [list(row) for row in self._iter_rows(self._values)]
+
+    def text_rows(self, sep: str = " | ") -> Iterator[str]:
+        """
+        텍스트 파일용 행 문자열 (None 셀은 빈 문자열)
+
+        Returns:
+            셀을 sep로 연결한 행 문자열 이터레이터
+        """
+        values = ['' if value is None else value for value in self._values]
+        return map(sep.join, self._iter_rows(values))
+
+    def _iter_rows(self, values: List[Optional[str]]) -> Iterator[tuple]:
+        """열별 사전 번호를 values로 풀어 행 튜플로 묶음 (셀마다 파이썬 반복을 돌지 않음)"""
+        if not self._codes:
+            return iter([()] * self.nrows)
+        return zip(*[map(values.__getitem__, codes) for codes in self._codes])
+
+    def to_bytes(self) -> bytes:
+        """
+        바이너리 형식으로 직렬화
+
+        머리말, 사전 문자열 길이(uint32)와 UTF-8 본문, 열별 사전 번호 배열,
+        숫자 열 번호와 float64 배열 순서로 기록 (모두 little-endian)
+        """
+        typecode = self._codes[0].typecode.encode() if self._codes else b'H'
+        encoded = [value.encode('utf-8') for value in self._values[1:]]
+        parts = [_HEADER.pack(BINARY_MAGIC, self.nrows, self.ncols, len(self._values), typecode),
+                 le_bytes(array('I', (len(value) for value in encoded))), b''.join(encoded)]
+        parts.extend(le_bytes(codes) for codes in self._codes)
+        parts.append(struct.pack('<I', len(self._numeric)))
+        for col in sorted(self._numeric):
+            parts.append(struct.pack('<I', col))
+            parts.append(le_bytes(self._numeric[col]))
+        return b''.join(parts)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'ColumnarTable':
+        """
+        to_bytes()로 직렬화한 표 복원
+
+        Raises:
+            ValueError: 형식이 맞지 않는 경우
+        """
+        view = memoryview(data)
+        magic, nrows, ncols, nvalues, typecode = _HEADER.unpack_from(view, 0)
+        if magic != BINARY_MAGIC:
+            raise ValueError("ColumnarTable 바이너리 형식이 아님")
+        offset = _HEADER.size
+
+        lengths, offset = read_array('I', view, offset, nvalues - 1)
+        values = [None]
+        for length in lengths:
+            values.append(sys.intern(str(view[offset:offset + length], 'utf-8')))
+            offset += length
+
+        codes = []
+        for _ in range(ncols):
+            column, offset = read_array(typecode.decode(), view, offset, nrows)
+            codes.append(column)
+
+        numeric = {}
+        (count,) = struct.unpack_from('<I', view, offset)
+        offset += 4
+        for _ in range(count):
+            (col,) = struct.unpack_from('<I', view, offset)
+            numeric[col], offset = read_array('d', view, offset + 4, max(nrows - 1, 0))
+
+        return cls(nrows, ncols, values, codes, numeric)
+
+
+def to_columnar(tables: List[Sequence[Sequence[Optional[str]]]]) -> List[ColumnarTable]:
+    """
+    페이지의 표 리스트를 ColumnarTable 리스트로 변환
+
+    Args:
+        tables: pdfplumber extract_tables() 결과
+
+    Returns:
+        ColumnarTable 리스트 (이미 변환된 표는 그대로)
+    """
+    return [table if isinstance(table, ColumnarTable) else ColumnarTable.from_rows(table) for table in tables]
+
+
+def le_bytes(values: array) -> bytes:
+    """
+    배열을 little-endian 바이트로 변환 (ColumnarTable 직렬화와 exporters의 columnar 파일이 사용)
+
+    Args:
+        values: 숫자 배열
+
+    Returns:
+        바이트 (빅엔디언 시스템에서도 같은 결과)
+    """
+    if sys.byteorder == 'big':
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def read_array(typecode: str, view: memoryview, offset: int, count: int) -> Tuple[array, int]:
+    """
+    le_bytes()로 기록한 little-endian 바이트에서 배열 읽기
+
+    Args:
+        typecode: 배열 형식 (예: 'I', 'd')
+        view: 읽을 버퍼
+        offset: 시작 위치
+        count: 원소 수
+
+    Returns:
+        (배열, 다음 오프셋)
+    """
+    values = array(typecode)
+    end = offset + values.itemsize * count
+    values.frombytes(view[offset:end])
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values, end